@@ -1,7 +1,8 @@
 # Standard library imports
 import os
-import re
+import math
 from datetime import date
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-party imports
 from flask import Flask, jsonify, request
@@ -9,21 +10,36 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 
 from flask_cors import CORS
-from sqlalchemy import func, case, cast, Float
+from sqlalchemy import func, case, cast, Float, tuple_, and_, or_
+from sqlalchemy.orm import aliased, contains_eager
 
 # Api client imports
-from .finnhub_client import get_profile, get_quote_data, get_financials
-from .tiingo_client import get_daily_prices
+from .finnhub_client import get_profile, get_quote_data, get_quotes, get_financials
 
 # local utility items 
-from app.utils import extract_key_metrics
+from app.utils import extract_key_metrics, size_to_bounds, encode_cursor, decode_cursor
 from .config import config
+from .streaming import wants_stream, stream_query
+from .cache import cache_stats
+from .singleflight import single_flight_stats
+from .rate_limit import rate_limit_stats, RateLimitExceeded
+from .background import BackgroundRefresher
 
 
 # Shared extension objects
 db = SQLAlchemy()
 migrate = Migrate()
 
+# Keyset pagination bounds for trade listings
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Upper bound on symbols per /api/quotes request
+MAX_BATCH_SYMBOLS = 50
+
+# Body of a 503 when the upstream rate limiter gives up on a call
+UPSTREAM_BUSY_ERROR = "The market data provider is busy, try again shortly."
+
 
 # Helper Function
 def size_to_numeric(size_str):
@@ -32,43 +48,8 @@ def size_to_numeric(size_str):
     to an approximate numeric value (midpoint of range).
     Returns 0 if parsing fails or size is N/A.
     """
-    if not size_str or size_str.lower() == 'n/a':
-        return 0
-
-    size_str = size_str.replace(',', '').strip()
-
-    def parse_multiplier(value, multiplier):
-        """Helper to apply K/M multiplier."""
-        if multiplier and multiplier.lower() == 'k':
-            return value * 1000
-        elif multiplier and multiplier.lower() == 'm':
-            return value * 1000000
-        return value
-
-    # Handle '<' and '>' cases
-    match = re.match(r'([<>])\s*(\d+)([KkMm]?)', size_str)
-    if match:
-        operator, value, multiplier = match.groups()
-        value = parse_multiplier(float(value), multiplier)
-        return value / 2 if operator == '<' else value
-
-    # Handle ranges (e.g., '1K–15K', '5M-25M')
-    match = re.match(r'(\d+(?:[.,]\d+)?)\s?([KkMm]?)\s?[-–]\s?(\d+(?:[.,]\d+)?)\s?([KkMm]?)', size_str)
-    if match:
-        val1, mult1, val2, mult2 = match.groups()
-        val1 = parse_multiplier(float(val1), mult1)
-        val2 = parse_multiplier(float(val2), mult2)
-        return (val1 + val2) / 2  # Return midpoint of the range
-
-    # Handle single values (e.g., '100K')
-    match = re.match(r'^(\d+(?:[.,]\d+)?)\s?([KkMm]?)$', size_str)
-    if match:
-        value, multiplier = match.groups()
-        return parse_multiplier(float(value), multiplier)
-
-    # If parsing fails, log a warning and return 0
-    print(f"Could not parse size string: {size_str}")
-    return 0
+    _, _, mid = size_to_bounds(size_str)
+    return mid if mid is not None else 0
 
 # Application Factory
 def create_app(config_name=None):
@@ -86,6 +67,26 @@ def create_app(config_name=None):
 
     # Import models
     from . import models  # noqa: F401
+    from .prices import get_stored_prices
+    from .metrics import latest_metric, is_stale, store_metrics, refresh_metrics
+    from .profiles import profile_is_stale, store_profile, refresh_profile
+
+    # Refreshes stale cached data off the request path
+    refresher = BackgroundRefresher(app)
+
+    # Builds the sections of stock bundle requests concurrently
+    bundle_pool = ThreadPoolExecutor(
+        max_workers=app.config['STOCK_BUNDLE_WORKERS'], thread_name_prefix='bundle'
+    )
+
+    def upstream_busy(e):
+        """
+        503 for a request whose upstream call gave up waiting on the rate limiter.
+        """
+        response = jsonify({"error": UPSTREAM_BUSY_ERROR})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(math.ceil(e.retry_after))
+        return response
 
     # Routes
     @app.route('/')
@@ -93,42 +94,108 @@ def create_app(config_name=None):
         return "Hello from SmartTick Backend!"
 
 
+    @app.route('/api/upstream/stats', methods=["GET"])
+    def upstream_stats():
+        """
+        Reports hit/miss counters for the upstream API caches, coalesced-call
+        counters for the single-flight groups and rate limiter counters
+        in this worker.
+        """
+        return jsonify({
+            "cache": cache_stats(),
+            "coalescing": single_flight_stats(),
+            "rate_limit": rate_limit_stats()
+        })
+
+
+    def load_profile(symbol):
+        """
+        Builds /api/profile's body for an upper-cased symbol. Returns (body, status).
+        """
+        stock = db.session.query(models.Stock).filter_by(symbol=symbol).first()
+
+        if stock:
+            if profile_is_stale(stock, app.config['PROFILE_MAX_AGE_DAYS']):
+                refresher.submit(('profile', symbol), refresh_profile, symbol)
+            return stock.to_profile_dict(), 200
+
+        profile_data = get_profile(symbol)
+        if not profile_data or not profile_data.get('name'):
+            return {"error": f"No profile data found for symbol {symbol}"}, 404
+
+        try:
+            store_profile(profile_data)
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Failed to store profile for {symbol}: {e}")
+
+        return profile_data, 200
+
     @app.route('/api/profile/<symbol>', methods=["GET"])
     def stock_profile(symbol):
         """
-        Fetches stock profile information using the Finnhub client.
+        Returns stock profile information from the Stock table, in Finnhub's
+        company_profile2 shape. Profiles older than PROFILE_MAX_AGE_DAYS are
+        refreshed in the background; unknown symbols are fetched from Finnhub
+        and stored.
         """
         if not symbol:
             return jsonify({"error": "Stock symbol is required"}), 400
 
         try:
-            profile_data = get_profile(symbol.upper())
-            if not profile_data or not profile_data.get('name'):
-                return jsonify({"error": f"No profile data found for symbol {symbol}"}), 404
-            return jsonify(profile_data)
+            body, status = load_profile(symbol.upper())
+            return jsonify(body), status
+        except RateLimitExceeded as e:
+            return upstream_busy(e)
         except Exception as e:
             app.logger.error(f"Failed to fetch profile for {symbol}: {e}", exc_info=True)
             return jsonify({"error": "An internal server error occurred"}), 500
     
 
+    def load_financials(symbol):
+        """
+        Builds /api/financials-compact's body for an upper-cased symbol.
+        Returns (body, status).
+        """
+        stock = db.session.query(models.Stock).filter_by(symbol=symbol).first()
+        metric = latest_metric(stock.id) if stock else None
+
+        if metric:
+            if is_stale(metric, app.config['FINANCIALS_MAX_AGE_DAYS']):
+                refresher.submit(('financials', symbol), refresh_metrics, symbol)
+            return metric.to_metrics_dict(), 200
+
+        raw = get_financials(symbol)
+        if not raw or "metric" not in raw:
+            return {"error": f"No financial data for {symbol}"}, 404
+
+        # narrow it down to our 19 fields
+        data = extract_key_metrics(raw)
+
+        if stock:
+            try:
+                store_metrics(stock.id, data)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.warning(f"Failed to store financials for {symbol}: {e}")
+
+        return data, 200
+
     @app.route('/api/financials-compact/<symbol>', methods=["GET"])
     def stock_financials_compact(symbol):
         """
-        Fetches a short list of key financial metrics for a stock 
-        from the Finnhub client.
+        Returns a short list of key financial metrics for a stock from the
+        latest StockMetric row. Stale rows are served while a background
+        refresh is queued; Finnhub is called inline only when no row exists.
         """
         if not symbol:
             return jsonify({"error": "Stock symbol is required"}), 400
 
         try:
-            raw = get_financials(symbol.upper())
-            if not raw or "metric" not in raw:
-                return jsonify({"error": f"No financial data for {symbol}"}), 404
-
-            # narrow it down to our 18 fields
-            data = extract_key_metrics(raw)
-
-            return jsonify(data)
+            body, status = load_financials(symbol.upper())
+            return jsonify(body), status
+        except RateLimitExceeded as e:
+            return upstream_busy(e)
         except Exception as e:
             app.logger.error(f"Failed to fetch financials for {symbol}: {e}", exc_info=True)
             return jsonify({"error": "An internal server error occurred"}), 500
@@ -147,11 +214,22 @@ def create_app(config_name=None):
             if not financial_data:
                 return jsonify({"error": f"No profile data found for symbol {symbol}"}), 404
             return jsonify(financial_data)
+        except RateLimitExceeded as e:
+            return upstream_busy(e)
         except Exception as e:
             app.logger.error(f"Failed to fetch profile for {symbol}: {e}", exc_info=True)
             return jsonify({"error": "An internal server error occurred"}), 500
     
 
+    def load_quote(symbol):
+        """
+        Builds /api/price's body for an upper-cased symbol. Returns (body, status).
+        """
+        price_data = get_quote_data(symbol)
+        if not price_data:
+            return {"error": f"No price data found for symbol {symbol}"}, 404
+        return price_data, 200
+
     @app.route('/api/price/<symbol>', methods=["GET"])
     def realtime_price(symbol):
         """
@@ -161,68 +239,51 @@ def create_app(config_name=None):
             return jsonify({"error": "Stock symbol is required"}), 400
 
         try:
-            price_data = get_quote_data(symbol.upper())
-            if not price_data:
-                return jsonify({"error": f"No price data found for symbol {symbol}"}), 404
-            return jsonify(price_data)
+            body, status = load_quote(symbol.upper())
+            return jsonify(body), status
+        except RateLimitExceeded as e:
+            return upstream_busy(e)
         except Exception as e:
             app.logger.error(f"Failed to fetch real-time price for {symbol}: {e}", exc_info=True)
             return jsonify({"error": "An internal server error occurred"}), 500
-    
-    def fetch_trade_data(base_symbol):
-        """
-        Fetches trade data for the given stock symbol from the database.
-        """
-        return db.session.query(
-            models.Trade.traded,
-            models.Trade.type,
-            models.Trade.size
-        ).filter(
-            models.Trade.traded_issuer_ticker.ilike(f"%{base_symbol}%"),
-            models.Trade.traded.isnot(None)
-        ).order_by(models.Trade.traded).all()
-
 
-    def process_trade_data(results):
+    @app.route('/api/quotes', methods=["GET"])
+    def batch_quotes():
         """
-        Processes trade data into a monthly summary.
+        Fetches real-time prices for a comma-separated 'symbols' list in one
+        request. Cached quotes are served immediately and the rest are fetched
+        concurrently. Returns {symbol: quote}; symbols without price data map to null.
         """
-        monthly_summary = {}
-
-        for trade_date, trade_type, trade_size_str in results:
-            if not isinstance(trade_date, date):
-                app.logger.warning(f"Skipping record with invalid date: {trade_date}")
-                continue
-
-            year, month = trade_date.year, trade_date.month
-            month_key = (year, month)
-            numeric_size = size_to_numeric(trade_size_str)
-
-            if month_key not in monthly_summary:
-                monthly_summary[month_key] = {'buy': 0, 'sell': 0}
-
-            if trade_type.lower() == 'buy':
-                monthly_summary[month_key]['buy'] += numeric_size
-            elif trade_type.lower() == 'sell':
-                monthly_summary[month_key]['sell'] += numeric_size
-
-        return monthly_summary
-
+        symbols = [
+            symbol.strip().upper()
+            for symbol in request.args.get('symbols', '').split(',')
+            if symbol.strip()
+        ]
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return jsonify({"error": "Query parameter 'symbols' is required."}), 400
+        if len(symbols) > MAX_BATCH_SYMBOLS:
+            return jsonify({"error": f"At most {MAX_BATCH_SYMBOLS} symbols per request."}), 400
 
-    def format_monthly_summary(monthly_summary):
+        try:
+            return jsonify(get_quotes(symbols))
+        except Exception as e:
+            app.logger.error(f"Failed to fetch quotes for {symbols}: {e}", exc_info=True)
+            return jsonify({"error": "An internal server error occurred"}), 500
+    
+    def load_trade_summary(symbol):
         """
-        Formats the monthly summary into a list of dictionaries for the API response.
+        Builds /api/trades/summary's body for an upper-cased symbol. Returns (body, status).
         """
-        return [
-            {
-                "year": key[0],
-                "month": key[1],
-                "month_label": f"{key[0]}-{key[1]:02d}",
-                "buy_total": data['buy'],
-                "sell_total": data['sell']
-            }
-            for key, data in sorted(monthly_summary.items())
-        ]
+        # Monthly totals are precomputed at import time
+        rollups = db.session.query(models.TradeMonthlyRollup).filter(
+            models.TradeMonthlyRollup.ticker == symbol
+        ).order_by(
+            models.TradeMonthlyRollup.year,
+            models.TradeMonthlyRollup.month
+        ).all()
+
+        return [rollup.to_dict() for rollup in rollups], 200
 
     @app.route('/api/trades/summary/<symbol>', methods=["GET"])
     def trade_summary(symbol):
@@ -232,43 +293,129 @@ def create_app(config_name=None):
         if not symbol:
             return jsonify({"error": "Stock symbol is required"}), 400
 
-        base_symbol = symbol.upper()
         try:
-            # Fetch trade data from the database
-            results = fetch_trade_data(base_symbol)
-
-            # Process the results into a monthly summary
-            monthly_summary = process_trade_data(results)
-
-            # Format the summary for the response
-            summary_list = format_monthly_summary(monthly_summary)
-
-            return jsonify(summary_list)
+            body, status = load_trade_summary(symbol.upper())
+            return jsonify(body), status
         except Exception as e:
             app.logger.error(f"Failed to fetch trade summary for {symbol}: {e}", exc_info=True)
             return jsonify({"error": "An internal server error occurred"}), 500
 
 
+    def wants_all():
+        """
+        Trade listings are paged unless a client opts into the whole
+        list with 'all=true'.
+        """
+        return request.args.get('all', '').lower() in ('1', 'true', 'yes')
+
+
+    def paginate_trades(query, limit=DEFAULT_PAGE_SIZE, cursor=None, trade_of=lambda row: row):
+        """
+        Applies keyset pagination on (traded, id), newest first: `limit` rows
+        (clamped to MAX_PAGE_SIZE) after the position in `cursor`.
+        Returns the page of rows and the cursor for the next page (or None).
+        Raises ValueError for a malformed cursor.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        if cursor:
+            cursor_traded, cursor_id = decode_cursor(cursor)
+            if cursor_traded is None:
+                # Undated trades sort first; finish them, then continue into dated ones
+                query = query.filter(db.or_(
+                    db.and_(models.Trade.traded.is_(None), models.Trade.id < cursor_id),
+                    models.Trade.traded.isnot(None)
+                ))
+            else:
+                query = query.filter(
+                    tuple_(models.Trade.traded, models.Trade.id) < (cursor_traded, cursor_id)
+                )
+
+        rows = query.order_by(
+            models.Trade.traded.desc().nullsfirst(),
+            models.Trade.id.desc()
+        ).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_trade = trade_of(rows[-1])
+            next_cursor = encode_cursor(last_trade.traded, last_trade.id)
+
+        return rows, next_cursor
+
+
+    def trade_with_img(trade, img):
+        """
+        Serializes a trade along with its politician's image URL.
+        """
+        trade_dict = trade.to_dict()
+        if img:
+            trade_dict['img'] = f"https://www.capitoltrades.com{img}"
+        else:
+            trade_dict['img'] = None
+        return trade_dict
+
+
+    def load_symbol_trades_page(symbol, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """
+        Builds one keyset page of /api/trades/<symbol> for an upper-cased
+        symbol: {count, data, next_cursor}. Returns (body, status).
+        """
+        query = db.session.query(models.Trade).filter(models.Trade.base_ticker == symbol)
+        try:
+            trades, next_cursor = paginate_trades(query, limit, cursor)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        if not trades and not cursor:
+            return {"error": f"No trade data found for symbol {symbol}"}, 404
+        return {
+            'count': len(trades),
+            'data': [trade.to_dict() for trade in trades],
+            'next_cursor': next_cursor
+        }, 200
+
     @app.route('/api/trades/<symbol>', methods=["GET"])
     def get_trades_by_symbol(symbol):
         """
-        Fetches all trade data for the given stock symbol from the Trade table.
+        Fetches a page of trades for the given stock symbol from the Trade
+        table, newest first. Pages hold 'limit' trades (default
+        DEFAULT_PAGE_SIZE); pass the returned 'next_cursor' as 'cursor' for
+        the next one. Pass 'all=true' for every trade as one array, or
+        'stream=true' (or Accept: application/x-ndjson) to stream them.
         """
         if not symbol:
             return jsonify({"error": "Stock symbol is required"}), 400
 
         try:
             # Query the database for trades matching the symbol and sort by date (descending)
-            trades = db.session.query(models.Trade).filter(
-                models.Trade.traded_issuer_ticker.ilike(f"%{symbol.upper()}%")
-            ).order_by(models.Trade.traded.desc()).all()
+            query = db.session.query(models.Trade).filter(
+                models.Trade.base_ticker == symbol.upper()
+            )
 
-            if not trades:
-                return jsonify({"error": f"No trade data found for symbol {symbol}"}), 404
+            if wants_stream():
+                return stream_query(
+                    query.order_by(models.Trade.traded.desc(), models.Trade.id.desc()),
+                    lambda trade: trade.to_dict()
+                )
+
+            if wants_all():
+                trades = query.order_by(models.Trade.traded.desc(), models.Trade.id.desc()).all()
+
+                if not trades:
+                    return jsonify({"error": f"No trade data found for symbol {symbol}"}), 404
 
-            trades_data = [trade.to_dict() for trade in trades]
+                trades_data = [trade.to_dict() for trade in trades]
 
-            return jsonify(trades_data)
+                return jsonify(trades_data)
+
+            body, status = load_symbol_trades_page(
+                symbol.upper(),
+                request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+                request.args.get('cursor')
+            )
+            return jsonify(body), status
         except Exception as e:
             app.logger.error(f"Failed to fetch trades for {symbol}: {e}", exc_info=True)
             return jsonify({"error": "An internal server error occurred"}), 500
@@ -277,60 +424,153 @@ def create_app(config_name=None):
     @app.route('/api/trades', methods=["GET"])
     def get_recent_trades():
         """
-        Fetches all trade data from the Trade table, sorted by trade date in descending order.
-        Includes politician image if available.
+        Fetches a page of trades from the Trade table, newest first, with the
+        politician image if available. Pages hold 'limit' trades (default
+        DEFAULT_PAGE_SIZE); pass the returned 'next_cursor' as 'cursor' for
+        the next one. Pass 'all=true' for every trade as one array, or
+        'stream=true' (or Accept: application/x-ndjson) to stream them.
         """
         try:
-            # Outer join Trade with PoliticianImg on politician_name
-            trades = db.session.query(
+            # Outer join Trade with Politician on the integer politician_id
+            query = db.session.query(
                 models.Trade,
-                models.PoliticianImg.img
+                models.Politician.img
             ).outerjoin(
-                models.PoliticianImg,
-                models.Trade.politician_name == models.PoliticianImg.politician_name
-            ).order_by(models.Trade.traded.desc()).all()
+                models.Politician,
+                models.Trade.politician_id == models.Politician.id
+            )
 
-            if not trades:
-                return jsonify({"error": "No trade data found"}), 404
+            if wants_stream():
+                return stream_query(
+                    query.order_by(models.Trade.traded.desc(), models.Trade.id.desc()),
+                    lambda row: trade_with_img(*row)
+                )
+
+            if wants_all():
+                trades = query.order_by(models.Trade.traded.desc(), models.Trade.id.desc()).all()
+
+                if not trades:
+                    return jsonify({"error": "No trade data found"}), 404
+
+                trades_data = [trade_with_img(trade, img) for trade, img in trades]
 
-            trades_data = []
-            for trade, img in trades:
-                trade_dict = trade.to_dict()
-                if img:
-                    trade_dict['img'] = f"https://www.capitoltrades.com{img}"
-                else:
-                    trade_dict['img'] = None
-                trades_data.append(trade_dict)
+                return jsonify(trades_data)
 
-            return jsonify(trades_data)
+            trades, next_cursor = paginate_trades(
+                query,
+                request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+                request.args.get('cursor'),
+                trade_of=lambda row: row[0]
+            )
+            if not trades and not request.args.get('cursor'):
+                return jsonify({"error": "No trade data found"}), 404
+            return jsonify({
+                'count': len(trades),
+                'data': [trade_with_img(trade, img) for trade, img in trades],
+                'next_cursor': next_cursor
+            })
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             app.logger.error(f"Failed to fetch trades: {e}", exc_info=True)
             return jsonify({"error": "An internal server error occurred"}), 500
 
 
+    def load_prices(symbol, start_date, end_date):
+        """
+        Builds /api/prices's body for an upper-cased symbol and the raw
+        'start' / 'end' parameters. Returns (body, status).
+        """
+        try:
+            start = date.fromisoformat(start_date or '')
+            end = date.fromisoformat(end_date or '')
+        except ValueError:
+            return {
+                "error": "Both 'start' and 'end' query parameters are required, in YYYY-MM-DD format."
+            }, 400
+
+        return {
+            "symbol": symbol,
+            "start":  start_date,
+            "end":    end_date,
+            "prices": get_stored_prices(symbol, start, end, refresher)
+        }, 200
+
     @app.route("/api/prices/<symbol>", methods=["GET"])
     def daily_prices(symbol):
         """
         GET /api/prices/AAPL?start=2024-01-01&end=2024-02-01
-        returns Tiingo daily OHLC data between those dates
+        returns daily OHLC data between those dates, served from the
+        StockPrice table; missing dates are fetched from Tiingo in the
+        background, or inline when nothing is stored yet
         """
-        start_date = request.args.get("start")
-        end_date   = request.args.get("end")
-        if not start_date or not end_date:
-            return jsonify({
-                "error": "Both 'start' and 'end' query parameters are required, in YYYY-MM-DD format."
-            }), 400
-
         try:
-            data = get_daily_prices(symbol, start_date, end_date)
-            return jsonify({
-                "symbol": symbol.upper(),
-                "start":  start_date,
-                "end":    end_date,
-                "prices": data
-            })
+            body, status = load_prices(symbol.upper(), request.args.get("start"), request.args.get("end"))
+            return jsonify(body), status
+        except RateLimitExceeded as e:
+            return upstream_busy(e)
         except Exception as e:
             return jsonify({"error": str(e)}), 500
+
+
+    # Sections of /api/stocks/<symbol>/bundle and the helpers that build them
+    bundle_sections = {
+        'profile': load_profile,
+        'price': load_quote,
+        'trade_summary': load_trade_summary,
+        'trades': load_symbol_trades_page,
+        'prices': load_prices,
+        'financials': load_financials
+    }
+
+    def bundle_section(name, symbol, *args):
+        """
+        Builds one section in its own app context (and so its own DB
+        session) on a bundle worker thread. Returns {"status", "data"}.
+        """
+        with app.app_context():
+            try:
+                body, status = bundle_sections[name](symbol, *args)
+            except RateLimitExceeded:
+                body, status = {"error": UPSTREAM_BUSY_ERROR}, 503
+            return {"status": status, "data": body}
+
+    @app.route('/api/stocks/<symbol>/bundle', methods=["GET"])
+    def stock_bundle(symbol):
+        """
+        Returns every section of the stock page in one document, keyed by
+        section name, each with its own status and the body its standalone
+        route would return. Sections are built concurrently. Pass 'sections'
+        (comma-separated) to pick some. 'trades' is one page of
+        /api/trades/<symbol> ('limit', default DEFAULT_PAGE_SIZE, and
+        'cursor'); 'prices' takes 'start' and 'end'.
+        """
+        requested = request.args.get('sections')
+        names = [name.strip() for name in requested.split(',') if name.strip()] if requested else list(bundle_sections)
+        unknown = [name for name in names if name not in bundle_sections]
+        if unknown:
+            return jsonify({
+                "error": f"Unknown sections {unknown}; choose from {list(bundle_sections)}."
+            }), 400
+
+        section_args = {
+            'trades': (request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), request.args.get('cursor')),
+            'prices': (request.args.get('start'), request.args.get('end'))
+        }
+        futures = {
+            name: bundle_pool.submit(bundle_section, name, symbol.upper(), *section_args.get(name, ()))
+            for name in dict.fromkeys(names)
+        }
+
+        bundle = {"symbol": symbol.upper()}
+        for name, future in futures.items():
+            try:
+                bundle[name] = future.result()
+            except Exception as e:
+                app.logger.error(f"Failed to build {name} for {symbol}: {e}", exc_info=True)
+                bundle[name] = {"status": 500, "data": {"error": "An internal server error occurred"}}
+
+        return jsonify(bundle)
         
 
     @app.route('/api/autocomplete/stocks', methods=["GET"])
@@ -345,7 +585,9 @@ def create_app(config_name=None):
         try:
             stocks = db.session.query(models.Stock).filter(
                 db.or_(
-                    models.Stock.symbol.ilike(f"{query}%"),
+                    # symbols are stored upper-cased, so a plain LIKE can use
+                    # the text_pattern_ops index
+                    models.Stock.symbol.like(f"{query}%"),
                     models.Stock.name.ilike(f"{query}%")
                 )
             ).limit(10).all()
@@ -374,15 +616,15 @@ def create_app(config_name=None):
 
         try:
             politicians = db.session.query(
-                models.PoliticianImg
+                models.Politician
             ).filter(
-                models.PoliticianImg.politician_name.ilike(f"{query}%")
-            ).distinct().limit(10).all()
+                func.lower(models.Politician.name).like(f"{query}%")
+            ).limit(10).all()
 
             results = [
                 {
-                    'name': politician.politician_name,
-                    'affiliation': politician.politician_family,
+                    'name': politician.name,
+                    'affiliation': politician.family,
                     'img': politician.img
                 }
                 for politician in politicians
@@ -404,31 +646,41 @@ def create_app(config_name=None):
             return jsonify({"error": "Query parameter 'name' is required."}), 400
 
         try:
-            image = db.session.query(models.PoliticianImg).filter(
-                func.lower(models.PoliticianImg.politician_name) == query.lower()
+            image = db.session.query(models.Politician).filter(
+                func.lower(models.Politician.name) == query.lower()
             ).first()
             if not image:
                 return jsonify({"error": "No Image data found"}), 404
-            img_dict = image.to_dict()
-            if img_dict.get("img"):
-                img_dict["img"] = f"https://www.capitoltrades.com{img_dict['img']}"
-            return jsonify(img_dict)
+            return jsonify(politician_image_dict(image))
         except Exception as e:
             app.logger.error(f"failed to fetch images: {e}", exc_info=True)
             return jsonify({"error": "an internal server error occured"}), 500
 
+    def politician_image_dict(politician):
+        """
+        Serializes a politician with their full image URL, as /api/pol/image returns it.
+        """
+        img_dict = politician.to_dict()
+        if img_dict.get("img"):
+            img_dict["img"] = f"https://www.capitoltrades.com{img_dict['img']}"
+        return img_dict
+
+    def politician_id_of(name):
+        """
+        Scalar subquery resolving a politician's name to its id, so trade
+        lookups filter on the integer politician_id in the same round trip.
+        """
+        return db.session.query(models.Politician.id).filter(
+            models.Politician.name == name
+        ).scalar_subquery()
+
     def get_politician_total_spending(politician_name):
-        trades = db.session.query(models.Trade.size).filter(
-            models.Trade.politician_name == politician_name,
-            models.Trade.size.isnot(None)
-        ).all()
-        
-        total = 0
-        for trade in trades:
-            if trade.size:
-                amount = size_to_numeric(trade.size)
-                total += amount
-        
+        total = db.session.query(
+            func.coalesce(func.sum(models.Trade.size_mid), 0)
+        ).filter(
+            models.Trade.politician_id == politician_id_of(politician_name)
+        ).scalar()
+
         return total
 
     @app.route('/api/politicians/stats', methods=["GET"])
@@ -437,55 +689,20 @@ def create_app(config_name=None):
             limit = request.args.get('limit', 500, type=int)
             min_trades = request.args.get('min_trades', 1, type=int)
 
-            politician_query = db.session.query(
-                models.Trade.politician_name,
-                models.Trade.politician_family,
-                func.count(models.Trade.id).label('trade_count'),
-                func.count(func.distinct(models.Trade.traded_issuer_ticker)).label('stock_count'),
-                func.max(models.Trade.traded).label('latest_trade'),
-                func.sum(case((models.Trade.type == 'buy', 1), else_=0)).label('buy_count'),
-                func.sum(case((models.Trade.type == 'sell', 1), else_=0)).label('sell_count')
+            # Precomputed at import time; the trade_count index serves the
+            # min_trades filter and limit
+            leaderboard = db.session.query(models.PoliticianLeaderboard).join(
+                models.PoliticianLeaderboard.politician
+            ).options(
+                contains_eager(models.PoliticianLeaderboard.politician)
             ).filter(
-                models.Trade.politician_name.isnot(None)
-            ).group_by(
-                models.Trade.politician_name, 
-                models.Trade.politician_family
-            ).having(
-                func.count(models.Trade.id) >= min_trades
+                models.PoliticianLeaderboard.trade_count >= min_trades
+            ).order_by(
+                models.PoliticianLeaderboard.trade_count.desc(),
+                models.Politician.name
             ).limit(limit).all()
 
-            # --- Optimization: Fetch all relevant trades in one query ---
-            pol_names = [row.politician_name for row in politician_query]
-            all_trades = db.session.query(
-                models.Trade.politician_name,
-                models.Trade.size
-            ).filter(
-                models.Trade.politician_name.in_(pol_names),
-                models.Trade.size.isnot(None)
-            ).all()
-
-            spending_map = {}
-            for pol_name, size in all_trades:
-                if pol_name not in spending_map:
-                    spending_map[pol_name] = 0
-                if size:
-                    spending_map[pol_name] += size_to_numeric(size)
-
-            results = []
-            for row in politician_query:
-                buy_percentage = (row.buy_count / row.trade_count * 100) if row.trade_count > 0 else 0
-                estimated_spending = spending_map.get(row.politician_name, 0)
-                results.append({
-                    'name': row.politician_name,
-                    'party': row.politician_family or 'Unknown',
-                    'total_trades': row.trade_count,
-                    'buy_trades': row.buy_count,
-                    'sell_trades': row.sell_count,
-                    'buy_percentage': round(buy_percentage, 1),
-                    'estimated_spending': estimated_spending,
-                    'different_stocks': row.stock_count,
-                    'last_trade_date': row.latest_trade.isoformat() if row.latest_trade else None
-                })
+            results = [row.to_dict() for row in leaderboard]
 
             return jsonify({
                 'count': len(results),
@@ -504,7 +721,7 @@ def create_app(config_name=None):
                 models.Trade.traded_issuer_ticker,
                 models.Trade.traded_issuer_name,
                 func.count(models.Trade.id).label('total_trades'),
-                func.count(func.distinct(models.Trade.politician_name)).label('politician_count'),
+                func.count(func.distinct(models.Trade.politician_id)).label('politician_count'),
                 func.sum(case((models.Trade.type == 'buy', 1), else_=0)).label('buy_count'),
                 func.sum(case((models.Trade.type == 'sell', 1), else_=0)).label('sell_count')
             ).filter(
@@ -537,6 +754,92 @@ def create_app(config_name=None):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/politicians/<name>/profile', methods=["GET"])
+    def get_politician_profile(name):
+        """
+        Returns a politician's image, latest trade, biggest trade and stats in
+        one document, from a single query: window functions rank and total the
+        politician's trades and only the latest and biggest rows come back.
+        """
+        if not name or len(name) < 1:
+            return jsonify({"error": "Politician name is required."}), 400
+
+        try:
+            trade = models.Trade
+            # Same name resolution and orderings as the latest-trade,
+            # biggest-trade and stats routes; trades without a size never
+            # count as the biggest
+            latest_rank = func.row_number().over(
+                partition_by=trade.politician_id,
+                order_by=(trade.traded.desc(), trade.id.desc())
+            )
+            biggest_rank = func.row_number().over(
+                partition_by=trade.politician_id,
+                order_by=(
+                    trade.size.is_(None),
+                    trade.size_mid.desc().nullslast(),
+                    trade.id
+                )
+            )
+            ranked = db.session.query(
+                trade,
+                latest_rank.label('latest_rank'),
+                biggest_rank.label('biggest_rank'),
+                func.count(trade.id).over(partition_by=trade.politician_id).label('trade_count'),
+                func.coalesce(
+                    func.sum(trade.size_mid).over(partition_by=trade.politician_id), 0
+                ).label('estimated_spending')
+            ).filter(
+                trade.politician_id == politician_id_of(name)
+            ).subquery()
+            ranked_trade = aliased(models.Trade, ranked)
+
+            rows = db.session.query(
+                models.Politician,
+                ranked_trade,
+                ranked.c.latest_rank,
+                ranked.c.biggest_rank,
+                ranked.c.trade_count,
+                ranked.c.estimated_spending
+            ).outerjoin(
+                ranked,
+                and_(
+                    ranked.c.politician_id == models.Politician.id,
+                    or_(ranked.c.latest_rank == 1, ranked.c.biggest_rank == 1)
+                )
+            ).filter(
+                models.Politician.name == name
+            ).all()
+
+            if not rows:
+                return jsonify({"error": "No politician found with this name."}), 404
+
+            politician = rows[0].Politician
+            profile = {
+                'image': politician_image_dict(politician),
+                'latest_trade': None,
+                'biggest_trade': None,
+                'stats': None
+            }
+            for row in rows:
+                found = row[1]
+                if found is None:
+                    continue
+                if row.latest_rank == 1:
+                    profile['latest_trade'] = found.to_dict()
+                if row.biggest_rank == 1 and found.size is not None:
+                    profile['biggest_trade'] = found.to_dict()
+                profile['stats'] = {
+                    'name': politician.name,
+                    'total_trades': row.trade_count,
+                    'estimated_spending': row.estimated_spending
+                }
+
+            return jsonify(profile)
+        except Exception as e:
+            app.logger.error(f"Failed to fetch profile for {name}: {e}", exc_info=True)
+            return jsonify({"error": "An internal server error occurred"}), 500
+
     @app.route('/api/politicians/<name>/latest-trade', methods=["GET"])
     def get_politician_latest_trade(name):
         """
@@ -547,8 +850,11 @@ def create_app(config_name=None):
 
         try:
             trade = db.session.query(models.Trade).filter(
-                models.Trade.politician_name == name
-            ).order_by(models.Trade.traded.desc()).first()
+                models.Trade.politician_id == politician_id_of(name)
+            ).order_by(
+                models.Trade.traded.desc(),
+                models.Trade.id.desc()
+            ).first()
             if not trade:
                 return jsonify({"error": "No trades found for this politician."}), 404
             return jsonify(trade.to_dict())
@@ -565,18 +871,17 @@ def create_app(config_name=None):
             return jsonify({"error": "Politician name is required."}), 400
 
         try:
-            trades = db.session.query(models.Trade).filter(
-                models.Trade.politician_name == name,
+            # Largest numeric size first; unparsed sizes sort last
+            biggest_trade = db.session.query(models.Trade).filter(
+                models.Trade.politician_id == politician_id_of(name),
                 models.Trade.size.isnot(None)
-            ).all()
-            if not trades:
+            ).order_by(
+                models.Trade.size_mid.desc().nullslast(),
+                models.Trade.id
+            ).first()
+            if not biggest_trade:
                 return jsonify({"error": "No trades found for this politician."}), 404
 
-            # Find the trade with the largest numeric size
-            biggest_trade = max(
-                trades,
-                key=lambda t: size_to_numeric(t.size) if t.size else 0
-            )
             return jsonify(biggest_trade.to_dict())
         except Exception as e:
             app.logger.error(f"Failed to fetch biggest trade for {name}: {e}", exc_info=True)
@@ -592,28 +897,25 @@ def create_app(config_name=None):
 
         try:
             row = db.session.query(
-                models.Trade.politician_name,
-                func.count(models.Trade.id).label('trade_count')
+                models.Politician.name.label('politician_name'),
+                func.count(models.Trade.id).label('trade_count'),
+                func.coalesce(func.sum(models.Trade.size_mid), 0).label('estimated_spending')
+            ).join(
+                models.Trade,
+                models.Trade.politician_id == models.Politician.id
             ).filter(
-                models.Trade.politician_name == name
+                models.Politician.name == name
             ).group_by(
-                models.Trade.politician_name
+                models.Politician.id
             ).first()
 
             if not row:
                 return jsonify({"error": "No stats found for this politician."}), 404
 
-            # Calculate estimated spending for this politician
-            trades = db.session.query(models.Trade.size).filter(
-                models.Trade.politician_name == name,
-                models.Trade.size.isnot(None)
-            ).all()
-            estimated_spending = sum(size_to_numeric(t.size) for t in trades if t.size)
-
             result = {
                 'name': row.politician_name,
                 'total_trades': row.trade_count,
-                'estimated_spending': estimated_spending
+                'estimated_spending': row.estimated_spending
             }
 
             return jsonify(result)
@@ -0,0 +1,42 @@
+# app/background.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .rate_limit import BATCH, priority
+
+
+class BackgroundRefresher:
+    """
+    Runs refresh jobs on a small thread pool inside an app context.
+    A job is dropped when one with the same key is already queued or running,
+    so a burst of requests for one stale symbol triggers a single refresh.
+    """
+
+    def __init__(self, app, max_workers=2):
+        self.app = app
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='refresh')
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args):
+        """
+        Queues fn(*args). Returns False if a job for `key` is already pending.
+        """
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+
+        self._executor.submit(self._run, key, fn, args)
+        return True
+
+    def _run(self, key, fn, args):
+        try:
+            # refreshes are not user-facing, so they yield to live requests
+            with self.app.app_context(), priority(BATCH):
+                fn(*args)
+        except Exception as e:
+            self.app.logger.error(f"Background refresh {key} failed: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
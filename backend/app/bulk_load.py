@@ -0,0 +1,100 @@
+# app/bulk_load.py
+import io
+from itertools import islice
+
+from sqlalchemy import text
+
+from app import db
+
+# Rows buffered per COPY round trip; bounds Python memory on large loads
+COPY_CHUNK_SIZE = 10000
+
+
+def _csv_field(value):
+    if value is None:
+        return ''
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _csv_chunk(rows, columns):
+    """
+    Renders row dicts as CSV for COPY. Every non-NULL value except numbers
+    is quoted, so an unquoted empty field is NULL and "" stays ''.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(','.join(_csv_field(row.get(column)) for column in columns))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+def _csv_frame(frame, columns):
+    """
+    Renders a DataFrame as CSV for COPY with pandas' C writer. NULLs are
+    written as \\N (the COPY NULL marker below), so empty strings stay ''.
+    """
+    buffer = io.StringIO()
+    frame.to_csv(buffer, columns=columns, header=False, index=False, na_rep='\\N')
+    buffer.seek(0)
+    return buffer
+
+
+def _copy_into_staging(table, columns, buffers, copy_options="FORMAT csv"):
+    """
+    Creates the staging table and COPYs each (CSV buffer, row count) into it.
+    """
+    staging = f"staging_{table}"
+    column_list = ', '.join(f'"{column}"' for column in columns)
+
+    db.session.execute(text(
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+        f"SELECT {column_list} FROM {table} WITH NO DATA"
+    ))
+
+    # COPY needs the psycopg2 cursor behind the session's connection
+    cursor = db.session.connection().connection.cursor()
+    copied = 0
+    try:
+        for buffer, count in buffers:
+            cursor.copy_expert(
+                f"COPY {staging} ({column_list}) FROM STDIN WITH ({copy_options})",
+                buffer
+            )
+            copied += count
+    finally:
+        cursor.close()
+
+    return staging, copied
+
+
+def copy_to_staging(table, columns, rows, chunk_size=COPY_CHUNK_SIZE):
+    """
+    Streams row dicts into a temporary staging table shaped like `table`
+    (only `columns`) with COPY FROM STDIN, one chunk at a time. The staging
+    table is dropped at commit. Runs in the caller's transaction and
+    returns (staging table name, rows copied).
+    """
+    def buffers():
+        chunks = iter(rows)
+        while True:
+            chunk = list(islice(chunks, chunk_size))
+            if not chunk:
+                return
+            yield _csv_chunk(chunk, columns), len(chunk)
+
+    return _copy_into_staging(table, columns, buffers())
+
+
+def copy_frames_to_staging(table, columns, frames):
+    """
+    Same as copy_to_staging for an iterable of DataFrames, one COPY per
+    frame, rendered by pandas instead of row by row.
+    """
+    return _copy_into_staging(
+        table, columns,
+        ((_csv_frame(frame, columns), len(frame)) for frame in frames if len(frame)),
+        copy_options="FORMAT csv, NULL '\\N'"
+    )
@@ -0,0 +1,100 @@
+# app/cache.py
+import time
+import functools
+import threading
+from collections import OrderedDict
+
+# Every cache created in this process, by name, for the stats endpoint
+_caches = {}
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with a per-entry TTL and an LRU size bound.
+    `ttl` is a number of seconds, or a callable returning one, evaluated
+    when each entry is stored.
+    """
+
+    def __init__(self, name, maxsize, ttl, clock=time.monotonic):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        _caches[name] = self
+
+    def get(self, key):
+        """
+        Returns (True, value) for a live entry, otherwise (False, None).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value):
+        ttl = self.ttl() if callable(self.ttl) else self.ttl
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+def cached(cache):
+    """
+    Decorator that memoizes a function's truthy results in `cache`,
+    keyed by its positional arguments. Errors and empty results are
+    never cached.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            found, value = cache.get(args)
+            if found:
+                return value
+            value = fn(*args)
+            if value:
+                cache.set(args, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    """
+    Returns the hit/miss counters of every cache in this process.
+    """
+    return {name: cache.stats() for name, cache in _caches.items()}
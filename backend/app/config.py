@@ -9,6 +9,12 @@ class Config:
     FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
     TIINGO_API_KEY = os.getenv("TIINGO_API_KEY")
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
+    # StockMetric rows older than this are served, then refreshed in the background
+    FINANCIALS_MAX_AGE_DAYS = int(os.getenv('FINANCIALS_MAX_AGE_DAYS', 7))
+    # Stock profiles older than this are served, then refreshed in the background
+    PROFILE_MAX_AGE_DAYS = int(os.getenv('PROFILE_MAX_AGE_DAYS', 30))
+    # Threads shared by /api/stocks/<symbol>/bundle requests to build their sections
+    STOCK_BUNDLE_WORKERS = int(os.getenv('STOCK_BUNDLE_WORKERS', 12))
 
 class DevConfig(Config):
     '''
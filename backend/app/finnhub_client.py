@@ -1,7 +1,16 @@
 import os
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
 import finnhub
 import websocket
 
+from .cache import TTLCache, cached
+from .singleflight import SingleFlight, single_flight
+from .rate_limit import TokenBucket
+
 # put your finnhub API key into .env file
 API_KEY = os.getenv("FINNHUB_API_KEY")
 if not API_KEY:
@@ -10,6 +19,59 @@ if not API_KEY:
 # Setup client
 finnhub_client = finnhub.Client(api_key=API_KEY)
 
+# Free tier quota: 60 calls/minute, shared by every process on the host.
+# Batch imports leave FINNHUB_RATE_RESERVE tokens for web requests.
+FINNHUB_RATE_PER_MIN = int(os.getenv("FINNHUB_RATE_PER_MIN", 60))
+finnhub_limiter = TokenBucket(
+    "finnhub",
+    rate=FINNHUB_RATE_PER_MIN / 60,
+    capacity=int(os.getenv("FINNHUB_RATE_BURST", 10)),
+    reserve=int(os.getenv("FINNHUB_RATE_RESERVE", 3))
+)
+
+# Cache lifetimes in seconds, per data type
+PROFILE_CACHE_TTL = int(os.getenv("PROFILE_CACHE_TTL", 24 * 60 * 60))
+FINANCIALS_CACHE_TTL = int(os.getenv("FINANCIALS_CACHE_TTL", 6 * 60 * 60))
+QUOTE_CACHE_TTL = int(os.getenv("QUOTE_CACHE_TTL", 15))
+QUOTE_CACHE_TTL_CLOSED = int(os.getenv("QUOTE_CACHE_TTL_CLOSED", 30 * 60))
+
+# LRU bound on the number of symbols kept per cache
+CACHE_MAXSIZE = int(os.getenv("FINNHUB_CACHE_MAXSIZE", 1024))
+
+# Batch quote lookups fetch cache misses on a pool shared by every request,
+# so a large batch cannot outrun the rate limiter with a flood of threads
+QUOTE_BATCH_WORKERS = int(os.getenv("QUOTE_BATCH_WORKERS", 4))
+QUOTE_BATCH_TIMEOUT = float(os.getenv("QUOTE_BATCH_TIMEOUT", 10))
+quote_pool = ThreadPoolExecutor(max_workers=QUOTE_BATCH_WORKERS, thread_name_prefix='quotes')
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+
+def is_market_open(now=None):
+    """
+    True during regular US trading hours (Mon-Fri, 9:30-16:00 ET).
+    Exchange holidays are treated as trading days.
+    """
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def quote_ttl():
+    # quotes do not move outside market hours, so keep them much longer
+    return QUOTE_CACHE_TTL if is_market_open() else QUOTE_CACHE_TTL_CLOSED
+
+
+profile_cache = TTLCache("finnhub_profile", CACHE_MAXSIZE, PROFILE_CACHE_TTL)
+quote_cache = TTLCache("finnhub_quote", CACHE_MAXSIZE, quote_ttl)
+financials_cache = TTLCache("finnhub_financials", CACHE_MAXSIZE, FINANCIALS_CACHE_TTL)
+
+# Cache misses for the same symbol share one in-flight upstream call
+profile_flight = SingleFlight("finnhub_profile")
+quote_flight = SingleFlight("finnhub_quote")
+financials_flight = SingleFlight("finnhub_financials")
+
 # example company information (company_profile2 method)
 """
 {'country': 'US', 
@@ -32,8 +94,10 @@ finnhub_client = finnhub.Client(api_key=API_KEY)
 # - Recommended: call once per day to keep market cap and share data updated.
 # - Params:
 #     symbol (str): Company ticker symbol (e.g. "AAPL")
+@cached(profile_cache)
+@single_flight(profile_flight)
 def get_profile(symbol):
-    return finnhub_client.company_profile2(symbol=symbol)
+    return finnhub_limiter.call(finnhub_client.company_profile2, symbol=symbol)
 
 
 # Get current stock quote (real-time price data)
@@ -41,8 +105,47 @@ def get_profile(symbol):
 # - Best used for quick snapshot; use WebSocket for live streaming.
 # - Params:
 #     symbol (str): Company ticker symbol (e.g. "AAPL")
+@cached(quote_cache)
+@single_flight(quote_flight)
 def get_quote_data(symbol):
-    return finnhub_client.quote(symbol)
+    return finnhub_limiter.call(finnhub_client.quote, symbol)
+
+
+# Get current quotes for several symbols at once
+# - Cached quotes are returned without touching the pool; misses are fetched
+#   concurrently, so the batch takes as long as its slowest fetch.
+# - Returns {symbol: quote}; symbols that failed or did not finish within
+#   `timeout` map to None (their fetch still completes and fills the cache).
+# - Params:
+#     symbols (list[str]): Company ticker symbols (e.g. ["AAPL", "MSFT"])
+def get_quotes(symbols, timeout=QUOTE_BATCH_TIMEOUT):
+    quotes = {}
+    futures = {}
+    for symbol in symbols:
+        found, quote = quote_cache.get((symbol,))
+        if found:
+            quotes[symbol] = quote
+        else:
+            # get_quote_data without its cache lookup, which just missed;
+            # each task runs in a copy of the caller's context to keep its rate limit priority
+            futures[symbol] = quote_pool.submit(
+                contextvars.copy_context().run, _fetch_quote, symbol
+            )
+
+    wait(futures.values(), timeout=timeout)
+    for symbol, future in futures.items():
+        if future.done() and future.exception() is None:
+            quotes[symbol] = future.result() or None
+        else:
+            quotes[symbol] = None
+    return quotes
+
+
+def _fetch_quote(symbol):
+    quote = get_quote_data.__wrapped__(symbol)
+    if quote:
+        quote_cache.set((symbol,), quote)
+    return quote
 
 
 # Get basic financial metrics for a company
@@ -50,8 +153,10 @@ def get_quote_data(symbol):
 # - Useful for fundamental analysis and valuation.
 # - Params:
 #     symbol (str): Company ticker symbol (e.g. "AAPL")
+@cached(financials_cache)
+@single_flight(financials_flight)
 def get_financials(symbol):
-    return finnhub_client.company_basic_financials(symbol, 'all')
+    return finnhub_limiter.call(finnhub_client.company_basic_financials, symbol, 'all')
 
 
 # Get insider transactions for a company or market-wide
@@ -62,7 +167,7 @@ def get_financials(symbol):
 #     t (str): End date in format 'YYYY-MM-DD'
 #     symbol (str, optional): Company ticker symbol (e.g. "AAPL")
 def get_insider_transactions(f, t, symbol=''):
-    return finnhub_client.stock_insider_transactions(symbol=symbol, from_=f, to=t)
+    return finnhub_limiter.call(finnhub_client.stock_insider_transactions, symbol=symbol, from_=f, to=t)
 
 
 def on_message(ws, message):
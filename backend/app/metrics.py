@@ -0,0 +1,49 @@
+# app/metrics.py
+from datetime import date, timedelta
+
+from app import db
+from app.finnhub_client import get_financials
+from app.models import Stock, StockMetric
+from app.utils import extract_key_metrics
+
+
+def latest_metric(stock_id):
+    """
+    Returns the most recent StockMetric row for a stock, or None.
+    """
+    return StockMetric.query.filter(
+        StockMetric.stock_id == stock_id
+    ).order_by(
+        StockMetric.as_of_date.desc(),
+        StockMetric.id.desc()
+    ).first()
+
+
+def is_stale(metric, max_age_days):
+    return metric.as_of_date < date.today() - timedelta(days=max_age_days)
+
+
+def store_metrics(stock_id, metrics_payload):
+    """
+    Adds a StockMetric row built from extract_key_metrics output and commits.
+    """
+    metric_entry = StockMetric(stock_id=stock_id, **metrics_payload)
+    db.session.add(metric_entry)
+    db.session.commit()
+    return metric_entry
+
+
+def refresh_metrics(symbol):
+    """
+    Fetches a symbol's financials from Finnhub and stores a new StockMetric row.
+    Returns the stored row, or None if Finnhub or the Stock table has no data.
+    """
+    stock = Stock.query.filter_by(symbol=symbol).first()
+    if not stock:
+        return None
+
+    raw = get_financials(symbol)
+    if not raw or "metric" not in raw:
+        return None
+
+    return store_metrics(stock.id, extract_key_metrics(raw))
@@ -1,9 +1,12 @@
 # SmartTick/backend/app/models.py
+from datetime import date
+
 from sqlalchemy import Date, func # Added Date, func
 from sqlalchemy.sql import func
 
 # --- Import db from the package level (app) where it's initialized ---
 from app import db
+from app.utils import METRIC_MAP, PROFILE_MAP, trade_hash
 
 
 # Stock Profile
@@ -28,6 +31,7 @@ class Stock(db.Model):
     # ──────────────────────────────────────────────────────────────
 
     created_at            = db.Column(db.DateTime, server_default=func.now())
+    updated_at            = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now())
 
     metrics = db.relationship('StockMetric', back_populates='stock', cascade='all, delete-orphan')
 
@@ -48,9 +52,20 @@ class Stock(db.Model):
             'phone':                 self.phone,
             'shares_outstanding':    self.shares_outstanding,
             'weburl':                self.weburl,
-            'created_at':            self.created_at.isoformat() if self.created_at else None
+            'created_at':            self.created_at.isoformat() if self.created_at else None,
+            'updated_at':            self.updated_at.isoformat() if self.updated_at else None
         }
 
+    def to_profile_dict(self):
+        """
+        Serializes the profile with Finnhub's company_profile2 keys.
+        """
+        profile = {}
+        for api_key, attr_name in PROFILE_MAP.items():
+            value = getattr(self, attr_name)
+            profile[api_key] = value.isoformat() if isinstance(value, date) else value
+        return profile
+
 # Stock Financial Information
 class StockMetric(db.Model):
     __tablename__ = 'stock_metric'
@@ -119,29 +134,64 @@ class StockMetric(db.Model):
             'created_at': self.created_at.isoformat()
         }
 
+    def to_metrics_dict(self):
+        """
+        Serializes the stored metrics with the same keys extract_key_metrics returns.
+        """
+        metrics = {}
+        for attr_name in METRIC_MAP.values():
+            value = getattr(self, attr_name)
+            metrics[attr_name] = value.isoformat() if isinstance(value, date) else value
+        return metrics
+
 # Define the Trade model
 class Trade(db.Model):
     # __tablename__ = 'trade' # Optional: explicitly name table
+    __table_args__ = (
+        db.Index('ix_trade_base_ticker_traded_id', 'base_ticker', 'traded', 'id'),
+        db.Index('ix_trade_politician_id_traded', 'politician_id', db.text('traded DESC')),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
+    politician_id = db.Column(db.Integer, db.ForeignKey('politician.id')) # Resolved from politician_name at import time
+    # Copies of the politician as scraped: politician_name is part of the
+    # trade_hash natural key and is what imports resolve politician_id from,
+    # and both are served with every trade without joining politician
     politician_name = db.Column(db.String(128), nullable=False)
     politician_family = db.Column(db.String(128))
     politician_link = db.Column(db.String(256))
 
     traded_issuer_name = db.Column(db.String(256), nullable=False)
     traded_issuer_ticker = db.Column(db.String(32)) # Ticker symbol (e.g., AAPL, MSFT:US)
+    base_ticker = db.Column(db.String(32)) # Normalized ticker without exchange suffix (e.g., MSFT)
+    stock_id = db.Column(db.Integer, db.ForeignKey('stock.id'), index=True) # Stock matching base_ticker, if imported
     traded_issuer_link = db.Column(db.String(256))
 
     published = db.Column(db.String(64)) # Publication date string
     traded = db.Column(db.Date, nullable=True) # Use Date type for the trade date
     filed_after = db.Column(db.String(32))
+    filed_after_days = db.Column(db.Integer) # Days between trade and filing, parsed from filed_after
 
     owner = db.Column(db.String(64))
     type = db.Column(db.String(16)) # 'buy' or 'sell'
     size = db.Column(db.String(64)) # Trade size range (e.g., '1K–15K')
+    size_low = db.Column(db.Float) # Numeric bounds parsed from size at import time
+    size_high = db.Column(db.Float) # None for open-ended sizes (e.g., '> 50M')
+    size_mid = db.Column(db.Float) # Midpoint used for spending estimates
     price = db.Column(db.String(32)) # Price string (e.g., '$153.18', 'N/A')
+    price_value = db.Column(db.Float) # Price parsed at import time; None when 'N/A'
+    trade_hash = db.Column(
+        db.String(64),
+        nullable=False,
+        unique=True,
+        index=True,
+        default=lambda context: trade_hash(context.get_current_parameters())
+    ) # Natural-key digest (see app.utils.trade_hash) so re-imports skip known trades
     created_at = db.Column(db.DateTime, server_default=func.now())
 
+    stock = db.relationship('Stock', backref=db.backref('trades', lazy='dynamic'))
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -162,6 +212,10 @@ class Trade(db.Model):
         }
 
 class StockPrice(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('stock_id', 'date', name='uq_stock_price_stock_id_date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     stock_id = db.Column(db.Integer, db.ForeignKey('stock.id'), nullable=False)
     date = db.Column(db.Date, nullable=False)
@@ -204,18 +258,93 @@ class StockPrice(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+    def to_tiingo_dict(self):
+        """
+        Serializes the row in the shape Tiingo's daily prices endpoint returns.
+        """
+        return {
+            'date': f"{self.date.isoformat()}T00:00:00.000Z",
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+            'adjOpen': self.adj_open,
+            'adjHigh': self.adj_high,
+            'adjLow': self.adj_low,
+            'adjClose': self.adj_close,
+            'adjVolume': self.adj_volume
+        }
+
     def __repr__(self):
         return f"<StockPrice {self.date} Close={self.close}>"
 
-class PoliticianImg(db.Model):
-    id = db.Column(db.Integer, primary_key= True)
-    politician_name = db.Column(db.String(128), nullable = False)
-    politician_family = db.Column(db.String(128))
+class Politician(db.Model):
+    # One row per politician; trades reference it by politician_id
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(128), unique=True, nullable=False)
+    family = db.Column(db.String(128))
     img = db.Column(db.String(256))
 
     def to_dict(self):
         return {
-            "politician_name" : self.politician_name,
-            "politician_family" : self.politician_family,
+            "politician_name" : self.name,
+            "politician_family" : self.family,
             "img" : self.img
-        }
\ No newline at end of file
+        }
+
+class TradeMonthlyRollup(db.Model):
+    __tablename__ = 'trade_monthly_rollup'
+    # Maintained by app.rollups.refresh_monthly_rollup whenever trades are imported
+    ticker = db.Column(db.String(32), primary_key=True) # Trade.base_ticker
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+
+    buy_total = db.Column(db.Float, nullable=False, default=0)
+    sell_total = db.Column(db.Float, nullable=False, default=0)
+    buy_count = db.Column(db.Integer, nullable=False, default=0)
+    sell_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "year": self.year,
+            "month": self.month,
+            "month_label": f"{self.year}-{self.month:02d}",
+            "buy_total": self.buy_total,
+            "sell_total": self.sell_total,
+            "buy_count": self.buy_count,
+            "sell_count": self.sell_count
+        }
+
+
+class PoliticianLeaderboard(db.Model):
+    __tablename__ = 'politician_leaderboard'
+    # Maintained by app.rollups.refresh_politician_leaderboard whenever trades are imported
+    __table_args__ = (
+        db.Index('ix_politician_leaderboard_trade_count', 'trade_count'),
+    )
+
+    politician_id = db.Column(db.Integer, db.ForeignKey('politician.id'), primary_key=True)
+
+    trade_count = db.Column(db.Integer, nullable=False, default=0)
+    buy_count = db.Column(db.Integer, nullable=False, default=0)
+    sell_count = db.Column(db.Integer, nullable=False, default=0)
+    stock_count = db.Column(db.Integer, nullable=False, default=0)
+    latest_trade = db.Column(db.Date)
+    estimated_spending = db.Column(db.Float, nullable=False, default=0)
+
+    politician = db.relationship('Politician')
+
+    def to_dict(self):
+        buy_percentage = (self.buy_count / self.trade_count * 100) if self.trade_count > 0 else 0
+        return {
+            'name': self.politician.name,
+            'party': self.politician.family or 'Unknown',
+            'total_trades': self.trade_count,
+            'buy_trades': self.buy_count,
+            'sell_trades': self.sell_count,
+            'buy_percentage': round(buy_percentage, 1),
+            'estimated_spending': self.estimated_spending,
+            'different_stocks': self.stock_count,
+            'last_trade_date': self.latest_trade.isoformat() if self.latest_trade else None
+        }
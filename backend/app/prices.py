@@ -0,0 +1,169 @@
+# app/prices.py
+from datetime import datetime, time, timedelta
+
+from flask import current_app
+from sqlalchemy.dialects.postgresql import insert
+
+from app import db
+from app.cache import TTLCache
+from app.finnhub_client import MARKET_TZ
+from app.models import Stock, StockPrice
+from app.tiingo_client import get_daily_prices
+from app.utils import PRICE_MAP, price_row_from_tiingo
+
+# Tiingo publishes end-of-day prices some time after the close
+EOD_PUBLISH_TIME = time(18, 0)
+
+# NYSE holidays close the market for one weekday at a time, so a longer
+# gap between stored prices is data that was never fetched
+MAX_HOLIDAY_WEEKDAYS = 1
+
+# Spans recently requested from Tiingo, remembered so dates it had no rows
+# for (holidays, halted symbols) are not re-requested on every chart render
+fetched_range_cache = TTLCache("tiingo_fetched_ranges", 4096, 60 * 60)
+
+
+def last_published_day(now=None):
+    """
+    The most recent day whose end-of-day prices should be available.
+    """
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    if now.time() >= EOD_PUBLISH_TIME:
+        return now.date()
+    return now.date() - timedelta(days=1)
+
+
+def _weekdays(start, end):
+    """
+    Counts the weekdays from `start` to `end`, inclusive.
+    """
+    count = 0
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+
+def missing_ranges(start, end, stored_dates):
+    """
+    Returns the (start, end) date ranges between `start` and `end` that still
+    need fetching, given the sorted dates already stored. Ranges before the
+    first stored date and between two stored dates are missing if they hold
+    more than MAX_HOLIDAY_WEEKDAYS weekdays; shorter ones are market
+    holidays. The range after the last stored date is missing if it holds
+    any weekday, so a newly published close is fetched.
+    """
+    if not stored_dates:
+        candidates = [(start, end, 0)]
+    else:
+        candidates = [(start, stored_dates[0] - timedelta(days=1), MAX_HOLIDAY_WEEKDAYS)]
+        candidates += [
+            (prev + timedelta(days=1), day - timedelta(days=1), MAX_HOLIDAY_WEEKDAYS)
+            for prev, day in zip(stored_dates, stored_dates[1:])
+        ]
+        candidates.append((stored_dates[-1] + timedelta(days=1), end, 0))
+    return [
+        (a, b) for a, b, allowed in candidates
+        if a <= b and _weekdays(a, b) > allowed
+    ]
+
+
+def upsert_prices(stock_id, price_rows):
+    """
+    Inserts price rows for a stock, overwriting any row already stored
+    for the same date. Runs in the caller's transaction.
+    """
+    if not price_rows:
+        return
+
+    stmt = insert(StockPrice).values([
+        {**row, 'stock_id': stock_id} for row in price_rows
+    ])
+    stmt = stmt.on_conflict_do_update(
+        constraint='uq_stock_price_stock_id_date',
+        set_={attr: stmt.excluded[attr] for attr in PRICE_MAP.values()}
+    )
+    db.session.execute(stmt)
+
+
+def _load_prices(stock_id, start, end):
+    return StockPrice.query.filter(
+        StockPrice.stock_id == stock_id,
+        StockPrice.date.between(start, end)
+    ).order_by(StockPrice.date).all()
+
+
+def _price_gaps(stock, start, end, prices):
+    # No prices exist before the IPO or after the last published close
+    fetch_start = max(start, stock.ipo) if stock.ipo else start
+    fetch_end = min(end, last_published_day())
+    return missing_ranges(fetch_start, fetch_end, [price.date for price in prices])
+
+
+def fill_price_gaps(symbol, start, end):
+    """
+    Fetches the prices missing between `start` and `end` for a stored stock
+    from Tiingo, in one call spanning every gap, and commits them.
+    Returns True if any rows were stored. Tiingo errors propagate.
+    """
+    stock = Stock.query.filter_by(symbol=symbol).first()
+    if not stock:
+        return False
+
+    gaps = _price_gaps(stock, start, end, _load_prices(stock.id, start, end))
+    if not gaps:
+        return False
+
+    # Daily rows are small and the hourly quota is not, so stored dates
+    # inside the span are refetched rather than spending a call per gap
+    span_start, span_end = gaps[0][0], gaps[-1][1]
+    key = (symbol, span_start, span_end)
+    if fetched_range_cache.get(key)[0]:
+        return False
+
+    rows = get_daily_prices(symbol, span_start.isoformat(), span_end.isoformat())
+    # Remembered even when rows came back: a span that stays short (a
+    # holiday at its edge) would otherwise be refetched on every refresh
+    fetched_range_cache.set(key, True)
+    if not rows:
+        return False
+
+    upsert_prices(stock.id, [price_row_from_tiingo(row) for row in rows])
+    db.session.commit()
+    return True
+
+
+def get_stored_prices(symbol, start, end, refresher=None):
+    """
+    Returns daily prices for `symbol` between the `start` and `end` dates,
+    in Tiingo's response shape, served from stock_price. When dates are
+    missing, stored prices are returned at once and the gaps are filled on
+    `refresher` for the next request; Tiingo is called inline only when
+    nothing is stored (or no refresher is given). If that call fails,
+    whatever is stored is returned.
+    """
+    stock = Stock.query.filter_by(symbol=symbol).first()
+    if not stock:
+        # Nothing to store against outside our stock universe
+        return get_daily_prices(symbol, start.isoformat(), end.isoformat())
+
+    prices = _load_prices(stock.id, start, end)
+    if not _price_gaps(stock, start, end, prices):
+        return [price.to_tiingo_dict() for price in prices]
+
+    if prices and refresher is not None:
+        refresher.submit(('prices', symbol, start, end), fill_price_gaps, symbol, start, end)
+        return [price.to_tiingo_dict() for price in prices]
+
+    try:
+        if fill_price_gaps(symbol, start, end):
+            prices = _load_prices(stock.id, start, end)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.warning(f"Tiingo fetch for {symbol} {start}..{end} failed: {e}")
+        if not prices:
+            raise
+
+    return [price.to_tiingo_dict() for price in prices]
@@ -0,0 +1,45 @@
+# app/profiles.py
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+
+from app import db
+from app.finnhub_client import get_profile
+from app.models import Stock
+from app.utils import PROFILE_MAP
+
+
+def profile_is_stale(stock, max_age_days):
+    updated_at = stock.updated_at or stock.created_at
+    return updated_at is None or updated_at < datetime.now() - timedelta(days=max_age_days)
+
+
+def store_profile(profile_data):
+    """
+    Writes a Finnhub company_profile2 payload into the Stock table,
+    updating the existing row for the ticker or adding a new one. Commits.
+    """
+    fields = {attr_name: profile_data.get(api_key) for api_key, attr_name in PROFILE_MAP.items()}
+    fields['ipo'] = date.fromisoformat(fields['ipo']) if fields['ipo'] else None
+
+    stock = Stock.query.filter_by(symbol=fields['symbol']).first()
+    if stock is None:
+        stock = Stock()
+        db.session.add(stock)
+    for attr_name, value in fields.items():
+        setattr(stock, attr_name, value)
+    stock.updated_at = func.now()
+
+    db.session.commit()
+    return stock
+
+
+def refresh_profile(symbol):
+    """
+    Fetches a symbol's profile from Finnhub and stores it.
+    Returns the Stock row, or None if Finnhub has no profile.
+    """
+    profile_data = get_profile(symbol)
+    if not profile_data or not profile_data.get('name'):
+        return None
+    return store_profile(profile_data)
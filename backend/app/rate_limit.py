@@ -0,0 +1,263 @@
+# app/rate_limit.py
+import os
+import json
+import time
+import uuid
+import fcntl
+import random
+import tempfile
+import contextvars
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+# Priority classes: interactive (web requests) may drain the bucket,
+# batch (import scripts) must leave the reserve for interactive callers
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+
+_default_priority = INTERACTIVE
+_priority = contextvars.ContextVar('rate_limit_priority', default=None)
+
+# Directory holding the shared bucket state files
+STATE_DIR = os.getenv('RATE_LIMIT_DIR', tempfile.gettempdir())
+
+MAX_RETRIES = 5
+MAX_BACKOFF = 60
+
+# Longest an interactive caller waits for a token (including 429 pauses)
+# before giving up, so a web request never sits behind a slow quota
+INTERACTIVE_MAX_WAIT = float(os.getenv('RATE_LIMIT_INTERACTIVE_MAX_WAIT', 5))
+
+# How long past its expected wake-up a waiting interactive caller keeps
+# batch callers off the bucket
+WAITER_GRACE = 1.0
+
+# Every bucket created in this process, by name, for the stats endpoint
+_buckets = {}
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when an interactive caller would wait longer than the bucket's
+    max_wait for a token. `retry_after` is the estimated wait in seconds.
+    """
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name} rate limit exceeded; retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def set_default_priority(priority):
+    """
+    Sets the priority for every call made by this process (e.g. BATCH in import scripts).
+    """
+    global _default_priority
+    _default_priority = priority
+
+
+@contextmanager
+def priority(value):
+    """
+    Overrides the priority for calls made inside the block.
+    """
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    return _priority.get() or _default_priority
+
+
+def _rate_limited_response(error):
+    """
+    Returns the HTTP response behind a 429 raised by the Finnhub or Tiingo
+    clients, or None for any other error.
+    """
+    response = getattr(error, 'response', None)
+    if response is None and error.args:
+        # Tiingo wraps the requests HTTPError in a RestClientError
+        response = getattr(error.args[0], 'response', None)
+    if response is not None and getattr(response, 'status_code', None) == 429:
+        return response
+    return None
+
+
+def _retry_after_seconds(response):
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket whose state lives in a lock-protected file, so every
+    process on the host (web workers and import scripts) shares one quota.
+    `rate` is tokens per second; `reserve` tokens are kept for interactive
+    callers, and batch callers also wait while an interactive caller is
+    queued. Interactive callers wait at most `max_wait` seconds.
+    """
+
+    def __init__(self, name, rate, capacity, reserve=0, max_wait=INTERACTIVE_MAX_WAIT,
+                 state_dir=STATE_DIR, clock=time.time, sleep=time.sleep):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.path = os.path.join(state_dir, f"smarttick-ratelimit-{name}.json")
+        self.clock = clock
+        self.sleep = sleep
+
+        self.acquired = 0
+        self.waited = 0.0
+        self.rate_limited = 0
+        self.rejected = 0
+
+        _buckets[name] = self
+
+    def _load(self, raw, now):
+        """
+        Parses the state file, starting over with a full bucket when it is
+        empty or unreadable (e.g. truncated by a crash mid-write).
+        """
+        try:
+            state = json.loads(raw)
+            state = {
+                'tokens': float(state['tokens']),
+                'updated': float(state['updated']),
+                'blocked_until': float(state['blocked_until']),
+                'waiters': {
+                    str(key): float(value) for key, value in state.get('waiters', {}).items()
+                }
+            }
+        except (ValueError, TypeError, KeyError, AttributeError):
+            state = {'tokens': self.capacity, 'updated': now, 'blocked_until': 0, 'waiters': {}}
+        return state
+
+    @contextmanager
+    def _state(self):
+        with open(self.path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                now = self.clock()
+                state = self._load(f.read(), now)
+                elapsed = max(0.0, now - state['updated'])
+                state['tokens'] = min(self.capacity, state['tokens'] + elapsed * self.rate)
+                state['updated'] = now
+                # drop waiters whose caller gave up or died
+                state['waiters'] = {
+                    key: expires for key, expires in state['waiters'].items() if expires > now
+                }
+
+                yield state
+
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def acquire(self, priority_class=None, deadline=None):
+        """
+        Blocks until a token is available for the given priority class, then
+        takes it. Interactive callers raise RateLimitExceeded instead of
+        waiting past `deadline` (by default max_wait seconds from now).
+        """
+        priority_class = priority_class or current_priority()
+        interactive = priority_class == INTERACTIVE
+        floor = 0 if interactive else self.reserve
+        if interactive and deadline is None and self.max_wait is not None:
+            deadline = self.clock() + self.max_wait
+        waiter = uuid.uuid4().hex if interactive else None
+
+        try:
+            while True:
+                with self._state() as state:
+                    now = state['updated']
+                    if now < state['blocked_until']:
+                        wait = state['blocked_until'] - now
+                    elif not interactive and state['waiters']:
+                        # queued interactive callers go first
+                        wait = min(state['waiters'].values()) - now
+                    elif state['tokens'] >= floor + 1:
+                        state['tokens'] -= 1
+                        state['waiters'].pop(waiter, None)
+                        self.acquired += 1
+                        return
+                    else:
+                        wait = (floor + 1 - state['tokens']) / self.rate
+
+                    if interactive:
+                        if deadline is not None and now + wait > deadline:
+                            self.rejected += 1
+                            raise RateLimitExceeded(self.name, wait)
+                        state['waiters'][waiter] = now + wait + WAITER_GRACE
+                self.waited += wait
+                self.sleep(wait)
+        except BaseException:
+            if waiter is not None:
+                with self._state() as state:
+                    state['waiters'].pop(waiter, None)
+            raise
+
+    def block_for(self, seconds):
+        """
+        Pauses every caller sharing this bucket for `seconds` (e.g. after a 429).
+        """
+        with self._state() as state:
+            state['blocked_until'] = max(state['blocked_until'], state['updated'] + seconds)
+            state['tokens'] = 0
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Calls fn through the bucket. A 429 pauses the shared bucket for the
+        server's Retry-After (or an exponential backoff) and retries.
+        Interactive callers share one max_wait budget across every retry and
+        get RateLimitExceeded once it runs out.
+        """
+        deadline = None
+        if current_priority() == INTERACTIVE and self.max_wait is not None:
+            deadline = self.clock() + self.max_wait
+
+        for attempt in range(MAX_RETRIES + 1):
+            self.acquire(deadline=deadline)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                response = _rate_limited_response(e)
+                if response is None or attempt == MAX_RETRIES:
+                    raise
+                self.rate_limited += 1
+                delay = _retry_after_seconds(response)
+                if delay is None:
+                    delay = min(MAX_BACKOFF, 2 ** attempt) + random.uniform(0, 1)
+                self.block_for(delay)
+
+    def stats(self):
+        return {
+            'acquired': self.acquired,
+            'waited_seconds': round(self.waited, 3),
+            'rate_limited': self.rate_limited,
+            'rejected': self.rejected
+        }
+
+
+def rate_limit_stats():
+    """
+    Returns this process's counters for every bucket.
+    """
+    return {name: bucket.stats() for name, bucket in _buckets.items()}
@@ -0,0 +1,86 @@
+# app/rollups.py
+from sqlalchemy import Integer, case, cast, delete, func, insert, select
+
+from app import db
+from app.models import Trade, TradeMonthlyRollup, PoliticianLeaderboard
+
+
+def refresh_monthly_rollup(tickers=None):
+    """
+    Recomputes trade_monthly_rollup rows for the given base tickers from
+    the trade table, or every row when tickers is None.
+    Runs in the caller's transaction; the caller commits.
+    """
+    year = cast(func.extract('year', Trade.traded), Integer)
+    month = cast(func.extract('month', Trade.traded), Integer)
+    trade_type = func.lower(Trade.type)
+    size = func.coalesce(Trade.size_mid, 0)
+
+    summary = select(
+        Trade.base_ticker,
+        year,
+        month,
+        func.sum(case((trade_type == 'buy', size), else_=0)),
+        func.sum(case((trade_type == 'sell', size), else_=0)),
+        func.sum(case((trade_type == 'buy', 1), else_=0)),
+        func.sum(case((trade_type == 'sell', 1), else_=0))
+    ).where(
+        Trade.base_ticker.isnot(None),
+        Trade.traded.isnot(None)
+    ).group_by(
+        Trade.base_ticker, year, month
+    )
+    clear = delete(TradeMonthlyRollup)
+
+    if tickers is not None:
+        tickers = sorted({ticker for ticker in tickers if ticker})
+        if not tickers:
+            return
+        summary = summary.where(Trade.base_ticker.in_(tickers))
+        clear = clear.where(TradeMonthlyRollup.ticker.in_(tickers))
+
+    db.session.execute(clear)
+    db.session.execute(
+        insert(TradeMonthlyRollup).from_select(
+            ['ticker', 'year', 'month', 'buy_total', 'sell_total', 'buy_count', 'sell_count'],
+            summary
+        )
+    )
+
+
+def refresh_politician_leaderboard(politician_ids=None):
+    """
+    Recomputes politician_leaderboard rows for the given politician ids from
+    the trade table, or every row when politician_ids is None.
+    Runs in the caller's transaction; the caller commits.
+    """
+    summary = select(
+        Trade.politician_id,
+        func.count(Trade.id),
+        func.sum(case((Trade.type == 'buy', 1), else_=0)),
+        func.sum(case((Trade.type == 'sell', 1), else_=0)),
+        func.count(func.distinct(Trade.traded_issuer_ticker)),
+        func.max(Trade.traded),
+        func.coalesce(func.sum(Trade.size_mid), 0)
+    ).where(
+        Trade.politician_id.isnot(None)
+    ).group_by(
+        Trade.politician_id
+    )
+    clear = delete(PoliticianLeaderboard)
+
+    if politician_ids is not None:
+        politician_ids = sorted({politician_id for politician_id in politician_ids if politician_id})
+        if not politician_ids:
+            return
+        summary = summary.where(Trade.politician_id.in_(politician_ids))
+        clear = clear.where(PoliticianLeaderboard.politician_id.in_(politician_ids))
+
+    db.session.execute(clear)
+    db.session.execute(
+        insert(PoliticianLeaderboard).from_select(
+            ['politician_id', 'trade_count', 'buy_count', 'sell_count',
+             'stock_count', 'latest_trade', 'estimated_spending'],
+            summary
+        )
+    )
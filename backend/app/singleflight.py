@@ -0,0 +1,87 @@
+# app/singleflight.py
+import functools
+import threading
+
+# Every single-flight group created in this process, by name, for the stats endpoint
+_groups = {}
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller runs the
+    function and every caller that arrives while it is in flight waits for
+    it and shares its result, or its exception.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+        _groups[name] = self
+
+    def do(self, key, fn, *args):
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._in_flight[key] = call
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._in_flight)
+            }
+
+
+def single_flight(group):
+    """
+    Decorator that routes calls through `group`, keyed by positional arguments.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            return group.do(args, fn, *args)
+
+        wrapper.group = group
+        return wrapper
+    return decorator
+
+
+def single_flight_stats():
+    """
+    Returns the call/coalesced counters of every group in this process.
+    """
+    return {name: group.stats() for name, group in _groups.items()}
@@ -0,0 +1,72 @@
+# app/streaming.py
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Rows serialized per chunk written to the response
+STREAM_CHUNK_SIZE = 500
+
+# Rows fetched per round trip from the server-side cursor
+STREAM_YIELD_PER = 1000
+
+
+def wants_ndjson():
+    """
+    True when the client prefers newline-delimited JSON over a JSON array.
+    """
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def wants_stream():
+    """
+    Streaming is requested with '?stream=true' or an NDJSON Accept header.
+    """
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes') or wants_ndjson()
+
+
+def _json_array_chunks(rows, serialize):
+    dumps = current_app.json.dumps
+    yield '['
+    first = True
+    chunk = []
+    for row in rows:
+        chunk.append(dumps(serialize(row)))
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield ('' if first else ',') + ','.join(chunk)
+            first = False
+            chunk = []
+    if chunk:
+        yield ('' if first else ',') + ','.join(chunk)
+    yield ']'
+
+
+def _ndjson_chunks(rows, serialize):
+    dumps = current_app.json.dumps
+    chunk = []
+    for row in rows:
+        chunk.append(dumps(serialize(row)) + '\n')
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def stream_query(query, serialize):
+    """
+    Streams the rows of an ORM query as a JSON array (or NDJSON when the
+    client asks for it). Rows are read through a server-side cursor and
+    serialized chunk by chunk, so memory stays flat whatever the row count.
+    """
+    rows = query.yield_per(STREAM_YIELD_PER)
+
+    if wants_ndjson():
+        return Response(
+            stream_with_context(_ndjson_chunks(rows, serialize)),
+            mimetype=NDJSON_MIMETYPE
+        )
+    return Response(
+        stream_with_context(_json_array_chunks(rows, serialize)),
+        mimetype='application/json'
+    )
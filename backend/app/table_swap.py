@@ -0,0 +1,129 @@
+# app/table_swap.py
+import re
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import db
+
+# How long the swap waits for readers to let go of the live table per attempt
+SWAP_LOCK_TIMEOUT = '5s'
+SWAP_ATTEMPTS = 5
+
+_INDEX_DEF = re.compile(r'^(CREATE (?:UNIQUE )?INDEX) (\S+) ON (?:ONLY )?(\S+) (.*)$')
+
+
+def _shadow_name(name):
+    return f"{name}_shadow"
+
+
+def _index_definitions(table):
+    """
+    (name, CREATE INDEX statement) for indexes on `table` that do not back a constraint.
+    """
+    return db.session.execute(text(
+        """
+        SELECT c.relname, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = CAST(:table AS regclass)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint k WHERE k.conindid = i.indexrelid)
+        """
+    ), {'table': table}).all()
+
+
+def _constraint_definitions(table):
+    """
+    (name, definition) for primary key, unique and foreign key constraints on `table`.
+    """
+    return db.session.execute(text(
+        """
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = CAST(:table AS regclass) AND contype IN ('p', 'u', 'f')
+        ORDER BY contype DESC
+        """
+    ), {'table': table}).all()
+
+
+def _owned_sequences(table):
+    """
+    (column, sequence) for serial columns of `table`.
+    """
+    return db.session.execute(text(
+        """
+        SELECT a.attname, pg_get_serial_sequence(:table, a.attname)
+        FROM pg_attribute a
+        WHERE a.attrelid = CAST(:table AS regclass) AND a.attnum > 0 AND NOT a.attisdropped
+          AND pg_get_serial_sequence(:table, a.attname) IS NOT NULL
+        """
+    ), {'table': table}).all()
+
+
+def build_shadow_table(table, fill):
+    """
+    Creates `<table>_shadow` shaped like `table`, calls fill(shadow_name) to
+    load it, then builds the live table's indexes and constraints on it and
+    commits. The live table is only read while this runs.
+    """
+    shadow = _shadow_name(table)
+    db.session.execute(text(f"DROP TABLE IF EXISTS {shadow}"))
+    db.session.execute(text(
+        f"CREATE TABLE {shadow} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+
+    fill(shadow)
+
+    # Indexes are built after the load, which is much faster than maintaining them row by row
+    for name, definition in _constraint_definitions(table):
+        db.session.execute(text(
+            f"ALTER TABLE {shadow} ADD CONSTRAINT {_shadow_name(name)} {definition}"
+        ))
+    for name, definition in _index_definitions(table):
+        create, _, _, rest = _INDEX_DEF.match(definition).groups()
+        db.session.execute(text(f"{create} {_shadow_name(name)} ON {shadow} {rest}"))
+
+    db.session.execute(text(f"ANALYZE {shadow}"))
+    db.session.commit()
+
+
+def swap_in_shadow_table(table, after_swap=None):
+    """
+    Atomically replaces `table` with `<table>_shadow` in one short transaction:
+    readers see either the old rows or the new ones, never a partial table.
+    after_swap() runs inside the same transaction (e.g. to rebuild rollups).
+    Retries when readers hold the table longer than SWAP_LOCK_TIMEOUT.
+    """
+    shadow = _shadow_name(table)
+    for attempt in range(1, SWAP_ATTEMPTS + 1):
+        try:
+            constraints = [name for name, _ in _constraint_definitions(table)]
+            indexes = [name for name, _ in _index_definitions(table)]
+
+            db.session.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+            db.session.execute(text(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE"))
+
+            # Serial sequences belong to the old table and would be dropped with it
+            for column, sequence in _owned_sequences(table):
+                db.session.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {shadow}.{column}"))
+
+            db.session.execute(text(f"DROP TABLE {table}"))
+            db.session.execute(text(f"ALTER TABLE {shadow} RENAME TO {table}"))
+            for name in constraints:
+                db.session.execute(text(
+                    f"ALTER TABLE {table} RENAME CONSTRAINT {_shadow_name(name)} TO {name}"
+                ))
+            for name in indexes:
+                db.session.execute(text(f"ALTER INDEX {_shadow_name(name)} RENAME TO {name}"))
+
+            if after_swap:
+                after_swap()
+
+            db.session.commit()
+            return
+        except OperationalError:
+            db.session.rollback()
+            if attempt == SWAP_ATTEMPTS:
+                raise
+            time.sleep(attempt)
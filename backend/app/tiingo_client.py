@@ -1,11 +1,30 @@
+import os
+
 from tiingo import TiingoClient
 
+from .singleflight import SingleFlight, single_flight
+from .rate_limit import TokenBucket
+
 # make sure to set your Tiingo API key in .env
 client = TiingoClient()
 
+# Free tier quota: 50 requests/hour, shared by every process on the host
+TIINGO_RATE_PER_HOUR = int(os.getenv("TIINGO_RATE_PER_HOUR", 50))
+tiingo_limiter = TokenBucket(
+    "tiingo",
+    rate=TIINGO_RATE_PER_HOUR / 3600,
+    capacity=int(os.getenv("TIINGO_RATE_BURST", 10)),
+    reserve=int(os.getenv("TIINGO_RATE_RESERVE", 2))
+)
+
+# Concurrent requests for the same symbol and range share one upstream call
+daily_prices_flight = SingleFlight("tiingo_daily_prices")
+
 # date format: YYYY-MM-DD
+@single_flight(daily_prices_flight)
 def get_daily_prices(symbol, start, end):
-    return client.get_ticker_price(
+    return tiingo_limiter.call(
+        client.get_ticker_price,
         symbol,
         fmt='json',
         startDate=start,
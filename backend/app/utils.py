@@ -1,4 +1,9 @@
 # app/utils.py
+import re
+import base64
+import hashlib
+from datetime import date, datetime
+
 
 # Map Finnhub metric keys to StockMetric model column names
 METRIC_MAP = {
@@ -37,3 +42,195 @@ def extract_key_metrics(finnhub_response: dict) -> dict:
         filtered[attr_name] = metric.get(api_key)
 
     return filtered
+
+
+# Map Finnhub company_profile2 keys to Stock model column names
+PROFILE_MAP = {
+    'ticker':               'symbol',
+    'name':                 'name',
+    'exchange':             'exchange',
+    'finnhubIndustry':      'industry',
+    'currency':             'currency',
+    'country':              'country',
+    'estimateCurrency':     'estimate_currency',
+    'ipo':                  'ipo',
+    'logo':                 'logo',
+    'marketCapitalization': 'market_capitalization',
+    'phone':                'phone',
+    'shareOutstanding':     'shares_outstanding',
+    'weburl':               'weburl',
+}
+
+
+# Map Tiingo daily price keys to StockPrice model column names
+PRICE_MAP = {
+    "open":      "open",
+    "high":      "high",
+    "low":       "low",
+    "close":     "close",
+    "volume":    "volume",
+    "adjOpen":   "adj_open",
+    "adjHigh":   "adj_high",
+    "adjLow":    "adj_low",
+    "adjClose":  "adj_close",
+    "adjVolume": "adj_volume",
+}
+
+
+def price_row_from_tiingo(tiingo_row: dict) -> dict:
+    """
+    Converts one Tiingo daily price row into a flat dict whose keys
+    match StockPrice attributes (without stock_id).
+    """
+    # parse ISO timestamp like '2024-06-05T00:00:00.000Z'
+    row = {"date": datetime.fromisoformat(tiingo_row["date"].replace("Z", "")).date()}
+    for api_key, attr_name in PRICE_MAP.items():
+        row[attr_name] = tiingo_row.get(api_key)
+    return row
+
+
+def _parse_multiplier(value, multiplier):
+    """Helper to apply K/M multiplier."""
+    if multiplier and multiplier.lower() == 'k':
+        return value * 1000
+    elif multiplier and multiplier.lower() == 'm':
+        return value * 1000000
+    return value
+
+
+def size_to_bounds(size_str):
+    """
+    Converts a trade size string (e.g., '1K–15K', '< 1K', '> 50M')
+    into a (low, high, mid) tuple of numeric values.
+    Open-ended sizes have a high of None and unparseable sizes
+    return (None, None, None).
+    """
+    if not size_str or size_str.lower() == 'n/a':
+        return None, None, None
+
+    size_str = size_str.replace(',', '').strip()
+
+    # Handle '<' and '>' cases
+    match = re.match(r'([<>])\s*(\d+)([KkMm]?)', size_str)
+    if match:
+        operator, value, multiplier = match.groups()
+        value = _parse_multiplier(float(value), multiplier)
+        if operator == '<':
+            return 0.0, value, value / 2
+        return value, None, value
+
+    # Handle ranges (e.g., '1K–15K', '5M-25M')
+    match = re.match(r'(\d+(?:[.,]\d+)?)\s?([KkMm]?)\s?[-–]\s?(\d+(?:[.,]\d+)?)\s?([KkMm]?)', size_str)
+    if match:
+        val1, mult1, val2, mult2 = match.groups()
+        low = _parse_multiplier(float(val1), mult1)
+        high = _parse_multiplier(float(val2), mult2)
+        return low, high, (low + high) / 2
+
+    # Handle single values (e.g., '100K')
+    match = re.match(r'^(\d+(?:[.,]\d+)?)\s?([KkMm]?)$', size_str)
+    if match:
+        value, multiplier = match.groups()
+        value = _parse_multiplier(float(value), multiplier)
+        return value, value, value
+
+    print(f"Could not parse size string: {size_str}")
+    return None, None, None
+
+
+def normalize_ticker(ticker):
+    """
+    Reduces a traded issuer ticker (e.g., 'AAPL:US', ' msft:us ') to its
+    upper-cased base symbol. Returns None for missing or 'N/A' tickers.
+    """
+    if not ticker:
+        return None
+
+    base = ticker.split(':', 1)[0].strip().upper()
+    if not base or base == 'N/A':
+        return None
+    return base
+
+
+# Base ticker spellings that differ from Finnhub's Stock.symbol: Capitol Trades
+# writes share classes with a slash ('BRK/B'), Finnhub with a dot ('BRK.B')
+TICKER_SYMBOL_MAP = {'/': '.'}
+
+
+def stock_symbol(base_ticker):
+    """
+    Maps a Trade.base_ticker to the Stock.symbol it refers to.
+    """
+    if not base_ticker:
+        return None
+
+    for old, new in TICKER_SYMBOL_MAP.items():
+        base_ticker = base_ticker.replace(old, new)
+    return base_ticker
+
+
+def stock_symbol_sql(column):
+    """
+    SQL expression applying stock_symbol to `column`, for joining trades to stocks.
+    """
+    for old, new in TICKER_SYMBOL_MAP.items():
+        column = f"replace({column}, '{old}', '{new}')"
+    return column
+
+
+def parse_trade_date(date_str):
+    """
+    Parses date strings like '3 Apr 2025' or '3 Sept 2024' into date objects.
+    Handles potential errors or different formats gracefully.
+    """
+    if not date_str:
+        return None
+
+    processed_date_str = date_str.replace('Sept', 'Sep')  # Normalize date format
+
+    try:
+        return datetime.strptime(processed_date_str, '%d %b %Y').date()
+    except ValueError:
+        print(f"Warning: Could not parse date string: {date_str} (processed as: {processed_date_str})")
+        return None
+
+
+# Trade fields that together identify one disclosed trade
+TRADE_KEY_FIELDS = ('politician_name', 'traded_issuer_name', 'traded', 'type', 'size', 'owner')
+
+
+def trade_hash(trade):
+    """
+    Deterministic SHA-256 hex digest of a trade's natural key, used to skip
+    trades that are already stored. `trade` is a dict with a parsed `traded` date.
+    The trade_hash migration computes the same digest in SQL; keep them in step.
+    """
+    parts = []
+    for field in TRADE_KEY_FIELDS:
+        value = trade.get(field)
+        if isinstance(value, date):
+            value = value.isoformat()
+        parts.append('' if value is None else str(value))
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def encode_cursor(traded, trade_id):
+    """
+    Encodes a (traded, id) keyset position into an opaque cursor string.
+    """
+    raw = f"{traded.isoformat() if traded else ''}|{trade_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor produced by encode_cursor back into (traded, id).
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        traded_str, trade_id = raw.split('|')
+        traded = date.fromisoformat(traded_str) if traded_str else None
+        return traded, int(trade_id)
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -0,0 +1,33 @@
+"""Stock price unique date
+
+Revision ID: 0f67f63d2941
+Revises: 79c9d8d32aae
+Create Date: 2026-10-16 15:48:23.410372
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0f67f63d2941'
+down_revision = '79c9d8d32aae'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Repeated imports may have stored the same day twice; keep the newest row
+    op.execute(
+        """
+        DELETE FROM stock_price a
+        USING stock_price b
+        WHERE a.stock_id = b.stock_id
+          AND a.date = b.date
+          AND a.id < b.id
+        """
+    )
+    op.create_unique_constraint('uq_stock_price_stock_id_date', 'stock_price', ['stock_id', 'date'])
+
+
+def downgrade():
+    op.drop_constraint('uq_stock_price_stock_id_date', 'stock_price', type_='unique')
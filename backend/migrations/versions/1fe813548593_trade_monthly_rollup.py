@@ -0,0 +1,51 @@
+"""Trade monthly rollup
+
+Revision ID: 1fe813548593
+Revises: 9ac1560d4e42
+Create Date: 2026-10-16 13:52:30.664087
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1fe813548593'
+down_revision = '9ac1560d4e42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('trade_monthly_rollup',
+    sa.Column('ticker', sa.String(length=32), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('buy_total', sa.Float(), nullable=False),
+    sa.Column('sell_total', sa.Float(), nullable=False),
+    sa.Column('buy_count', sa.Integer(), nullable=False),
+    sa.Column('sell_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('ticker', 'year', 'month')
+    )
+
+    # Backfill with the same aggregation as app.rollups.refresh_monthly_rollup
+    op.execute(
+        """
+        INSERT INTO trade_monthly_rollup
+            (ticker, year, month, buy_total, sell_total, buy_count, sell_count)
+        SELECT base_ticker,
+               EXTRACT(YEAR FROM traded)::int,
+               EXTRACT(MONTH FROM traded)::int,
+               SUM(CASE WHEN lower(type) = 'buy' THEN COALESCE(size_mid, 0) ELSE 0 END),
+               SUM(CASE WHEN lower(type) = 'sell' THEN COALESCE(size_mid, 0) ELSE 0 END),
+               SUM(CASE WHEN lower(type) = 'buy' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN lower(type) = 'sell' THEN 1 ELSE 0 END)
+        FROM trade
+        WHERE base_ticker IS NOT NULL AND traded IS NOT NULL
+        GROUP BY base_ticker, EXTRACT(YEAR FROM traded)::int, EXTRACT(MONTH FROM traded)::int
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('trade_monthly_rollup')
@@ -0,0 +1,67 @@
+"""Hot path indexes
+
+Revision ID: 49d69d38ce8e
+Revises: 89268dfacaf5
+Create Date: 2026-10-16 11:26:54.330871
+
+Requires the pg_trgm extension for the stock name index. The postgres Docker
+images ship it; other servers need the PostgreSQL contrib package installed,
+and the migrating role needs CREATE on the database (or a superuser can run
+CREATE EXTENSION pg_trgm beforehand).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '49d69d38ce8e'
+down_revision = '89268dfacaf5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    available = op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    )).scalar()
+    if not available:
+        raise RuntimeError(
+            "The pg_trgm extension is not available on this PostgreSQL server; "
+            "install the PostgreSQL contrib package and rerun the migration."
+        )
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # /api/politicians/<name>/* filter by name and sort by newest trade
+    op.create_index(
+        'ix_trade_politician_name_traded', 'trade',
+        ['politician_name', sa.text('traded DESC')], unique=False
+    )
+    # /api/trades sorts the whole table by newest trade
+    op.create_index('ix_trade_traded', 'trade', [sa.text('traded DESC')], unique=False)
+
+    # /api/pol/image matches lower(name) exactly and /api/autocomplete/politicians
+    # prefix-matches it; text_pattern_ops serves both
+    op.create_index(
+        'ix_politician_img_lower_name', 'politician_img',
+        [sa.text('lower(politician_name) text_pattern_ops')], unique=False
+    )
+
+    # /api/autocomplete/stocks: LIKE 'SYM%' on the upper-cased symbol and
+    # ILIKE 'name%' on the mixed-case company name
+    op.create_index(
+        'ix_stock_symbol_pattern', 'stock', ['symbol'], unique=False,
+        postgresql_ops={'symbol': 'text_pattern_ops'}
+    )
+    op.create_index(
+        'ix_stock_name_trgm', 'stock', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+
+
+def downgrade():
+    op.drop_index('ix_stock_name_trgm', table_name='stock')
+    op.drop_index('ix_stock_symbol_pattern', table_name='stock')
+    op.drop_index('ix_politician_img_lower_name', table_name='politician_img')
+    op.drop_index('ix_trade_traded', table_name='trade')
+    op.drop_index('ix_trade_politician_name_traded', table_name='trade')
@@ -0,0 +1,111 @@
+"""Trade typed price and filing gap
+
+Revision ID: 5ac0004f3f36
+Revises: d9078666094c
+Create Date: 2026-10-16 19:03:17.552904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5ac0004f3f36'
+down_revision = 'd9078666094c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('trade', sa.Column('filed_after_days', sa.Integer(), nullable=True))
+    op.add_column('trade', sa.Column('price_value', sa.Float(), nullable=True))
+
+    # Backfill with the same rules as scripts/normalize_trades.py
+    op.execute(
+        """
+        UPDATE trade
+        SET filed_after_days = substring(filed_after FROM '[0-9]+')::int,
+            price_value = CASE
+                WHEN regexp_replace(price, '[$,[:space:]]', '', 'g') ~ '^-?[0-9]+(\\.[0-9]+)?$'
+                THEN regexp_replace(price, '[$,[:space:]]', '', 'g')::float
+            END
+        """
+    )
+
+    # Imports now hash the trimmed, lower-cased type; store it the same way and
+    # recompute trade_hash with the d9078666094c digest so re-imports match.
+    # Rows that differed only in type spelling collide, so the unique index
+    # is rebuilt after removing them
+    op.drop_index('ix_trade_trade_hash', table_name='trade')
+    op.execute(
+        """
+        UPDATE trade
+        SET type = lower(btrim(type))
+        WHERE type IS DISTINCT FROM lower(btrim(type))
+        """
+    )
+    op.execute(
+        """
+        UPDATE trade
+        SET trade_hash = encode(sha256(convert_to(concat_ws(chr(31),
+            COALESCE(politician_name, ''),
+            COALESCE(traded_issuer_name, ''),
+            COALESCE(to_char(traded, 'YYYY-MM-DD'), ''),
+            COALESCE(type, ''),
+            COALESCE(size, ''),
+            COALESCE(owner, '')
+        ), 'UTF8')), 'hex')
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM trade a
+        USING trade b
+        WHERE a.trade_hash = b.trade_hash
+          AND a.id > b.id
+        """
+    )
+    op.create_index('ix_trade_trade_hash', 'trade', ['trade_hash'], unique=True)
+
+    # Rebuild the summaries: the leaderboard counts type = 'buy' / 'sell' exactly
+    op.execute("DELETE FROM trade_monthly_rollup")
+    op.execute(
+        """
+        INSERT INTO trade_monthly_rollup
+            (ticker, year, month, buy_total, sell_total, buy_count, sell_count)
+        SELECT base_ticker,
+               EXTRACT(YEAR FROM traded)::int,
+               EXTRACT(MONTH FROM traded)::int,
+               SUM(CASE WHEN type = 'buy' THEN COALESCE(size_mid, 0) ELSE 0 END),
+               SUM(CASE WHEN type = 'sell' THEN COALESCE(size_mid, 0) ELSE 0 END),
+               SUM(CASE WHEN type = 'buy' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN type = 'sell' THEN 1 ELSE 0 END)
+        FROM trade
+        WHERE base_ticker IS NOT NULL AND traded IS NOT NULL
+        GROUP BY base_ticker, EXTRACT(YEAR FROM traded)::int, EXTRACT(MONTH FROM traded)::int
+        """
+    )
+    op.execute("DELETE FROM politician_leaderboard")
+    op.execute(
+        """
+        INSERT INTO politician_leaderboard
+            (politician_name, politician_family, trade_count, buy_count, sell_count,
+             stock_count, latest_trade, estimated_spending)
+        SELECT politician_name,
+               MAX(politician_family),
+               COUNT(id),
+               SUM(CASE WHEN type = 'buy' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN type = 'sell' THEN 1 ELSE 0 END),
+               COUNT(DISTINCT traded_issuer_ticker),
+               MAX(traded),
+               COALESCE(SUM(size_mid), 0)
+        FROM trade
+        WHERE politician_name IS NOT NULL
+        GROUP BY politician_name
+        """
+    )
+
+
+def downgrade():
+    op.drop_column('trade', 'price_value')
+    op.drop_column('trade', 'filed_after_days')
@@ -0,0 +1,52 @@
+"""Trade size bounds
+
+Revision ID: 5b9db6c28b45
+Revises: e1a2fbe0e69f
+Create Date: 2026-10-16 09:12:41.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils import size_to_bounds
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9db6c28b45'
+down_revision = 'e1a2fbe0e69f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('trade', sa.Column('size_low', sa.Float(), nullable=True))
+    op.add_column('trade', sa.Column('size_high', sa.Float(), nullable=True))
+    op.add_column('trade', sa.Column('size_mid', sa.Float(), nullable=True))
+
+    # Backfill existing rows. Size strings come from a handful of
+    # brackets, so parse each distinct value once and update by value.
+    conn = op.get_bind()
+    sizes = conn.execute(
+        sa.text("SELECT DISTINCT size FROM trade WHERE size IS NOT NULL")
+    ).scalars().all()
+
+    for size in sizes:
+        size_low, size_high, size_mid = size_to_bounds(size)
+        conn.execute(
+            sa.text(
+                "UPDATE trade SET size_low = :size_low, size_high = :size_high, "
+                "size_mid = :size_mid WHERE size = :size"
+            ),
+            {
+                'size_low': size_low,
+                'size_high': size_high,
+                'size_mid': size_mid,
+                'size': size,
+            }
+        )
+
+
+def downgrade():
+    op.drop_column('trade', 'size_mid')
+    op.drop_column('trade', 'size_high')
+    op.drop_column('trade', 'size_low')
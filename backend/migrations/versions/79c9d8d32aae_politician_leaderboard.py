@@ -0,0 +1,56 @@
+"""Politician leaderboard
+
+Revision ID: 79c9d8d32aae
+Revises: 1fe813548593
+Create Date: 2026-10-16 14:31:12.902445
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '79c9d8d32aae'
+down_revision = '1fe813548593'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('politician_leaderboard',
+    sa.Column('politician_name', sa.String(length=128), nullable=False),
+    sa.Column('politician_family', sa.String(length=128), nullable=True),
+    sa.Column('trade_count', sa.Integer(), nullable=False),
+    sa.Column('buy_count', sa.Integer(), nullable=False),
+    sa.Column('sell_count', sa.Integer(), nullable=False),
+    sa.Column('stock_count', sa.Integer(), nullable=False),
+    sa.Column('latest_trade', sa.Date(), nullable=True),
+    sa.Column('estimated_spending', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('politician_name')
+    )
+    op.create_index('ix_politician_leaderboard_trade_count', 'politician_leaderboard', ['trade_count'], unique=False)
+
+    # Backfill with the same aggregation as app.rollups.refresh_politician_leaderboard
+    op.execute(
+        """
+        INSERT INTO politician_leaderboard
+            (politician_name, politician_family, trade_count, buy_count, sell_count,
+             stock_count, latest_trade, estimated_spending)
+        SELECT politician_name,
+               MAX(politician_family),
+               COUNT(id),
+               SUM(CASE WHEN type = 'buy' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN type = 'sell' THEN 1 ELSE 0 END),
+               COUNT(DISTINCT traded_issuer_ticker),
+               MAX(traded),
+               COALESCE(SUM(size_mid), 0)
+        FROM trade
+        WHERE politician_name IS NOT NULL
+        GROUP BY politician_name
+        """
+    )
+
+
+def downgrade():
+    op.drop_index('ix_politician_leaderboard_trade_count', table_name='politician_leaderboard')
+    op.drop_table('politician_leaderboard')
@@ -0,0 +1,36 @@
+"""Trade base ticker
+
+Revision ID: 89268dfacaf5
+Revises: 5b9db6c28b45
+Create Date: 2026-10-16 10:03:17.502916
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '89268dfacaf5'
+down_revision = '5b9db6c28b45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('trade', sa.Column('base_ticker', sa.String(length=32), nullable=True))
+
+    # Backfill with the same rules as app.utils.normalize_ticker
+    op.execute(
+        """
+        UPDATE trade
+        SET base_ticker = NULLIF(NULLIF(UPPER(TRIM(SPLIT_PART(traded_issuer_ticker, ':', 1))), ''), 'N/A')
+        WHERE traded_issuer_ticker IS NOT NULL
+        """
+    )
+
+    op.create_index('ix_trade_base_ticker_traded', 'trade', ['base_ticker', 'traded'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_trade_base_ticker_traded', table_name='trade')
+    op.drop_column('trade', 'base_ticker')
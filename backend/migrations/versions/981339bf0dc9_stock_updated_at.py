@@ -0,0 +1,26 @@
+"""Stock updated at
+
+Revision ID: 981339bf0dc9
+Revises: ec13a8249ee9
+Create Date: 2026-10-16 17:05:44.921380
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '981339bf0dc9'
+down_revision = 'ec13a8249ee9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('stock', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True))
+    # Profiles were last written when they were imported
+    op.execute("UPDATE stock SET updated_at = created_at WHERE created_at IS NOT NULL")
+
+
+def downgrade():
+    op.drop_column('stock', 'updated_at')
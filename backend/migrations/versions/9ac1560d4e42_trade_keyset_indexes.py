@@ -0,0 +1,40 @@
+"""Trade keyset indexes
+
+Revision ID: 9ac1560d4e42
+Revises: 49d69d38ce8e
+Create Date: 2026-10-16 12:40:08.271553
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9ac1560d4e42'
+down_revision = '49d69d38ce8e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination orders by (traded DESC, id DESC); extend the
+    # existing indexes with id so every page is a bounded index range scan.
+    op.create_index(
+        'ix_trade_traded_id', 'trade',
+        [sa.text('traded DESC'), sa.text('id DESC')], unique=False
+    )
+    op.drop_index('ix_trade_traded', table_name='trade')
+
+    op.create_index(
+        'ix_trade_base_ticker_traded_id', 'trade',
+        ['base_ticker', 'traded', 'id'], unique=False
+    )
+    op.drop_index('ix_trade_base_ticker_traded', table_name='trade')
+
+
+def downgrade():
+    op.create_index('ix_trade_base_ticker_traded', 'trade', ['base_ticker', 'traded'], unique=False)
+    op.drop_index('ix_trade_base_ticker_traded_id', table_name='trade')
+
+    op.create_index('ix_trade_traded', 'trade', [sa.text('traded DESC')], unique=False)
+    op.drop_index('ix_trade_traded_id', table_name='trade')
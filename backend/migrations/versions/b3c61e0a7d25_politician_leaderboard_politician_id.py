@@ -0,0 +1,91 @@
+"""Politician leaderboard keyed by politician id
+
+Revision ID: b3c61e0a7d25
+Revises: e73d355efa23
+Create Date: 2026-10-16 23:05:47.318260
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3c61e0a7d25'
+down_revision = 'e73d355efa23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Summary rows only: rebuilt from trade rather than converted
+    op.drop_index('ix_politician_leaderboard_trade_count', table_name='politician_leaderboard')
+    op.drop_table('politician_leaderboard')
+
+    op.create_table('politician_leaderboard',
+    sa.Column('politician_id', sa.Integer(), nullable=False),
+    sa.Column('trade_count', sa.Integer(), nullable=False),
+    sa.Column('buy_count', sa.Integer(), nullable=False),
+    sa.Column('sell_count', sa.Integer(), nullable=False),
+    sa.Column('stock_count', sa.Integer(), nullable=False),
+    sa.Column('latest_trade', sa.Date(), nullable=True),
+    sa.Column('estimated_spending', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['politician_id'], ['politician.id']),
+    sa.PrimaryKeyConstraint('politician_id')
+    )
+    op.create_index('ix_politician_leaderboard_trade_count', 'politician_leaderboard', ['trade_count'], unique=False)
+
+    # Backfill with the same aggregation as app.rollups.refresh_politician_leaderboard
+    op.execute(
+        """
+        INSERT INTO politician_leaderboard
+            (politician_id, trade_count, buy_count, sell_count,
+             stock_count, latest_trade, estimated_spending)
+        SELECT politician_id,
+               COUNT(id),
+               SUM(CASE WHEN type = 'buy' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN type = 'sell' THEN 1 ELSE 0 END),
+               COUNT(DISTINCT traded_issuer_ticker),
+               MAX(traded),
+               COALESCE(SUM(size_mid), 0)
+        FROM trade
+        WHERE politician_id IS NOT NULL
+        GROUP BY politician_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_index('ix_politician_leaderboard_trade_count', table_name='politician_leaderboard')
+    op.drop_table('politician_leaderboard')
+
+    op.create_table('politician_leaderboard',
+    sa.Column('politician_name', sa.String(length=128), nullable=False),
+    sa.Column('politician_family', sa.String(length=128), nullable=True),
+    sa.Column('trade_count', sa.Integer(), nullable=False),
+    sa.Column('buy_count', sa.Integer(), nullable=False),
+    sa.Column('sell_count', sa.Integer(), nullable=False),
+    sa.Column('stock_count', sa.Integer(), nullable=False),
+    sa.Column('latest_trade', sa.Date(), nullable=True),
+    sa.Column('estimated_spending', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('politician_name')
+    )
+    op.create_index('ix_politician_leaderboard_trade_count', 'politician_leaderboard', ['trade_count'], unique=False)
+
+    op.execute(
+        """
+        INSERT INTO politician_leaderboard
+            (politician_name, politician_family, trade_count, buy_count, sell_count,
+             stock_count, latest_trade, estimated_spending)
+        SELECT politician_name,
+               MAX(politician_family),
+               COUNT(id),
+               SUM(CASE WHEN type = 'buy' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN type = 'sell' THEN 1 ELSE 0 END),
+               COUNT(DISTINCT traded_issuer_ticker),
+               MAX(traded),
+               COALESCE(SUM(size_mid), 0)
+        FROM trade
+        WHERE politician_name IS NOT NULL
+        GROUP BY politician_name
+        """
+    )
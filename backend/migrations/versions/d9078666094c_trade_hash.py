@@ -0,0 +1,91 @@
+"""Trade hash
+
+Revision ID: d9078666094c
+Revises: 981339bf0dc9
+Create Date: 2026-10-16 18:12:41.208533
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9078666094c'
+down_revision = '981339bf0dc9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('trade', sa.Column('trade_hash', sa.String(length=64), nullable=True))
+
+    # Same digest as app.utils.trade_hash: the key fields joined by \x1f, NULLs as ''
+    op.execute(
+        """
+        UPDATE trade
+        SET trade_hash = encode(sha256(convert_to(concat_ws(chr(31),
+            COALESCE(politician_name, ''),
+            COALESCE(traded_issuer_name, ''),
+            COALESCE(to_char(traded, 'YYYY-MM-DD'), ''),
+            COALESCE(type, ''),
+            COALESCE(size, ''),
+            COALESCE(owner, '')
+        ), 'UTF8')), 'hex')
+        """
+    )
+
+    # Earlier imports stored some trades twice (page 1 was scraped twice); keep the oldest row
+    op.execute(
+        """
+        DELETE FROM trade a
+        USING trade b
+        WHERE a.trade_hash = b.trade_hash
+          AND a.id > b.id
+        """
+    )
+
+    op.alter_column('trade', 'trade_hash', existing_type=sa.String(length=64), nullable=False)
+    op.create_index('ix_trade_trade_hash', 'trade', ['trade_hash'], unique=True)
+
+    # Rebuild the summaries without the removed duplicates
+    op.execute("DELETE FROM trade_monthly_rollup")
+    op.execute(
+        """
+        INSERT INTO trade_monthly_rollup
+            (ticker, year, month, buy_total, sell_total, buy_count, sell_count)
+        SELECT base_ticker,
+               EXTRACT(YEAR FROM traded)::int,
+               EXTRACT(MONTH FROM traded)::int,
+               SUM(CASE WHEN lower(type) = 'buy' THEN COALESCE(size_mid, 0) ELSE 0 END),
+               SUM(CASE WHEN lower(type) = 'sell' THEN COALESCE(size_mid, 0) ELSE 0 END),
+               SUM(CASE WHEN lower(type) = 'buy' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN lower(type) = 'sell' THEN 1 ELSE 0 END)
+        FROM trade
+        WHERE base_ticker IS NOT NULL AND traded IS NOT NULL
+        GROUP BY base_ticker, EXTRACT(YEAR FROM traded)::int, EXTRACT(MONTH FROM traded)::int
+        """
+    )
+    op.execute("DELETE FROM politician_leaderboard")
+    op.execute(
+        """
+        INSERT INTO politician_leaderboard
+            (politician_name, politician_family, trade_count, buy_count, sell_count,
+             stock_count, latest_trade, estimated_spending)
+        SELECT politician_name,
+               MAX(politician_family),
+               COUNT(id),
+               SUM(CASE WHEN type = 'buy' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN type = 'sell' THEN 1 ELSE 0 END),
+               COUNT(DISTINCT traded_issuer_ticker),
+               MAX(traded),
+               COALESCE(SUM(size_mid), 0)
+        FROM trade
+        WHERE politician_name IS NOT NULL
+        GROUP BY politician_name
+        """
+    )
+
+
+def downgrade():
+    op.drop_index('ix_trade_trade_hash', table_name='trade')
+    op.drop_column('trade', 'trade_hash')
@@ -0,0 +1,40 @@
+"""Trade stock id
+
+Revision ID: e73d355efa23
+Revises: f10bece5c732
+Create Date: 2026-10-16 21:32:08.654120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e73d355efa23'
+down_revision = 'f10bece5c732'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('trade', sa.Column('stock_id', sa.Integer(), nullable=True))
+
+    # Same mapping as app.utils.stock_symbol ('BRK/B' -> 'BRK.B')
+    op.execute(
+        """
+        UPDATE trade t
+        SET stock_id = s.id
+        FROM stock s
+        WHERE t.base_ticker IS NOT NULL
+          AND s.symbol = replace(t.base_ticker, '/', '.')
+        """
+    )
+
+    op.create_foreign_key('trade_stock_id_fkey', 'trade', 'stock', ['stock_id'], ['id'])
+    op.create_index('ix_trade_stock_id', 'trade', ['stock_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_trade_stock_id', table_name='trade')
+    op.drop_constraint('trade_stock_id_fkey', 'trade', type_='foreignkey')
+    op.drop_column('trade', 'stock_id')
@@ -0,0 +1,28 @@
+"""Stock metric latest index
+
+Revision ID: ec13a8249ee9
+Revises: 0f67f63d2941
+Create Date: 2026-10-16 16:20:57.183604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ec13a8249ee9'
+down_revision = '0f67f63d2941'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # /api/financials-compact reads the newest row per stock
+    op.create_index(
+        'ix_stock_metric_stock_id_as_of_date', 'stock_metric',
+        ['stock_id', sa.text('as_of_date DESC'), sa.text('id DESC')], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_stock_metric_stock_id_as_of_date', table_name='stock_metric')
@@ -0,0 +1,108 @@
+"""Politician dimension
+
+Revision ID: f10bece5c732
+Revises: 5ac0004f3f36
+Create Date: 2026-10-16 20:14:41.208377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f10bece5c732'
+down_revision = '5ac0004f3f36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('politician',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=128), nullable=False),
+    sa.Column('family', sa.String(length=128), nullable=True),
+    sa.Column('img', sa.String(length=256), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+
+    # Politicians with an image first (latest image row wins), then everyone
+    # else who appears in trade
+    op.execute(
+        """
+        INSERT INTO politician (name, family, img)
+        SELECT DISTINCT ON (politician_name) politician_name, politician_family, img
+        FROM politician_img
+        ORDER BY politician_name, id DESC
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO politician (name, family)
+        SELECT politician_name, max(politician_family)
+        FROM trade
+        GROUP BY politician_name
+        ON CONFLICT (name) DO NOTHING
+        """
+    )
+
+    op.add_column('trade', sa.Column('politician_id', sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE trade t
+        SET politician_id = p.id
+        FROM politician p
+        WHERE p.name = t.politician_name
+        """
+    )
+    op.create_foreign_key(
+        'trade_politician_id_fkey', 'trade', 'politician', ['politician_id'], ['id']
+    )
+
+    # /api/politicians/<name>/* filter by politician_id and sort by newest trade
+    op.create_index(
+        'ix_trade_politician_id_traded', 'trade',
+        ['politician_id', sa.text('traded DESC')], unique=False
+    )
+    op.drop_index('ix_trade_politician_name_traded', table_name='trade')
+
+    # /api/pol/image and /api/autocomplete/politicians, as on politician_img before
+    op.create_index(
+        'ix_politician_lower_name', 'politician',
+        [sa.text('lower(name) text_pattern_ops')], unique=False
+    )
+    op.drop_index('ix_politician_img_lower_name', table_name='politician_img')
+    op.drop_table('politician_img')
+
+
+def downgrade():
+    op.create_table('politician_img',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('politician_name', sa.String(length=128), nullable=False),
+    sa.Column('politician_family', sa.String(length=128), nullable=True),
+    sa.Column('img', sa.String(length=256), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        """
+        INSERT INTO politician_img (politician_name, politician_family, img)
+        SELECT name, family, img FROM politician
+        WHERE img IS NOT NULL
+        ORDER BY id
+        """
+    )
+    op.create_index(
+        'ix_politician_img_lower_name', 'politician_img',
+        [sa.text('lower(politician_name) text_pattern_ops')], unique=False
+    )
+
+    op.create_index(
+        'ix_trade_politician_name_traded', 'trade',
+        ['politician_name', sa.text('traded DESC')], unique=False
+    )
+    op.drop_index('ix_trade_politician_id_traded', table_name='trade')
+    op.drop_constraint('trade_politician_id_fkey', 'trade', type_='foreignkey')
+    op.drop_column('trade', 'politician_id')
+
+    op.drop_index('ix_politician_lower_name', table_name='politician')
+    op.drop_table('politician')
@@ -0,0 +1,134 @@
+import os
+import sys
+import time
+import random
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils import size_to_bounds, normalize_ticker, parse_trade_date, trade_hash
+from app.bulk_load import _csv_chunk, _csv_frame
+from scripts.normalize_trades import TRADE_COLUMNS, normalize_trade_chunk
+
+SIZES = ['1K–15K', '15K–50K', '50K–100K', '100K–250K', '250K–500K', '500K–1M', '1M–5M', '< 1K', '> 50M', 'N/A']
+CHUNK_SIZE = 20000
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sept', 'Oct', 'Nov', 'Dec']
+
+
+def synthetic_records(num_records, seed=42):
+    """
+    Raw records shaped like the scraper's output.
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(num_records):
+        records.append({
+            'politician_name': f"Politician {rng.randrange(500)}",
+            'politician_family': rng.choice(['Democrat', 'Republican']),
+            'politician_link': 'N/A',
+            'traded_issuer_name': f"Issuer {rng.randrange(3000)}",
+            'traded_issuer_ticker': f"SYM{rng.randrange(3000)}:US",
+            'traded_issuer_link': 'N/A',
+            'published': f"{rng.randrange(1, 29)} {rng.choice(MONTHS)} 2024",
+            'traded': f"{rng.randrange(1, 29)} {rng.choice(MONTHS)} {rng.choice([2022, 2023, 2024])}",
+            'filed_after': f"{rng.randrange(1, 45)} days",
+            'owner': rng.choice(['Self', 'Spouse', 'Joint', 'Undisclosed']),
+            'type': rng.choice(['buy', 'sell', 'exchange']),
+            'size': rng.choice(SIZES),
+            'price': rng.choice(['N/A', f"${rng.uniform(1, 900):,.2f}"])
+        })
+    return records
+
+
+def normalize_per_row(records):
+    """
+    The previous row-at-a-time path from import_trades.process_trade_records.
+    """
+    rows = []
+    for record in records:
+        size_low, size_high, size_mid = size_to_bounds(record.get('size'))
+        trade = dict(
+            politician_name=record.get('politician_name'),
+            politician_family=record.get('politician_family'),
+            politician_link=record.get('politician_link'),
+            traded_issuer_name=record.get('traded_issuer_name'),
+            traded_issuer_ticker=record.get('traded_issuer_ticker'),
+            base_ticker=normalize_ticker(record.get('traded_issuer_ticker')),
+            traded_issuer_link=record.get('traded_issuer_link'),
+            published=record.get('published'),
+            traded=parse_trade_date(record.get('traded')),
+            filed_after=record.get('filed_after'),
+            owner=record.get('owner'),
+            type=record.get('type'),
+            size=record.get('size'),
+            size_low=size_low,
+            size_high=size_high,
+            size_mid=size_mid,
+            price=record.get('price')
+        )
+        trade['trade_hash'] = trade_hash(trade)
+        rows.append(trade)
+    return rows
+
+
+def normalize_vectorized(records):
+    return [normalize_trade_chunk(records[i:i + CHUNK_SIZE])[0] for i in range(0, len(records), CHUNK_SIZE)]
+
+
+def per_row_to_copy(records):
+    """
+    Per-row normalization plus per-row CSV rendering for COPY.
+    """
+    rows = normalize_per_row(records)
+    columns = list(rows[0])
+    for i in range(0, len(rows), CHUNK_SIZE):
+        _csv_chunk(rows[i:i + CHUNK_SIZE], columns)
+    return rows
+
+
+def columnar_to_copy(records):
+    """
+    Columnar normalization plus column-wise CSV rendering for COPY.
+    """
+    frames = normalize_vectorized(records)
+    for frame in frames:
+        _csv_frame(frame, TRADE_COLUMNS)
+    return frames
+
+
+def best_of(fn, records, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(records)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run_benchmark(num_records=200_000, repeats=3):
+    """
+    Times the per-row and columnar normalization paths on synthetic records
+    and checks they agree on the fields both produce.
+    """
+    records = synthetic_records(num_records)
+
+    print(f"Normalizing {num_records} synthetic trades for COPY, best of {repeats}...")
+    per_row_time, per_row = best_of(per_row_to_copy, records, repeats)
+    vectorized_time, frames = best_of(columnar_to_copy, records, repeats)
+
+    vectorized = [row for frame in frames for row in frame.to_dict('records')]
+    for old, new in zip(per_row, vectorized):
+        for field in ('traded', 'base_ticker', 'size_low', 'size_high', 'size_mid', 'trade_hash'):
+            assert old[field] == new[field] or (old[field] is None and pd.isna(new[field])), \
+                (field, old[field], new[field])
+
+    print(f"{'path':<12} {'seconds':>9} {'rows/s':>12}")
+    print(f"{'per-row':<12} {per_row_time:>9.2f} {num_records / per_row_time:>12,.0f}")
+    print(f"{'columnar':<12} {vectorized_time:>9.2f} {num_records / vectorized_time:>12,.0f}")
+    print(f"speedup: {per_row_time / vectorized_time:.1f}x")
+
+
+if __name__ == '__main__':
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    run_benchmark(num_records)
@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+import statistics
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+
+from app import create_app, db
+
+# Hot-path indexes from the migrations, dropped for the "before" run
+INDEXES = {
+    'ix_trade_politician_id_traded':
+        "CREATE INDEX ix_trade_politician_id_traded ON trade (politician_id, traded DESC)",
+    'ix_trade_traded_id':
+        "CREATE INDEX ix_trade_traded_id ON trade (traded DESC, id DESC)",
+    'ix_politician_lower_name':
+        "CREATE INDEX ix_politician_lower_name ON politician (lower(name) text_pattern_ops)",
+    'ix_trade_stock_id':
+        "CREATE INDEX ix_trade_stock_id ON trade (stock_id)",
+    'ix_stock_symbol_pattern':
+        "CREATE INDEX ix_stock_symbol_pattern ON stock (symbol text_pattern_ops)",
+    'ix_stock_name_trgm':
+        "CREATE INDEX ix_stock_name_trgm ON stock USING gin (name gin_trgm_ops)",
+}
+
+# Indexes that need a PostgreSQL extension from the contrib package
+INDEX_EXTENSIONS = {
+    'ix_stock_name_trgm': 'pg_trgm',
+}
+
+# The SQL issued by the hot routes in create_app
+QUERIES = {
+    'politician latest trade': (
+        "SELECT * FROM trade WHERE politician_id = "
+        "(SELECT id FROM politician WHERE name = 'Politician 42') "
+        "ORDER BY traded DESC LIMIT 1"
+    ),
+    'politician trades by date': (
+        "SELECT * FROM trade WHERE politician_id = "
+        "(SELECT id FROM politician WHERE name = 'Politician 42') "
+        "ORDER BY traded DESC"
+    ),
+    'recent trades (first page)': (
+        "SELECT * FROM trade ORDER BY traded DESC NULLS FIRST, id DESC LIMIT 101"
+    ),
+    'recent trades (later page)': (
+        "SELECT * FROM trade WHERE (traded, id) < (DATE '2023-06-01', 500000) "
+        "ORDER BY traded DESC NULLS FIRST, id DESC LIMIT 101"
+    ),
+    'politician image': (
+        "SELECT * FROM politician WHERE lower(name) = 'politician 42' LIMIT 1"
+    ),
+    'politician autocomplete': (
+        "SELECT * FROM politician WHERE lower(name) LIKE 'politician 4%' LIMIT 10"
+    ),
+    # Sector analytics over the trade -> stock foreign key
+    'trades by sector': (
+        "SELECT s.sector, count(*), sum(t.size_mid) FROM trade t "
+        "JOIN stock s ON s.id = t.stock_id GROUP BY s.sector"
+    ),
+    'sector trades': (
+        "SELECT t.* FROM trade t JOIN stock s ON s.id = t.stock_id "
+        "WHERE s.sector = 'Sector 3' ORDER BY t.traded DESC LIMIT 100"
+    ),
+    'stock autocomplete': (
+        "SELECT * FROM stock WHERE symbol LIKE 'SYM12%' OR name ILIKE 'SYM12%' LIMIT 10"
+    ),
+}
+
+
+def seed_synthetic_data(num_trades):
+    """
+    Inserts synthetic trades, politicians and stocks inside the current transaction.
+    """
+    print(f"Seeding {num_trades} synthetic trades...")
+    db.session.execute(text(
+        """
+        INSERT INTO politician (name, family, img)
+        SELECT 'Politician ' || g, 'Democrat', '/img/' || g || '.png'
+        FROM generate_series(0, 4999) AS g
+        ON CONFLICT (name) DO NOTHING
+        """
+    ))
+    db.session.execute(text(
+        """
+        INSERT INTO stock (symbol, name, sector)
+        SELECT 'SYM' || g, 'Sym Holdings ' || g, 'Sector ' || (g % 11)
+        FROM generate_series(0, 9999) AS g
+        ON CONFLICT (symbol) DO NOTHING
+        """
+    ))
+    db.session.execute(text(
+        """
+        INSERT INTO trade (stock_id, politician_id, politician_name, politician_family, traded_issuer_name,
+                           traded_issuer_ticker, base_ticker, traded, type, size,
+                           size_low, size_high, size_mid, trade_hash)
+        SELECT k.id,
+               p.id,
+               p.name,
+               CASE WHEN g % 2 = 0 THEN 'Democrat' ELSE 'Republican' END,
+               'Issuer ' || (g % 3000),
+               'SYM' || (g % 3000) || '\:US',
+               'SYM' || (g % 3000),
+               DATE '2022-01-01' + (g % 1100),
+               CASE WHEN g % 3 = 0 THEN 'sell' ELSE 'buy' END,
+               '1K-15K', 1000, 15000, 8000,
+               md5('synthetic-' || g)
+        FROM generate_series(1, :n) AS g
+        JOIN politician p ON p.name = 'Politician ' || (g % 500)
+        JOIN stock k ON k.symbol = 'SYM' || (g % 3000)
+        """
+    ), {'n': num_trades})
+    for table in ('trade', 'politician', 'stock'):
+        db.session.execute(text(f"ANALYZE {table}"))
+
+
+def missing_extensions():
+    """
+    Installs the extensions the indexes need and returns the ones this
+    server does not have available.
+    """
+    missing = set()
+    for extension in set(INDEX_EXTENSIONS.values()):
+        available = db.session.execute(text(
+            "SELECT 1 FROM pg_available_extensions WHERE name = :name"
+        ), {'name': extension}).scalar()
+        if available:
+            db.session.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+        else:
+            missing.add(extension)
+    return missing
+
+
+def time_queries(repeats):
+    """
+    Returns the median EXPLAIN ANALYZE execution time (ms) of each query.
+    """
+    timings = {}
+    for label, sql in QUERIES.items():
+        samples = []
+        for _ in range(repeats):
+            plan = db.session.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            samples.append(plan[0]['Execution Time'])
+        timings[label] = statistics.median(samples)
+    return timings
+
+
+def run_benchmark(num_trades=1_000_000, repeats=5):
+    """
+    Seeds synthetic data, times every hot query without and with the
+    hot-path indexes, prints a report and rolls everything back.
+    Point DATABASE_URL at a scratch database: the run holds table locks.
+    """
+    app = create_app()
+    with app.app_context():
+        try:
+            missing = missing_extensions()
+            skipped = [name for name, extension in INDEX_EXTENSIONS.items() if extension in missing]
+            seed_synthetic_data(num_trades)
+
+            for name in INDEXES:
+                db.session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            print("Timing queries without indexes...")
+            before = time_queries(repeats)
+
+            for name, create_sql in INDEXES.items():
+                if name not in skipped:
+                    db.session.execute(text(create_sql))
+            for table in ('trade', 'politician', 'stock'):
+                db.session.execute(text(f"ANALYZE {table}"))
+            print("Timing queries with indexes...")
+            after = time_queries(repeats)
+        finally:
+            db.session.rollback()
+
+    for name in skipped:
+        print(f"\nSkipped {name}: the {INDEX_EXTENSIONS[name]} extension is not available")
+    print(f"\nMedian execution time over {repeats} runs at {num_trades} trades")
+    print(f"{'query':<30} {'before (ms)':>12} {'after (ms)':>12} {'speedup':>9}")
+    for label in QUERIES:
+        speedup = before[label] / after[label] if after[label] else float('inf')
+        print(f"{label:<30} {before[label]:>12.2f} {after[label]:>12.2f} {speedup:>8.1f}x")
+
+
+if __name__ == '__main__':
+    num_trades = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    run_benchmark(num_trades)
@@ -0,0 +1,38 @@
+import os
+import json
+
+
+class Checkpoint:
+    """
+    Set of finished keys persisted to a JSON file, so an interrupted
+    import can skip the work it already committed on the next run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = set(json.load(f))
+
+    def __contains__(self, key):
+        return key in self.done
+
+    def mark(self, keys):
+        """
+        Records keys as finished and rewrites the file atomically.
+        Call only after the work for those keys is committed.
+        """
+        self.done.update(keys)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(sorted(self.done), f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """
+        Removes the file once a run completes.
+        """
+        self.done = set()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -1,32 +1,53 @@
+import os
+import sys
+import json
+import shutil
 import requests
 from bs4 import BeautifulSoup
-import json
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils import parse_trade_date, trade_hash
+
+
+BASE_URL = os.getenv("CAPITOL_TRADES_URL", "https://www.capitoltrades.com")
+PAGE_SIZE = 96
+
+# Pages downloaded at once, and processes parsing them
+FETCHERS = int(os.getenv("SCRAPER_FETCHERS", 4))
+PARSERS = int(os.getenv("SCRAPER_PARSERS", os.cpu_count() or 2))
+
+DATA_DIR = "data"
+# Parsed pages are kept here until the run completes, so an interrupted run resumes
+CHECKPOINT_DIR = os.path.join(DATA_DIR, ".trades_checkpoint")
 
+ROW_CLASS = "border-b transition-colors hover:bg-neutral-100/50 data-[state=selected]:bg-neutral-100 dark:hover:bg-neutral-800/50 dark:data-[state=selected]:bg-neutral-800 h-14 border-primary-15"
+TRADE_TYPE_CLASSES = ["q-field tx-type tx-type--sell has-asterisk","q-field tx-type tx-type--buy has-asterisk","q-field tx-type tx-type--buy","q-field tx-type tx-type--sell"]
 
-CapitalTrades = "https://www.capitoltrades.com/trades?pageSize=96&page=1"
 
-def checkIfEndOfPage(pageIndicators):
+def getPage(pageNumber:int = 1, baseUrl:str = BASE_URL):
+    return f"{baseUrl}/trades?pageSize={PAGE_SIZE}&page={pageNumber}"
+
+def makeSession(poolSize:int = FETCHERS):
     """
-    verifies that the page is no longer over the limit
+    Session whose connection pool is shared by every fetcher, retrying
+    rate limits and server errors with backoff
     """
-    if int(pageIndicators[0].text) > int(pageIndicators[1].text):
-        return False
-    else:
-        return True
-    
-
-def getPage(pageNumber:int = 1):
-    return f"https://www.capitoltrades.com/trades?pageSize=96&page={pageNumber}"
+    retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=poolSize, pool_maxsize=poolSize, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
-def fetchRequest(pageNumber:int = 1):
-    response = requests.get(getPage(pageNumber)) #GET request
+def fetchPage(session, pageNumber:int = 1, baseUrl:str = BASE_URL):
+    response = session.get(getPage(pageNumber, baseUrl), timeout=30) #GET request
     if response.status_code != 200:
         raise Exception(f"Error with URL requests: {response.status_code}")
-    
-    PoliticianTable = BeautifulSoup(response.content, 'html5lib')
-    PoliticianTable.prettify()
-    Page_Indicators = (PoliticianTable.find("p", class_= "hidden leading-7 sm:block")).find_all("b")
-    return PoliticianTable, Page_Indicators
+    return response.content
 
 def swapWords(string:str):
     """
@@ -35,57 +56,209 @@ def swapWords(string:str):
     words = string.split()
     return f"{words[1]} {words[0]}"
 
-def getPolData():
+def parseRow(tab):
+    """
+    Returns the (trade, politician) dicts for one table row
+    """
+    Trade = {}
+    Politician = {} #gets politician name and profile
+    Trade["politician_name"] = (tab.find('a',class_="text-txt-interactive")).text
+    Politician["politician_name"] = Trade["politician_name"]
+    Trade["politician_family"] = (tab.find('div',class_="politician-info mt-1 text-size-2 font-medium leading-none text-txt-dimmer").get_text(" "))
+    Politician["politician_family"] = Trade["politician_family"]
+    Trade["politician_link"] = "N/A"
+    Trade["traded_issuer_name"] =(tab.find('h3',class_="q-fieldset issuer-name")).text
+    Trade["traded_issuer_ticker"] =(tab.find("span","q-field issuer-ticker")).text
+    Trade["traded_issuer_link"] = "N/A"
+    datesPublishedAndPosted = tab.find_all("div",class_="text-center")
+    Trade["published"] = datesPublishedAndPosted[0].get_text(" ")
+    Trade["traded"] = datesPublishedAndPosted[1].get_text(" ")
+    raw_filed_after = (tab.find("div", class_="q-cell cell--reporting-gap flavour--lv")).get_text(" ")
+    Trade["filed_after"] = swapWords(raw_filed_after)
+    Trade["owner"] =(tab.find("span",class_="q-label")).get_text(" ")
+
+    TradeType =tab.find("span", class_=TRADE_TYPE_CLASSES)
+    if TradeType == None:
+        Trade["type"] = "exchange"
+    else:
+        Trade["type"] = TradeType.text
+    size =(tab.find("span","mt-1 text-size-2 text-txt-dimmer hover:text-foreground")).get_text(" ")
+    Trade["size"] = size.replace("\u2013","-")
+    Trade["price"] =(tab.find("div","flex place-content-center px-2 lg:px-3 xl:px-6 justify-end pr-0")).text
+    img = tab.find_all("img")
+    Politician["img"] = img[0]["src"]
+    return Trade, Politician
+
+def parsePage(html):
+    """
+    Parses one page of HTML. Runs in a worker process, so it only takes
+    and returns plain data.
+    """
+    PoliticianTable = BeautifulSoup(html, 'html5lib')
+    pageIndicators = (PoliticianTable.find("p", class_= "hidden leading-7 sm:block")).find_all("b")
+
     Trades = []
     Politicians = []
-    page_number = 1
-    
-    PoliticianTable, pageIndicators = fetchRequest(page_number)
-    
-    while(checkIfEndOfPage(pageIndicators)):
-
-        table = PoliticianTable.find_all("tr", class_= "border-b transition-colors hover:bg-neutral-100/50 data-[state=selected]:bg-neutral-100 dark:hover:bg-neutral-800/50 dark:data-[state=selected]:bg-neutral-800 h-14 border-primary-15")
-
-        for tab in table:
-            Trade = {}
-            Politician = {} #gets politician name and profile
-            Trade["politician_name"] = (tab.find('a',class_="text-txt-interactive")).text
-            Politician["politician_name"] = (tab.find('a',class_="text-txt-interactive")).text
-            Trade["politician_family"] = (tab.find('div',class_="politician-info mt-1 text-size-2 font-medium leading-none text-txt-dimmer").get_text(" "))
-            Politician["politician_family"] = (tab.find('div',class_="politician-info mt-1 text-size-2 font-medium leading-none text-txt-dimmer").get_text(" "))
-            Trade["politician_link"] = "N/A"
-            Trade["traded_issuer_name"] =(tab.find('h3',class_="q-fieldset issuer-name")).text
-            Trade["traded_issuer_ticker"] =(tab.find("span","q-field issuer-ticker")).text
-            Trade["traded_issuer_link"] = "N/A"
-            datesPublishedAndPosted = tab.find_all("div",class_="text-center")
-            Trade["published"] = datesPublishedAndPosted[0].get_text(" ")
-            Trade["traded"] = datesPublishedAndPosted[1].get_text(" ")
-            raw_filed_after = (tab.find("div", class_="q-cell cell--reporting-gap flavour--lv")).get_text(" ")
-            Trade["filed_after"] = swapWords(raw_filed_after)
-            Trade["owner"] =(tab.find("span",class_="q-label")).get_text(" ")
-
-            TradeType =tab.find("span", class_=["q-field tx-type tx-type--sell has-asterisk","q-field tx-type tx-type--buy has-asterisk","q-field tx-type tx-type--buy","q-field tx-type tx-type--sell"])
-            if TradeType == None:
-                Trade["type"] = "exchange"
-            else:
-                Trade["type"] = TradeType.text
-            size =(tab.find("span","mt-1 text-size-2 text-txt-dimmer hover:text-foreground")).get_text(" ")
-            Trade["size"] = size.replace("\u2013","-")
-            Trade["price"] =(tab.find("div","flex place-content-center px-2 lg:px-3 xl:px-6 justify-end pr-0")).text
-            img = tab.find_all("img")
-            Politician["img"] = img[0]["src"]
-            Trades.append(Trade)
-            if Politician not in Politicians:
+    for tab in PoliticianTable.find_all("tr", class_=ROW_CLASS):
+        Trade, Politician = parseRow(tab)
+        Trades.append(Trade)
+        Politicians.append(Politician)
+
+    return {
+        "total_pages": int(pageIndicators[1].text),
+        "trades": Trades,
+        "politicians": Politicians
+    }
+
+def scrapePage(session, pageNumber, baseUrl, parsePool):
+    """
+    Fetcher: downloads a page and waits on a parser process for the result
+    """
+    html = fetchPage(session, pageNumber, baseUrl)
+    return parsePool.submit(parsePage, html).result()
+
+def pagePath(checkpointDir, pageNumber):
+    return os.path.join(checkpointDir, f"page-{pageNumber:05d}.json")
+
+def savePage(checkpointDir, pageNumber, page):
+    path = pagePath(checkpointDir, pageNumber)
+    with open(f"{path}.tmp", "w") as fs:
+        json.dump(page, fs)
+    os.replace(f"{path}.tmp", path)
+
+def loadPage(checkpointDir, pageNumber):
+    with open(pagePath(checkpointDir, pageNumber)) as fs:
+        return json.load(fs)
+
+def mergePages(pages):
+    """
+    Concatenates pages in order, dropping trades repeated when new filings
+    shift rows across page boundaries mid-scrape, and keeping each politician once
+    """
+    Trades = []
+    Politicians = []
+    seenTrades = set()
+    seenPoliticians = set()
+    for page in pages:
+        for Trade in page["trades"]:
+            key = tuple(Trade.values())
+            if key not in seenTrades:
+                seenTrades.add(key)
+                Trades.append(Trade)
+        for Politician in page["politicians"]:
+            key = politicianKey(Politician)
+            if key not in seenPoliticians:
+                seenPoliticians.add(key)
                 Politicians.append(Politician)
-        PoliticianTable, pageIndicators = fetchRequest(page_number)
-        print(Trades[-1], end=f"\npage:{page_number}\n") #indicates if working
-        page_number += 1
-
-    with open ("data/3yeartrade.json", "w+") as fs:
-        json.dump(Trades,fs,indent=2)
-        print("trades success")
-    with open ("data/PoliticianPhotos.json", "w+") as fs:
-        json.dump(Politicians,fs,indent=2)
-        print("img success")
-
-getPolData()
\ No newline at end of file
+    return Trades, Politicians
+
+def tradeKey(Trade):
+    """
+    trade_hash of a scraped trade, as the importer will store it
+    """
+    return trade_hash({**Trade, "traded": parse_trade_date(Trade["traded"]), "type": Trade["type"].strip().lower()})
+
+def politicianKey(Politician):
+    return (Politician["politician_name"], Politician["politician_family"])
+
+def pageIsKnown(page, knownHashes):
+    """
+    True when every trade on the page is already stored
+    """
+    return all(tradeKey(Trade) in knownHashes for Trade in page["trades"])
+
+def mergeWithSaved(path, records, keyOf):
+    """
+    Returns records followed by the ones already saved at path that none of
+    them replace, so an incremental run adds to the saved history instead of
+    overwriting it with only the newest pages
+    """
+    if not os.path.exists(path):
+        return records
+    with open(path) as fs:
+        saved = json.load(fs)
+    keys = {keyOf(record) for record in records}
+    return records + [record for record in saved if keyOf(record) not in keys]
+
+def saveJson(path, records):
+    with open(f"{path}.tmp", "w") as fs:
+        json.dump(records, fs, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+def getPolData(baseUrl:str = BASE_URL, dataDir:str = DATA_DIR, checkpointDir:str = CHECKPOINT_DIR,
+               fetchers:int = FETCHERS, parsers:int = PARSERS, knownHashes = None):
+    """
+    Scrapes every page, or with knownHashes (trade_hash values already in the
+    database) stops after the first page holding only known trades and merges
+    what it found into the JSON files saved by earlier runs
+    """
+    os.makedirs(checkpointDir, exist_ok=True)
+    session = makeSession(fetchers)
+
+    with ProcessPoolExecutor(max_workers=parsers) as parsePool:
+        # Page 1 is always fetched fresh; it also says how many pages there are
+        first = scrapePage(session, 1, baseUrl, parsePool)
+        savePage(checkpointDir, 1, first)
+        totalPages = first["total_pages"]
+        lastPage = totalPages
+        if knownHashes is not None and pageIsKnown(first, knownHashes):
+            lastPage = 1
+
+        todo = [n for n in range(2, lastPage + 1) if not os.path.exists(pagePath(checkpointDir, n))]
+        print(f"pages: {totalPages} ({totalPages - 1 - len(todo)} already fetched or skipped)")
+
+        # Incremental runs fetch a window of pages at a time so they can stop early
+        window = fetchers if knownHashes is not None else max(len(todo), 1)
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=fetchers) as fetchPool:
+            for start in range(0, len(todo), window):
+                batch = [n for n in todo[start:start + window] if n <= lastPage]
+                futures = {fetchPool.submit(scrapePage, session, n, baseUrl, parsePool): n for n in batch}
+                for future in as_completed(futures):
+                    pageNumber = futures[future]
+                    try:
+                        page = future.result()
+                        savePage(checkpointDir, pageNumber, page)
+                        print(f"page:{pageNumber}") #indicates if working
+                    except Exception as e:
+                        print(f"page {pageNumber} failed: {e}")
+                        failed.append(pageNumber)
+                        continue
+                    if knownHashes is not None and pageIsKnown(page, knownHashes):
+                        lastPage = min(lastPage, pageNumber)
+
+    failed = [n for n in failed if n <= lastPage]
+    if failed:
+        print(f"{len(failed)} pages failed; rerun to fetch only those")
+        return False
+
+    Trades, Politicians = mergePages(loadPage(checkpointDir, n) for n in range(1, lastPage + 1))
+    tradesPath = os.path.join(dataDir, "3yeartrade.json")
+    politiciansPath = os.path.join(dataDir, "PoliticianPhotos.json")
+    if knownHashes is not None:
+        # import_trades.py --reload rebuilds the trade table from this file,
+        # so it must keep the history the early stop did not re-scrape
+        Trades = mergeWithSaved(tradesPath, Trades, tradeKey)
+        Politicians = mergeWithSaved(politiciansPath, Politicians, politicianKey)
+
+    saveJson(tradesPath, Trades)
+    print("trades success")
+    saveJson(politiciansPath, Politicians)
+    print("img success")
+
+    shutil.rmtree(checkpointDir)
+    return True
+
+
+if __name__ == "__main__":
+    knownHashes = None
+    if "--incremental" in sys.argv:
+        from app import create_app, db
+        from app.models import Trade
+
+        with create_app().app_context():
+            knownHashes = {row[0] for row in db.session.query(Trade.trade_hash)}
+        print(f"known trades: {len(knownHashes)}")
+
+    getPolData(knownHashes=knownHashes)
@@ -1,7 +1,9 @@
 import os
 import sys
-import time
-from finnhub.exceptions import FinnhubAPIException
+import queue
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import insert
 
 # ─── Make sure the app package is on our path ────────────────────────────────
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -9,69 +11,131 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from app import create_app, db
 from app.models import Stock, StockMetric
 from app.finnhub_client import get_financials
+from app.rate_limit import set_default_priority, BATCH
 from app.utils import extract_key_metrics
+from scripts.checkpoint import Checkpoint
 from scripts.fetch_sp500_symbols import fetch_sp500_symbols  # or your own symbol list
 
+# Fetches run in parallel; the shared Finnhub rate limiter keeps them within quota
+WORKERS = int(os.getenv("FINANCIALS_WORKERS", 8))
+# Symbols per multi-row insert
+BATCH_SIZE = int(os.getenv("FINANCIALS_BATCH_SIZE", 50))
+# Symbols already committed by an interrupted run are skipped on the next one
+CHECKPOINT_PATH = os.getenv(
+    "FINANCIALS_CHECKPOINT",
+    os.path.join(tempfile.gettempdir(), "smarttick-import-financials.json")
+)
+
 # 1) Get list of symbols (S&P 500 or whatever you prefer)
 SYMBOLS = fetch_sp500_symbols()
 
 
+def fetch_metrics(symbol, results):
+    """
+    Worker: fetches one symbol's financials and queues (symbol, payload, error).
+    payload is None when Finnhub has no usable data.
+    """
+    try:
+        resp = get_financials(symbol)
+    except Exception as e:
+        # Always report back, or the writer would wait on this symbol forever
+        results.put((symbol, None, e))
+        return
+
+    if not resp or "metric" not in resp:
+        results.put((symbol, None, None))
+        return
+
+    results.put((symbol, extract_key_metrics(resp), None))
+
+
+def write_batch(rows, symbols, checkpoint):
+    """
+    Inserts one batch of StockMetric rows in a single statement and
+    checkpoints its symbols once committed. Returns the rows written.
+    """
+    if rows:
+        try:
+            db.session.execute(insert(StockMetric), rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"⚠️  DB error writing {len(rows)} rows: {e}")
+            return 0
+
+    checkpoint.mark(symbols)
+    return len(rows)
+
+
 def import_financials(symbols):
+    # Leave part of the shared Finnhub quota for live web requests
+    set_default_priority(BATCH)
+
+    symbols = [symbol.upper().strip() for symbol in symbols]
+    checkpoint = Checkpoint(CHECKPOINT_PATH)
+
     app = create_app()
     with app.app_context():
-        processed = 0
+        stock_ids = dict(
+            db.session.query(Stock.symbol, Stock.id)
+            .filter(Stock.symbol.in_(symbols))
+            .all()
+        )
 
+        todo = []
         for symbol in symbols:
-            symbol = symbol.upper().strip()
-            print(f"⏳ Processing {symbol}...")
-
-            # —— retry loop for rate-limit errors ——
-            while True:
-                try:
-                    resp = get_financials(symbol)
-                    break
-                except FinnhubAPIException as e:
-                    if getattr(e, "status_code", None) == 429:
-                        print(f"⚠️  Rate limit hit. Sleeping 60s before retrying {symbol}…")
-                        time.sleep(60)
-                        continue
-                    else:
-                        print(f"⚠️  API error for {symbol}: {e}")
-                        resp = None
-                        break
-
-            # If no usable data, skip
-            if not resp or "metric" not in resp:
-                print(f"⚠️  No financial data for {symbol}, skipping.")
+            if symbol in checkpoint:
                 continue
-
-            # Extract just our key metrics
-            metrics_payload = extract_key_metrics(resp)
-
-            # Look up the Stock entry
-            stock = Stock.query.filter_by(symbol=symbol).first()
-            if not stock:
+            if symbol not in stock_ids:
                 print(f"⚠️  Stock {symbol} not in DB, skipping.")
                 continue
+            todo.append(symbol)
 
-            # Build a new StockMetric record
-            metric_entry = StockMetric(
-                stock_id=stock.id,
-                **metrics_payload
-            )
-            db.session.add(metric_entry)
-
-            # Commit (with rollback on failure)
-            try:
-                db.session.commit()
-                processed += 1
-            except Exception as e:
-                db.session.rollback()
-                print(f"⚠️  DB error for {symbol}: {e}")
-                continue
+        print(f"⏳ Fetching {len(todo)} symbols with {WORKERS} workers "
+              f"({len(symbols) - len(todo)} skipped or already done)...")
 
-            # —— throttle to ≤60 calls/minute ——  
-            time.sleep(1)
+        # Workers block once the writer falls this far behind
+        results = queue.Queue(maxsize=WORKERS * 4)
+        processed = 0
+        failed = 0
+        rows, batch_symbols = [], []
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            for symbol in todo:
+                pool.submit(fetch_metrics, symbol, results)
+
+            # This thread is the single writer
+            for _ in range(len(todo)):
+                symbol, payload, error = results.get()
+
+                if error is not None:
+                    # Not checkpointed, so the next run retries it
+                    print(f"⚠️  API error for {symbol}: {error}")
+                    failed += 1
+                    continue
+
+                if payload is None:
+                    print(f"⚠️  No financial data for {symbol}, skipping.")
+                else:
+                    rows.append({"stock_id": stock_ids[symbol], **payload})
+                batch_symbols.append(symbol)
+
+                if len(batch_symbols) >= BATCH_SIZE:
+                    written = write_batch(rows, batch_symbols, checkpoint)
+                    failed += len(rows) - written
+                    processed += written
+                    print(f"💾 Stored {processed} symbols so far")
+                    rows, batch_symbols = [], []
+
+        if batch_symbols:
+            written = write_batch(rows, batch_symbols, checkpoint)
+            failed += len(rows) - written
+            processed += written
+
+        if failed:
+            print(f"\n⚠️  {failed} symbols failed; rerun to retry them.")
+        else:
+            checkpoint.clear()
 
         print(f"\n🎉 Done. Processed {processed}/{len(symbols)} symbols.")
 
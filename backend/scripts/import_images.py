@@ -1,72 +1,70 @@
 import os
 import sys
-import json
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from sqlalchemy import text
+
 from app import create_app, db
-from app.models import PoliticianImg
+from app.bulk_load import copy_to_staging
+from scripts.json_stream import iter_json_records
 
-def clear_image_table():
-    """
-    Clears all existing data from the PoliticianImg table.
-    """
-    print("Clearing existing politician image data from the database...")
-    try:
-        db.session.query(PoliticianImg).delete()
-        db.session.commit()
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error clearing image data: {e}")
-        raise
-      
 def load_image_data_from_file(file_path):
     """
-    Loads JSON data from the given file path.
+    Streams politician image records from a JSON array or NDJSON file, one at a time.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return iter_json_records(file_path)
     except Exception as e:
-        print(f"Failed to load JSON file: {file_path}")
+        print(f"Failed to open JSON file: {file_path}")
         print(f"Exception: {e}")
         raise
 
+# Politician columns filled from PoliticianPhotos.json, in COPY order
+IMAGE_COLUMNS = ['name', 'family', 'img']
+
 def process_politician_images(image_data):
     """
-    Processes politician image records from JSON and prepares them for database insertion.
+    Yields politician image records from JSON as row dicts ready for loading.
     """
-    imgs_to_add = []
-    print(f"Processing {len(image_data)} politician images from JSON...")
+    print("Processing politician images from JSON...")
 
-    for i, record in enumerate(image_data):
-        img = PoliticianImg(
-            politician_name=record.get('politician_name'),
-            politician_family=record.get('politician_family'),
-            img=record.get('img')
-        )
-        imgs_to_add.append(img)
+    for record in image_data:
+        yield {
+            'name': record.get('politician_name'),
+            'family': record.get('politician_family'),
+            'img': record.get('img')
+        }
 
-    print(f"Finished processing JSON.")
-    return imgs_to_add
+    print("Finished processing JSON.")
 
-def insert_images_into_db(imgs_to_add, chunk_size=100):
+def insert_images_into_db(imgs_to_add):
     """
-    Inserts politician images into the database in chunks.
+    Bulk loads politician images with COPY into a staging table, then merges
+    them by politician name in one statement: known politicians get the new
+    image, new politicians are inserted, everyone else is left alone.
+    Politician ids never change, so trades keep pointing at the same rows.
     """
-    if not imgs_to_add:
-        print("No images found in the JSON file to add.")
-        return
-
-    total_imgs = len(imgs_to_add)
-    print(f"Preparing to add {total_imgs} images to the database in chunks of {chunk_size}...")
+    try:
+        staging, copied = copy_to_staging('politician', IMAGE_COLUMNS, imgs_to_add)
+        if not copied:
+            print("No images found in the JSON file to add.")
+            db.session.rollback()
+            return
+        print(f"Copied {copied} images into {staging}, merging...")
 
-    for i in range(0, total_imgs, chunk_size):
-        chunk = imgs_to_add[i:i + chunk_size]
-        db.session.add_all(chunk)
-        print(f"Added chunk {i // chunk_size + 1} to session...")
+        db.session.execute(text(
+            f"""
+            INSERT INTO politician (name, family, img)
+            SELECT DISTINCT ON (name) name, family, img
+            FROM {staging}
+            WHERE name IS NOT NULL
+            ORDER BY name
+            ON CONFLICT (name) DO UPDATE
+            SET family = EXCLUDED.family, img = EXCLUDED.img
+            """
+        ))
 
-    try:
         print("\nCommitting changes to the database...")
         db.session.commit()
         print("Image data loaded successfully.")
@@ -91,13 +89,8 @@ def load_image_data():
         except Exception:
             return
 
-        try:
-            clear_image_table()
-        except Exception:
-            return
-
         imgs_to_add = process_politician_images(image_data)
         insert_images_into_db(imgs_to_add)
 
 if __name__ == '__main__':
-    load_image_data()
\ No newline at end of file
+    load_image_data()
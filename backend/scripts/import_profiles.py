@@ -1,82 +1,89 @@
 import os
 import sys
-import json
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app import create_app, db
-from app.models import Stock
+from sqlalchemy import text
 
-def clear_stock_table():
-    """
-    Clears all existing data from the Stock table.
-    """
-    print("Clearing existing stock data from the database...")
-    try:
-        db.session.query(Stock).delete()
-        db.session.commit()
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error clearing stock data: {e}")
-        raise
+from app import create_app, db
+from app.bulk_load import copy_to_staging
+from app.utils import stock_symbol_sql
+from scripts.json_stream import iter_json_records
 
 def load_profile_data_from_file(file_path):
     """
-    Loads JSON data from the given file path.
+    Streams stock profile records from a JSON array or NDJSON file, one at a time.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return iter_json_records(file_path)
     except Exception as e:
-        print(f"Failed to load JSON file: {file_path}")
+        print(f"Failed to open JSON file: {file_path}")
         print(f"Exception: {e}")
         raise
 
+# Stock columns filled from profiles.json, in COPY order
+STOCK_COLUMNS = [
+    'symbol', 'name', 'exchange', 'industry', 'currency', 'country',
+    'estimate_currency', 'ipo', 'logo', 'market_capitalization', 'phone',
+    'shares_outstanding', 'weburl'
+]
+
 def process_stock_profiles(profile_data):
     """
-    Processes stock profile records from JSON and prepares them for database insertion.
-    """
-    stocks_to_add = []
-    print(f"Processing {len(profile_data)} stock profiles from JSON...")
-
-    for i, record in enumerate(profile_data):
-        stock = Stock(
-            symbol=record.get('symbol'),
-            name=record.get('name'),
-            exchange=record.get('exchange'),
-            industry=record.get('industry'),
-            currency=record.get('currency'),
-            country=record.get('country'),
-            estimate_currency=record.get('estimate_currency'),
-            ipo=record.get('ipo'),
-            logo=record.get('logo'),
-            market_capitalization=record.get('market_capitalization'),
-            phone=record.get('phone'),
-            shares_outstanding=record.get('shares_outstanding'),
-            weburl=record.get('weburl')
-        )
-        stocks_to_add.append(stock)
-
-    print(f"Finished processing JSON.")
-    return stocks_to_add
-
-def insert_stocks_into_db(stocks_to_add, chunk_size=100):
+    Yields stock profile records from JSON as row dicts ready for loading.
     """
-    Inserts stock profiles into the database in chunks.
-    """
-    if not stocks_to_add:
-        print("No stocks found in the JSON file to add.")
-        return
+    print("Processing stock profiles from JSON...")
 
-    total_stocks = len(stocks_to_add)
-    print(f"Preparing to add {total_stocks} stocks to the database in chunks of {chunk_size}...")
+    for record in profile_data:
+        stock = {column: record.get(column) for column in STOCK_COLUMNS}
+        stock['ipo'] = stock['ipo'] or None  # Finnhub sends '' when unknown
+        yield stock
 
-    for i in range(0, total_stocks, chunk_size):
-        chunk = stocks_to_add[i:i + chunk_size]
-        db.session.add_all(chunk)
-        print(f"Added chunk {i // chunk_size + 1} to session...")
+    print("Finished processing JSON.")
 
+def link_trades_to_stocks():
+    """
+    Points trades imported before their stock existed at it, by base ticker
+    (see app.utils.stock_symbol). Returns the number of trades linked.
+    """
+    return db.session.execute(text(
+        f"""
+        UPDATE trade t
+        SET stock_id = s.id
+        FROM stock s
+        WHERE t.stock_id IS NULL
+          AND t.base_ticker IS NOT NULL
+          AND s.symbol = {stock_symbol_sql('t.base_ticker')}
+        """
+    )).rowcount
+
+def insert_stocks_into_db(stocks_to_add):
+    """
+    Bulk loads stock profiles with COPY into a staging table, then upserts
+    them by symbol in one statement. Stocks keep their ids, so metrics and
+    prices that reference them are untouched.
+    """
     try:
+        staging, copied = copy_to_staging('stock', STOCK_COLUMNS, stocks_to_add)
+        if not copied:
+            print("No stocks found in the JSON file to add.")
+            db.session.rollback()
+            return
+        print(f"Copied {copied} stocks into {staging}, merging...")
+
+        column_list = ', '.join(STOCK_COLUMNS)
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in STOCK_COLUMNS if column != 'symbol')
+        db.session.execute(text(
+            f"""
+            INSERT INTO stock ({column_list})
+            SELECT DISTINCT ON (symbol) {column_list} FROM {staging}
+            WHERE symbol IS NOT NULL
+            ORDER BY symbol
+            ON CONFLICT (symbol) DO UPDATE SET {updates}, updated_at = now()
+            """
+        ))
+        print(f"Linked {link_trades_to_stocks()} trades to their stocks.")
+
         print("\nCommitting changes to the database...")
         db.session.commit()
         print("Stock data loaded successfully.")
@@ -101,11 +108,6 @@ def load_profile_data():
         except Exception:
             return
 
-        try:
-            clear_stock_table()
-        except Exception:
-            return
-
         stocks_to_add = process_stock_profiles(profile_data)
         insert_stocks_into_db(stocks_to_add)
 
@@ -1,123 +1,123 @@
 import os
 import sys
-import json
-from datetime import datetime
+from itertools import islice
+from sqlalchemy import text
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app import create_app, db
-from app.models import Trade
+from app.bulk_load import copy_frames_to_staging
+from app.rollups import refresh_monthly_rollup, refresh_politician_leaderboard
+from app.table_swap import build_shadow_table, swap_in_shadow_table
+from app.utils import stock_symbol_sql
+from scripts.json_stream import iter_json_records
+from scripts.normalize_trades import TRADE_COLUMNS, normalize_trade_chunk
 
 
-def parse_trade_date(date_str):
-    """
-    Parses date strings like '3 Apr 2025' or '3 Sept 2024' into date objects.
-    Handles potential errors or different formats gracefully.
-    """
-    if not date_str:
-        return None
-
-    processed_date_str = date_str.replace('Sept', 'Sep')  # Normalize date format
-
-    try:
-        return datetime.strptime(processed_date_str, '%d %b %Y').date()
-    except ValueError:
-        print(f"Warning: Could not parse date string: {date_str} (processed as: {processed_date_str})")
-        return None
-
-
-def clear_trade_table():
+def load_trade_data_from_file(file_path):
     """
-    Clears all existing data from the Trade table.
+    Streams trade records from a JSON array or NDJSON file, one at a time.
     """
-    print("Clearing existing trade data from the database...")
     try:
-        db.session.query(Trade).delete()
-        db.session.commit()
+        return iter_json_records(file_path)
     except Exception as e:
-        db.session.rollback()
-        print(f"Error clearing trade data: {e}")
+        print(f"Failed to open JSON file: {file_path}")
+        print(f"Exception: {e}")
         raise
 
 
-def load_trade_data_from_file(file_path):
+def process_trade_records(trade_data, chunk_size=20000):
     """
-    Loads trade data from a JSON file.
+    Yields normalized DataFrames of trade records ready for loading. Records
+    are normalized in columnar chunks (see scripts/normalize_trades.py), so
+    the loader never holds more than one chunk.
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Error: {file_path} not found. Ensure it's in the correct directory.")
-        raise
-    except json.JSONDecodeError:
-        print(f"Error: Could not decode JSON from {file_path}.")
-        raise
+    print("Processing trades from JSON...")
+    processed = 0
+    failed_parses = 0
+    trade_data = iter(trade_data)
 
+    while True:
+        records = list(islice(trade_data, chunk_size))
+        if not records:
+            break
 
-def process_trade_records(trade_data):
-    """
-    Processes trade records from JSON and prepares them for database insertion.
-    """
-    trades_to_add = []
-    print(f"Processing {len(trade_data)} trades from JSON...")
-    successful_parses = 0
-    failed_parses = 0
+        frame, failed_dates = normalize_trade_chunk(records)
+        failed_parses += failed_dates
+        yield frame
 
-    for i, record in enumerate(trade_data):
-        trade_date_str = record.get('traded')
-        trade_date = parse_trade_date(trade_date_str)
-
-        if trade_date_str and not trade_date:
-            failed_parses += 1
-        elif trade_date:
-            successful_parses += 1
-
-        trade = Trade(
-            politician_name=record.get('politician_name'),
-            politician_family=record.get('politician_family'),
-            politician_link=record.get('politician_link'),
-            traded_issuer_name=record.get('traded_issuer_name'),
-            traded_issuer_ticker=record.get('traded_issuer_ticker'),
-            traded_issuer_link=record.get('traded_issuer_link'),
-            published=record.get('published'),
-            traded=trade_date,
-            filed_after=record.get('filed_after'),
-            owner=record.get('owner'),
-            type=record.get('type'),
-            size=record.get('size'),
-            price=record.get('price')
-        )
-        trades_to_add.append(trade)
-
-        if (i + 1) % 2000 == 0:
-            print(f"Processed {i + 1} records...")
-
-    print(f"\nFinished processing JSON.")
-    print(f"Successfully parsed {successful_parses} dates.")
-    if failed_parses > 0:
-        print(f"Failed to parse {failed_parses} dates (see warnings above).")
+        processed += len(records)
+        print(f"Processed {processed} records...")
 
-    return trades_to_add
+    print(f"\nFinished processing {processed} trades from JSON.")
+    if failed_parses > 0:
+        print(f"Failed to parse {failed_parses} dates.")
 
 
-def insert_trades_into_db(trades_to_add, chunk_size=5000):
+def upsert_politicians(staging):
     """
-    Inserts trades into the database in chunks.
+    Adds the politicians named in the staged trades that are not stored yet,
+    so each name is resolved to a politician id once per load, in SQL.
     """
-    if not trades_to_add:
-        print("No trades found in the JSON file to add.")
-        return
-
-    total_trades = len(trades_to_add)
-    print(f"Preparing to add {total_trades} trades to the database in chunks of {chunk_size}...")
+    db.session.execute(text(
+        f"""
+        INSERT INTO politician (name, family)
+        SELECT politician_name, max(politician_family) FROM {staging}
+        WHERE politician_name IS NOT NULL
+        GROUP BY politician_name
+        ON CONFLICT (name) DO NOTHING
+        """
+    ))
+
+
+def staged_trades_query(staging, distinct=False):
+    """
+    SELECT over the staged trades in TRADE_COLUMNS order plus politician_id
+    and stock_id, joined to politician by name and to stock by base ticker.
+    """
+    columns = ', '.join(f's.{column}' for column in TRADE_COLUMNS)
+    distinct_on = 'DISTINCT ON (s.trade_hash) ' if distinct else ''
+    order_by = 'ORDER BY s.trade_hash' if distinct else ''
+    return (
+        f"SELECT {distinct_on}{columns}, p.id, k.id FROM {staging} s "
+        f"LEFT JOIN politician p ON p.name = s.politician_name "
+        f"LEFT JOIN stock k ON k.symbol = {stock_symbol_sql('s.base_ticker')} {order_by}"
+    )
 
-    for i in range(0, total_trades, chunk_size):
-        chunk = trades_to_add[i:i + chunk_size]
-        db.session.add_all(chunk)
-        print(f"Added chunk {i // chunk_size + 1} to session...")
 
+def insert_trades_into_db(trades_to_add):
+    """
+    Bulk loads trades with COPY into a staging table, then merges the ones
+    not stored yet in a single INSERT ... SELECT. Trades whose trade_hash
+    already exists are skipped, so re-running on the same file only adds
+    new rows and only their rollups are refreshed.
+    """
     try:
+        staging, copied = copy_frames_to_staging('trade', TRADE_COLUMNS, trades_to_add)
+        if not copied:
+            print("No trades found in the JSON file to add.")
+            db.session.rollback()
+            return
+        print(f"Copied {copied} trades into {staging}, merging...")
+
+        upsert_politicians(staging)
+        column_list = ', '.join(TRADE_COLUMNS)
+        inserted = db.session.execute(text(
+            f"""
+            INSERT INTO trade ({column_list}, politician_id, stock_id)
+            {staged_trades_query(staging)}
+            ON CONFLICT (trade_hash) DO NOTHING
+            RETURNING base_ticker, politician_id
+            """
+        )).all()
+        print(f"{len(inserted)} new trades ({copied - len(inserted)} already stored).")
+
+        # Keep the summaries in step with the new trades, in the same transaction
+        print("Refreshing monthly trade rollup...")
+        refresh_monthly_rollup({row.base_ticker for row in inserted})
+        print("Refreshing politician leaderboard...")
+        refresh_politician_leaderboard({row.politician_id for row in inserted})
+
         print("\nCommitting changes to the database...")
         db.session.commit()
         print("Trade data loaded successfully.")
@@ -130,9 +130,47 @@ def insert_trades_into_db(trades_to_add, chunk_size=5000):
         print("Database changes have been rolled back.")
 
 
-def load_trade_data():
+def reload_trades_into_db(trades_to_add):
     """
-    Main function to load trade data into the database.
+    Full reload: loads every trade into a shadow table, builds its indexes,
+    then swaps it in for the live table and rebuilds the rollups in one short
+    transaction. The API keeps serving the old trades until the swap.
+    """
+    def fill(shadow):
+        staging, copied = copy_frames_to_staging('trade', TRADE_COLUMNS, trades_to_add)
+        print(f"Copied {copied} trades into {staging}, filling {shadow}...")
+
+        upsert_politicians(staging)
+        column_list = ', '.join(TRADE_COLUMNS)
+        db.session.execute(text(
+            f"""
+            INSERT INTO {shadow} ({column_list}, politician_id, stock_id)
+            {staged_trades_query(staging, distinct=True)}
+            """
+        ))
+
+    def rebuild_rollups():
+        print("Rebuilding monthly trade rollup and politician leaderboard...")
+        refresh_monthly_rollup()
+        refresh_politician_leaderboard()
+
+    try:
+        build_shadow_table('trade', fill)
+        print("Swapping in the reloaded trade table...")
+        swap_in_shadow_table('trade', after_swap=rebuild_rollups)
+        print("Trade data reloaded successfully.")
+    except Exception as e:
+        db.session.rollback()
+        print("Failed to reload trade data; the live table is unchanged.")
+        print(f"Exception: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+def load_trade_data(reload=False):
+    """
+    Main function to load trade data into the database. With reload=True
+    the trade table is rebuilt from the file instead of merged into.
     """
     app = create_app()
     with app.app_context():
@@ -143,14 +181,12 @@ def load_trade_data():
         except Exception:
             return
 
-        try:
-            clear_trade_table()
-        except Exception:
-            return
-
         trades_to_add = process_trade_records(trade_data)
-        insert_trades_into_db(trades_to_add)
+        if reload:
+            reload_trades_into_db(trades_to_add)
+        else:
+            insert_trades_into_db(trades_to_add)
 
 
 if __name__ == '__main__':
-    load_trade_data()
+    load_trade_data(reload='--reload' in sys.argv)
@@ -0,0 +1,81 @@
+import json
+
+READ_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+
+
+def iter_json_records(file_path, read_size=READ_SIZE):
+    """
+    Yields the records of a JSON array file, or of an NDJSON file (one
+    object per line), one at a time without loading the whole file.
+    The file is opened right away, so a missing file raises here rather
+    than on the first record.
+    """
+    f = open(file_path, 'r', encoding='utf-8')
+    return _records(f, read_size)
+
+
+def _records(f, read_size):
+    with f:
+        head = f.read(read_size)
+        while head and not head.strip():
+            chunk = f.read(read_size)
+            if not chunk:
+                break
+            head += chunk
+
+        if head.lstrip().startswith('['):
+            yield from _array_records(f, head.lstrip()[1:], read_size)
+        else:
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _array_records(f, buffer, read_size):
+    eof = False
+
+    def more():
+        nonlocal buffer, eof
+        chunk = f.read(read_size)
+        if chunk:
+            buffer += chunk
+        else:
+            eof = True
+
+    expect_value = True
+    while True:
+        buffer = buffer.lstrip()
+        if not buffer:
+            if eof:
+                raise json.JSONDecodeError("Unterminated array", buffer, 0)
+            more()
+            continue
+
+        if buffer[0] == ']':
+            return
+        if not expect_value:
+            if buffer[0] != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, 0)
+            buffer = buffer[1:]
+            expect_value = True
+            continue
+
+        try:
+            record, end = _decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more()
+            continue
+
+        # A value ending exactly at the buffer edge (e.g. a number) may be cut short
+        if end == len(buffer) and not eof:
+            more()
+            continue
+
+        buffer = buffer[end:]
+        expect_value = False
+        yield record
@@ -0,0 +1,111 @@
+import re
+import hashlib
+
+import pandas as pd
+
+from app.utils import TRADE_KEY_FIELDS, size_to_bounds, normalize_ticker
+
+# Raw fields read from the scraped JSON
+RAW_FIELDS = [
+    'politician_name', 'politician_family', 'politician_link',
+    'traded_issuer_name', 'traded_issuer_ticker', 'traded_issuer_link',
+    'published', 'traded', 'filed_after', 'owner', 'type', 'size', 'price'
+]
+
+# Trade columns produced by normalize_trade_chunk, in COPY order
+TRADE_COLUMNS = [
+    'politician_name', 'politician_family', 'politician_link',
+    'traded_issuer_name', 'traded_issuer_ticker', 'base_ticker', 'traded_issuer_link',
+    'published', 'traded', 'filed_after', 'filed_after_days', 'owner', 'type',
+    'size', 'size_low', 'size_high', 'size_mid', 'price', 'price_value', 'trade_hash'
+]
+
+
+def _map_unique(series, fn):
+    """
+    Applies fn once per distinct value and broadcasts the results; trade
+    columns repeat a handful of values (sizes, tickers, dates) many times.
+    """
+    uniques = series.dropna().unique()
+    return series.map(dict(zip(uniques, (fn(value) for value in uniques))))
+
+
+def parse_traded_dates(traded):
+    """
+    Parses '3 Apr 2025' / '3 Sept 2024' strings into dates, once per distinct
+    string. Returns (object Series of date or None, count of unparseable strings).
+    """
+    uniques = pd.Series(traded.dropna().unique(), dtype=object)
+    parsed = pd.to_datetime(
+        uniques.str.replace('Sept', 'Sep', regex=False),
+        format='%d %b %Y',
+        errors='coerce'
+    )
+    lookup = {
+        raw: (stamp.date() if not pd.isna(stamp) else None)
+        for raw, stamp in zip(uniques, parsed)
+    }
+    dates = traded.map(lookup)
+    failed = int((traded.notna() & traded.ne('') & dates.isna()).sum())
+    return dates, failed
+
+
+def parse_prices(price):
+    """
+    Parses price strings like '$1,153.18' to floats; 'N/A' and blanks become NaN.
+    """
+    cleaned = price.astype('string').str.replace(r'[$,\s]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def parse_filed_after_days(filed_after):
+    """
+    Extracts the day count from strings like '12 days' as nullable integers,
+    once per distinct string.
+    """
+    def days(value):
+        match = re.search(r'\d+', value)
+        return int(match.group()) if match else None
+
+    return _map_unique(filed_after, days).astype('Int64')
+
+
+def normalize_trade_chunk(records):
+    """
+    Normalizes a list of raw trade records column by column. Returns
+    (DataFrame with TRADE_COLUMNS, count of unparseable trade dates); the
+    frame goes straight to app.bulk_load.copy_frames_to_staging.
+    """
+    frame = pd.DataFrame.from_records(records, columns=RAW_FIELDS)
+
+    frame['traded'], failed_dates = parse_traded_dates(frame['traded'])
+
+    bounds = {size: size_to_bounds(size) for size in frame['size'].dropna().unique()}
+    for i, column in enumerate(('size_low', 'size_high', 'size_mid')):
+        frame[column] = frame['size'].map({size: bound[i] for size, bound in bounds.items()})
+
+    frame['base_ticker'] = _map_unique(frame['traded_issuer_ticker'], normalize_ticker)
+    frame['price_value'] = parse_prices(frame['price'])
+    frame['filed_after_days'] = parse_filed_after_days(frame['filed_after'])
+    frame['type'] = frame['type'].astype('string').str.strip().str.lower()
+
+    frame['trade_hash'] = hash_trade_keys(frame)
+    return frame[TRADE_COLUMNS], failed_dates
+
+
+def hash_trade_keys(frame):
+    """
+    app.utils.trade_hash for every row: key columns are stringified column
+    by column and only the join and SHA-256 run per row.
+    """
+    parts = []
+    for field in TRADE_KEY_FIELDS:
+        column = frame[field]
+        if field == 'traded':
+            column = _map_unique(column, lambda traded: traded.isoformat())
+        parts.append(column.astype(object).fillna('').astype(str).tolist())
+
+    return [
+        hashlib.sha256('\x1f'.join(key).encode('utf-8')).hexdigest()
+        for key in zip(*parts)
+    ]
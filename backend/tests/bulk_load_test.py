@@ -0,0 +1,41 @@
+from datetime import date
+
+import pandas as pd
+
+from app.bulk_load import _csv_chunk, _csv_frame
+
+
+def test_csv_chunk_keeps_null_and_empty_string_apart():
+    """
+    test that NULLs are unquoted empty fields while strings, dates and quotes survive COPY's CSV rules
+    """
+    rows = [
+        {'name': 'Apple "AAPL", Inc', 'traded': date(2024, 1, 5), 'size_mid': 8000.0, 'price': None},
+        {'name': '', 'traded': None, 'size_mid': None, 'price': 'N/A'},
+    ]
+
+    lines = _csv_chunk(rows, ['name', 'traded', 'size_mid', 'price']).read().splitlines()
+
+    assert lines == [
+        '"Apple ""AAPL"", Inc","2024-01-05",8000.0,',
+        '"",,,"N/A"',
+    ]
+
+
+def test_csv_frame_marks_nulls_for_copy():
+    """
+    test that missing values in a frame are written as the \\N marker, apart from empty strings
+    """
+    frame = pd.DataFrame({
+        'name': ['Apple "AAPL", Inc', ''],
+        'traded': [date(2024, 1, 5), None],
+        'days': pd.array([12, None], dtype='Int64'),
+        'price_value': [1153.18, None],
+    })
+
+    lines = _csv_frame(frame, ['name', 'traded', 'days', 'price_value']).read().splitlines()
+
+    assert lines == [
+        '"Apple ""AAPL"", Inc",2024-01-05,12,1153.18',
+        ',\\N,\\N,\\N',
+    ]
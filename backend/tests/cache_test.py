@@ -0,0 +1,60 @@
+from app.cache import TTLCache, cached
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_entries_expire_after_ttl():
+    """
+    test that entries are served until their TTL passes
+    """
+    clock = FakeClock()
+    cache = TTLCache("test_expiry", maxsize=10, ttl=30, clock=clock)
+    cache.set(("AAPL",), {"c": 1})
+
+    clock.now = 29
+    assert cache.get(("AAPL",)) == (True, {"c": 1})
+
+    clock.now = 31
+    assert cache.get(("AAPL",)) == (False, None)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    """
+    test that the LRU bound evicts the entry touched longest ago
+    """
+    cache = TTLCache("test_lru", maxsize=2, ttl=60, clock=FakeClock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cached_skips_empty_results():
+    """
+    test that the decorator only calls through on a miss and never caches empty results
+    """
+    calls = []
+    cache = TTLCache("test_decorator", maxsize=10, ttl=60, clock=FakeClock())
+
+    @cached(cache)
+    def fetch(symbol):
+        calls.append(symbol)
+        return {} if symbol == "NONE" else {"symbol": symbol}
+
+    assert fetch("MSFT") == {"symbol": "MSFT"}
+    assert fetch("MSFT") == {"symbol": "MSFT"}
+    fetch("NONE")
+    fetch("NONE")
+    assert calls == ["MSFT", "NONE", "NONE"]
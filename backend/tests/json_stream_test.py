@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from scripts.json_stream import iter_json_records
+
+RECORDS = [
+    {"politician_name": "Nancy Pelosi", "size": "1K-15K", "price": 228.1},
+    {"politician_name": "Dan Crenshaw", "note": "brackets ] and , inside strings", "price": 12345},
+    {"politician_name": "Ro Khanna", "tags": [1, 2, {"x": None}], "price": 7},
+]
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 65536])
+def test_streams_json_array_across_read_boundaries(tmp_path, read_size):
+    """
+    test that records come back intact however the file is split into reads
+    """
+    path = tmp_path / "trades.json"
+    path.write_text("\n  " + json.dumps(RECORDS, indent=2))
+
+    assert list(iter_json_records(str(path), read_size)) == RECORDS
+
+
+def test_streams_ndjson(tmp_path):
+    """
+    test that one-object-per-line files are read the same way
+    """
+    path = tmp_path / "trades.ndjson"
+    path.write_text("\n".join(json.dumps(record) for record in RECORDS) + "\n\n")
+
+    assert list(iter_json_records(str(path))) == RECORDS
+
+
+def test_truncated_array_raises(tmp_path):
+    """
+    test that a file cut off mid-record is an error, not a silent short import
+    """
+    path = tmp_path / "trades.json"
+    path.write_text(json.dumps(RECORDS)[:-20])
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_records(str(path), 16))
@@ -0,0 +1,34 @@
+from datetime import date
+
+from app.utils import trade_hash
+from scripts.normalize_trades import normalize_trade_chunk
+
+
+def test_normalize_trade_chunk_types_columns():
+    """
+    test that dates, sizes, prices, types and filing gaps are parsed and hashes match trade_hash
+    """
+    records = [
+        {'politician_name': 'Nancy Pelosi', 'traded_issuer_name': 'Apple Inc', 'traded_issuer_ticker': 'AAPL:US',
+         'traded': '3 Sept 2024', 'type': 'Buy', 'size': '1K-15K', 'owner': 'Spouse',
+         'price': '$1,153.18', 'filed_after': '12 days'},
+        {'politician_name': 'Dan Crenshaw', 'traded_issuer_name': 'Agilent', 'traded_issuer_ticker': 'N/A',
+         'traded': 'not a date', 'type': 'sell', 'size': 'N/A', 'price': 'N/A'},
+    ]
+
+    frame, failed_dates = normalize_trade_chunk(records)
+    first, second = frame.to_dict('records')
+
+    assert failed_dates == 1
+    assert first['traded'] == date(2024, 9, 3)
+    assert (first['size_low'], first['size_high'], first['size_mid']) == (1000, 15000, 8000)
+    assert first['price_value'] == 1153.18
+    assert first['filed_after_days'] == 12
+    assert first['type'] == 'buy'
+    assert first['base_ticker'] == 'AAPL'
+    assert first['trade_hash'] == trade_hash(first)
+
+    assert second['base_ticker'] is None
+    assert frame['price_value'].isna()[1]
+    assert frame['filed_after_days'].isna()[1]
+    assert second['trade_hash'] == trade_hash({**second, 'traded': None, 'owner': None})
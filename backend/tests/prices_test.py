@@ -0,0 +1,46 @@
+from datetime import date, timedelta
+
+from app.prices import missing_ranges
+
+
+def trading_days(start, end, skip=()):
+    day = start
+    while day <= end:
+        if day.weekday() < 5 and day not in skip:
+            yield day
+        day += timedelta(days=1)
+
+
+def test_missing_ranges_fetches_gaps_between_stored_dates():
+    """
+    test that months missing between two stored ranges are fetched, not
+    only the dates before the first and after the last stored price
+    """
+    stored = list(trading_days(date(2024, 1, 2), date(2024, 1, 31)))
+    stored += list(trading_days(date(2024, 6, 3), date(2024, 6, 28)))
+
+    assert missing_ranges(date(2023, 12, 1), date(2024, 7, 1), stored) == [
+        (date(2023, 12, 1), date(2024, 1, 1)),
+        (date(2024, 2, 1), date(2024, 6, 2)),
+        (date(2024, 6, 29), date(2024, 7, 1)),
+    ]
+
+
+def test_missing_ranges_skips_holidays_and_weekends():
+    """
+    test that single-weekday holidays and weekends are not refetched
+    """
+    stored = list(trading_days(date(2024, 6, 28), date(2024, 7, 12), skip={date(2024, 7, 4)}))
+
+    assert missing_ranges(date(2024, 6, 29), date(2024, 7, 14), stored) == []
+    assert missing_ranges(date(2024, 6, 1), date(2024, 6, 2), []) == []
+
+
+def test_missing_ranges_skips_leading_holiday():
+    """
+    test that a lone holiday before the first stored price (New Year's Day)
+    is not fetched
+    """
+    stored = list(trading_days(date(2024, 1, 2), date(2024, 1, 31)))
+
+    assert missing_ranges(date(2024, 1, 1), date(2024, 1, 31), stored) == []
@@ -0,0 +1,32 @@
+import time
+
+from app import finnhub_client
+
+
+def test_batch_quotes_fetch_misses_concurrently(monkeypatch):
+    """
+    test that cached quotes skip the upstream, misses are fetched in
+    parallel and failed symbols map to None
+    """
+    calls = []
+
+    def quote(symbol):
+        calls.append(symbol)
+        time.sleep(0.2)
+        if symbol == "FAIL":
+            raise RuntimeError("upstream error")
+        return {"c": len(symbol)}
+
+    monkeypatch.setattr(finnhub_client.finnhub_client, "quote", quote)
+    monkeypatch.setattr(finnhub_client.finnhub_limiter, "call", lambda fn, *args: fn(*args))
+    finnhub_client.quote_cache.clear()
+    finnhub_client.quote_cache.set(("AAPL",), {"c": 189.5})
+
+    start = time.monotonic()
+    quotes = finnhub_client.get_quotes(["AAPL", "MSFT", "NVDA", "FAIL"])
+    elapsed = time.monotonic() - start
+
+    assert quotes == {"AAPL": {"c": 189.5}, "MSFT": {"c": 4}, "NVDA": {"c": 4}, "FAIL": None}
+    assert sorted(calls) == ["FAIL", "MSFT", "NVDA"]
+    assert elapsed < 0.5
+    assert finnhub_client.quote_cache.get(("MSFT",)) == (True, {"c": 4})
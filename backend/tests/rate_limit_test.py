@@ -0,0 +1,156 @@
+import pytest
+
+from app.rate_limit import TokenBucket, RateLimitExceeded, BATCH, INTERACTIVE
+
+
+class FakeTime:
+    """
+    clock and sleep pair that advances instantly
+    """
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FakeRateLimitError(Exception):
+    def __init__(self, response):
+        super().__init__("rate limited")
+        self.response = response
+
+
+def make_bucket(tmp_path, fake, name="test", **kwargs):
+    options = dict(rate=1.0, capacity=5, reserve=2)
+    options.update(kwargs)
+    return TokenBucket(name, state_dir=str(tmp_path), clock=fake.clock, sleep=fake.sleep, **options)
+
+
+def test_batch_callers_leave_reserve_for_interactive(tmp_path):
+    """
+    test that batch calls wait at the reserve while interactive calls still go through
+    """
+    fake = FakeTime()
+    bucket = make_bucket(tmp_path, fake)
+
+    for _ in range(3):
+        bucket.acquire(BATCH)
+    assert fake.slept == []
+
+    bucket.acquire(INTERACTIVE)
+    bucket.acquire(INTERACTIVE)
+    assert fake.slept == []
+
+    bucket.acquire(BATCH)
+    assert sum(fake.slept) == 3.0
+
+
+def test_buckets_share_state_through_file(tmp_path):
+    """
+    test that two bucket instances (as in two processes) draw from one quota
+    """
+    fake = FakeTime()
+    first = make_bucket(tmp_path, fake, name="shared", reserve=0)
+    second = make_bucket(tmp_path, fake, name="shared", reserve=0)
+
+    for _ in range(5):
+        first.acquire()
+    second.acquire()
+    assert fake.slept == [1.0]
+
+
+def test_call_honors_retry_after(tmp_path):
+    """
+    test that a 429 pauses the bucket for Retry-After and the call is retried
+    """
+    fake = FakeTime()
+    bucket = make_bucket(tmp_path, fake, max_wait=None)
+    attempts = []
+
+    def fetch():
+        attempts.append(fake.now)
+        if len(attempts) == 1:
+            raise FakeRateLimitError(FakeResponse(429, {"Retry-After": "30"}))
+        return {"c": 1}
+
+    assert bucket.call(fetch) == {"c": 1}
+    assert attempts[1] - attempts[0] >= 30
+    assert bucket.stats()["rate_limited"] == 1
+
+
+def test_interactive_callers_fail_fast_past_max_wait(tmp_path):
+    """
+    test that an interactive call gives up instead of waiting past max_wait,
+    including behind a 429 pause
+    """
+    fake = FakeTime()
+    bucket = make_bucket(tmp_path, fake, rate=1 / 72, capacity=1, reserve=0, max_wait=5)
+
+    bucket.acquire(INTERACTIVE)
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        bucket.acquire(INTERACTIVE)
+    assert excinfo.value.retry_after == pytest.approx(72)
+    assert fake.slept == []
+
+    def fetch():
+        raise FakeRateLimitError(FakeResponse(429, {"Retry-After": "60"}))
+
+    fake.now += 72
+    with pytest.raises(RateLimitExceeded):
+        bucket.call(fetch)
+    assert fake.slept == []
+    assert bucket.stats()["rejected"] == 2
+
+
+def test_batch_callers_yield_to_queued_interactive(tmp_path):
+    """
+    test that a batch caller does not take a refilled token while an
+    interactive caller is queued for it
+    """
+    fake = FakeTime()
+    interactive = make_bucket(tmp_path, fake, name="queue", reserve=0, capacity=1)
+    batch = make_bucket(tmp_path, fake, name="queue", reserve=0, capacity=1)
+    interactive.acquire(INTERACTIVE)
+
+    class BatchWaited(Exception):
+        pass
+
+    def batch_sleep(seconds):
+        raise BatchWaited()
+
+    def interactive_sleep(seconds):
+        fake.now += seconds
+        # the token has refilled, but the interactive caller has not woken yet
+        with pytest.raises(BatchWaited):
+            batch.acquire(BATCH)
+
+    batch.sleep = batch_sleep
+    interactive.sleep = interactive_sleep
+    interactive.acquire(INTERACTIVE)
+
+    assert interactive.acquired == 2
+    assert batch.acquired == 0
+
+
+def test_corrupt_state_file_is_reset(tmp_path):
+    """
+    test that a truncated state file does not break every call
+    """
+    fake = FakeTime()
+    bucket = make_bucket(tmp_path, fake)
+    with open(bucket.path, 'w') as f:
+        f.write('{"tokens": 3, "upd')
+
+    bucket.acquire(INTERACTIVE)
+    assert fake.slept == []
@@ -0,0 +1,166 @@
+import json
+from datetime import date
+
+import pytest
+
+from app import db
+from app.models import Politician, Trade, TradeMonthlyRollup
+from app.rollups import refresh_monthly_rollup, refresh_politician_leaderboard
+
+ROLLUP_SYMBOL = 'ZZROLL'
+OTHER_SYMBOL = 'ZZOTHER'
+
+
+def make_trade(ticker, traded, trade_type, size_mid, owner):
+    return Trade(
+        politician_name='Rollup Test Politician',
+        traded_issuer_name=f'{ticker} Corp',
+        traded_issuer_ticker=f'{ticker}:US',
+        base_ticker=ticker,
+        traded=traded,
+        type=trade_type,
+        size='1K-15K',
+        size_mid=size_mid,
+        owner=owner
+    )
+
+
+@pytest.fixture
+def session(app):
+    """
+    the app's session, rolled back after the test
+    """
+    yield db.session
+    db.session.rollback()
+
+
+def test_refresh_monthly_rollup_sums_trades_per_month(session):
+    """
+    test that refreshing a ticker rebuilds its monthly buy/sell counts and
+    totals from the trade table, and leaves other tickers alone
+    """
+    session.add_all([
+        make_trade(ROLLUP_SYMBOL, date(2024, 1, 5), 'buy', 8000, 'a'),
+        make_trade(ROLLUP_SYMBOL, date(2024, 1, 20), 'buy', 32500, 'b'),
+        make_trade(ROLLUP_SYMBOL, date(2024, 1, 25), 'sell', 8000, 'c'),
+        make_trade(ROLLUP_SYMBOL, date(2024, 2, 10), 'sell', 75000, 'd'),
+        # unparsed size: counted, adds nothing to the total
+        make_trade(ROLLUP_SYMBOL, date(2024, 2, 11), 'buy', None, 'e'),
+        # undated trades belong to no month
+        make_trade(ROLLUP_SYMBOL, None, 'buy', 8000, 'f'),
+        make_trade(OTHER_SYMBOL, date(2024, 1, 5), 'buy', 8000, 'g'),
+        # stale summary for a month that no longer has trades
+        TradeMonthlyRollup(ticker=ROLLUP_SYMBOL, year=2024, month=3, buy_count=9)
+    ])
+    session.flush()
+
+    refresh_monthly_rollup([ROLLUP_SYMBOL])
+
+    rows = session.query(TradeMonthlyRollup).filter(
+        TradeMonthlyRollup.ticker.in_([ROLLUP_SYMBOL, OTHER_SYMBOL])
+    ).order_by(TradeMonthlyRollup.ticker, TradeMonthlyRollup.month).all()
+
+    assert [(row.ticker, row.to_dict()) for row in rows] == [
+        (ROLLUP_SYMBOL, {
+            'year': 2024, 'month': 1, 'month_label': '2024-01',
+            'buy_total': 40500, 'sell_total': 8000, 'buy_count': 2, 'sell_count': 1
+        }),
+        (ROLLUP_SYMBOL, {
+            'year': 2024, 'month': 2, 'month_label': '2024-02',
+            'buy_total': 0, 'sell_total': 75000, 'buy_count': 1, 'sell_count': 1
+        }),
+    ]
+
+
+# Trade counts of seeded politicians; the first two tie and order by name
+LEADERBOARD_SEED = {
+    'Leaderboard Test B': 4,
+    'Leaderboard Test A': 4,
+    'Leaderboard Test C': 6,
+}
+
+
+@pytest.fixture
+def seeded_leaderboard(app):
+    """
+    commits trades for the LEADERBOARD_SEED politicians and their
+    refreshed leaderboard rows, deleting all of them afterwards; committed
+    because test client requests use their own sessions
+    """
+    politicians = [
+        Politician(name=name, family='Independent') for name in LEADERBOARD_SEED
+    ]
+    db.session.add_all(politicians)
+    db.session.flush()
+    db.session.add_all([
+        Trade(
+            politician_id=politician.id,
+            politician_name=politician.name,
+            politician_family=politician.family,
+            traded_issuer_name=f'{ROLLUP_SYMBOL} Corp',
+            traded_issuer_ticker=f'{ROLLUP_SYMBOL}{i % 2}:US',
+            base_ticker=f'{ROLLUP_SYMBOL}{i % 2}',
+            traded=date(2024, 1, 1 + i),
+            type='buy' if i < 3 else 'sell',
+            size='1K-15K',
+            size_mid=8000,
+            owner=f'{politician.name} owner {i}'
+        )
+        for politician in politicians
+        for i in range(LEADERBOARD_SEED[politician.name])
+    ])
+    db.session.flush()
+    ids = [politician.id for politician in politicians]
+    refresh_politician_leaderboard(ids)
+    db.session.commit()
+
+    yield politicians
+
+    db.session.rollback()
+    Trade.query.filter(Trade.politician_id.in_(ids)).delete()
+    # With their trades gone, the refresh just deletes their rows
+    refresh_politician_leaderboard(ids)
+    Politician.query.filter(Politician.id.in_(ids)).delete()
+    db.session.commit()
+
+
+def stats(client, **params):
+    response = client.get('/api/politicians/stats', query_string={'limit': 10000, **params})
+    assert response.status_code == 200
+    body = json.loads(response.data)
+    assert body['count'] == len(body['data'])
+    return body['data']
+
+
+def test_politician_stats_reads_refreshed_leaderboard(client, seeded_leaderboard):
+    """
+    test that /api/politicians/stats serves the refreshed leaderboard rows,
+    most trades first with ties by name, and honours limit and min_trades
+    """
+    rows = stats(client)
+    ranking = [(-row['total_trades'], row['name']) for row in rows]
+    assert ranking == sorted(ranking)
+
+    seeded = [row for row in rows if row['name'] in LEADERBOARD_SEED]
+    assert [row['name'] for row in seeded] == [
+        'Leaderboard Test C', 'Leaderboard Test A', 'Leaderboard Test B'
+    ]
+    assert seeded[0] == {
+        'name': 'Leaderboard Test C',
+        'party': 'Independent',
+        'total_trades': 6,
+        'buy_trades': 3,
+        'sell_trades': 3,
+        'buy_percentage': 50.0,
+        'estimated_spending': 48000,
+        'different_stocks': 2,
+        'last_trade_date': '2024-01-06'
+    }
+
+    assert stats(client, limit=2) == rows[:2]
+
+    rows = stats(client, min_trades=5)
+    assert all(row['total_trades'] >= 5 for row in rows)
+    assert [row['name'] for row in rows if row['name'] in LEADERBOARD_SEED] == [
+        'Leaderboard Test C'
+    ]
@@ -0,0 +1,133 @@
+import os
+import json
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from app.utils import parse_trade_date, trade_hash
+from scripts.fetch_recent_trades import getPolData, pagePath, parsePage
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@pytest.fixture
+def capitol_trades():
+    """
+    serve the saved Capitol Trades pages on a local port, counting requests per page
+    """
+    hits = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            page = parse_qs(urlparse(self.path).query)["page"][0]
+            hits[page] = hits.get(page, 0) + 1
+            path = os.path.join(FIXTURES, f"capitoltrades_page{page}.html")
+            if not os.path.exists(path):
+                self.send_response(404)
+                self.end_headers()
+                return
+            with open(path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    server.shutdown()
+
+
+def test_scraper_fetches_each_page_once_and_dedupes(capitol_trades, tmp_path):
+    """
+    test that every page is fetched once and repeated trades and politicians are dropped
+    """
+    base_url, hits = capitol_trades
+    checkpoint_dir = tmp_path / "checkpoint"
+
+    assert getPolData(base_url, str(tmp_path), str(checkpoint_dir), fetchers=2, parsers=2)
+
+    assert hits == {"1": 1, "2": 1}
+    trades = json.loads((tmp_path / "3yeartrade.json").read_text())
+    politicians = json.loads((tmp_path / "PoliticianPhotos.json").read_text())
+
+    assert [t["traded_issuer_ticker"] for t in trades] == ["AAPL:US", "MSFT:US", "NVDA:US"]
+    assert trades[0]["size"] == "1K-15K"
+    assert trades[0]["filed_after"] == "12 days"
+    assert [p["politician_name"] for p in politicians] == ["Nancy Pelosi", "Dan Crenshaw"]
+    assert not checkpoint_dir.exists()
+
+
+def test_scraper_resumes_from_checkpoint(capitol_trades, tmp_path):
+    """
+    test that pages parsed by an interrupted run are not fetched again
+    """
+    base_url, hits = capitol_trades
+    checkpoint_dir = tmp_path / "checkpoint"
+    checkpoint_dir.mkdir()
+    page = {"total_pages": 2, "trades": [], "politicians": []}
+    with open(pagePath(str(checkpoint_dir), 2), "w") as f:
+        json.dump(page, f)
+
+    assert getPolData(base_url, str(tmp_path), str(checkpoint_dir), fetchers=2, parsers=1)
+
+    assert hits == {"1": 1}
+
+
+def test_incremental_scrape_stops_at_known_page(capitol_trades, tmp_path):
+    """
+    test that an incremental run stops paginating once a page holds only stored trades
+    """
+    base_url, hits = capitol_trades
+    known = {
+        trade_hash({**trade, "traded": parse_trade_date(trade["traded"])})
+        for trade in parsePage(open(os.path.join(FIXTURES, "capitoltrades_page1.html"), "rb").read())["trades"]
+    }
+
+    assert getPolData(base_url, str(tmp_path), str(tmp_path / "checkpoint"),
+                      fetchers=2, parsers=1, knownHashes=known)
+
+    assert hits == {"1": 1}
+
+
+def test_incremental_scrape_keeps_saved_history(capitol_trades, tmp_path):
+    """
+    test that an incremental run merges its pages into the saved JSON files
+    rather than replacing the earlier records with only the new ones
+    """
+    base_url, hits = capitol_trades
+    page = parsePage(open(os.path.join(FIXTURES, "capitoltrades_page1.html"), "rb").read())
+    known = {
+        trade_hash({**trade, "traded": parse_trade_date(trade["traded"])})
+        for trade in page["trades"]
+    }
+    older = {**page["trades"][1], "traded_issuer_name": "Tesla Inc",
+             "traded_issuer_ticker": "TSLA:US", "traded": "3 Jan 2022"}
+    (tmp_path / "3yeartrade.json").write_text(json.dumps([page["trades"][1], older]))
+    (tmp_path / "PoliticianPhotos.json").write_text(json.dumps([
+        {**page["politicians"][1], "img": "/img/old.jpg"},
+        {"politician_name": "Former Member", "politician_family": "Independent   House", "img": "/img/former.jpg"},
+    ]))
+
+    assert getPolData(base_url, str(tmp_path), str(tmp_path / "checkpoint"),
+                      fetchers=2, parsers=1, knownHashes=known)
+
+    assert hits == {"1": 1}
+    trades = json.loads((tmp_path / "3yeartrade.json").read_text())
+    politicians = json.loads((tmp_path / "PoliticianPhotos.json").read_text())
+
+    assert [t["traded_issuer_ticker"] for t in trades] == ["AAPL:US", "MSFT:US", "TSLA:US"]
+    assert trades[2] == older
+    assert [(p["politician_name"], p["img"]) for p in politicians] == [
+        ("Nancy Pelosi", "/img/pelosi.jpg"),
+        ("Dan Crenshaw", "/img/crenshaw.jpg"),
+        ("Former Member", "/img/former.jpg"),
+    ]
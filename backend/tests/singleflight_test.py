@@ -0,0 +1,74 @@
+import time
+import threading
+
+from app.singleflight import SingleFlight
+
+
+def run_concurrently(group, fn, callers):
+    """
+    start `callers` threads on the same key and wait until all but the leader have joined
+    """
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(group.do("AAPL", fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+
+    deadline = time.monotonic() + 5
+    while group.stats()["coalesced"] < callers - 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return threads, results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    """
+    test that concurrent callers for one key trigger a single upstream call
+    """
+    group = SingleFlight("test_shared_result")
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"c": 189.5}
+
+    threads, results, errors = run_concurrently(group, fetch, callers=8)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"c": 189.5}] * 8
+    assert not errors
+    assert group.stats() == {"calls": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_concurrent_callers_share_errors():
+    """
+    test that every waiting caller sees the leader's exception
+    """
+    group = SingleFlight("test_shared_error")
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise RuntimeError("upstream down")
+
+    threads, results, errors = run_concurrently(group, fetch, callers=4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert not results
+    assert len(errors) == 4
+    assert all(str(e) == "upstream down" for e in errors)
+
+    # the failed call is not remembered
+    assert group.do("AAPL", lambda: "ok") == "ok"
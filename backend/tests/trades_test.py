@@ -0,0 +1,233 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from app import db
+from app.models import Politician, Trade
+
+# Names no imported data uses, so seeded rows can be found and removed
+SEED_SYMBOL = 'ZZSEED'
+SEED_POLITICIAN = 'Seeded Test Politician'
+SEED_TRADES = 120
+
+
+# Seeded trades that tie on the latest date, and on the biggest size
+TIED_LATEST = (SEED_TRADES - 2, SEED_TRADES - 1)
+TIED_BIGGEST = (40, 41)
+
+
+@pytest.fixture
+def seeded_trades(app):
+    """
+    commits a politician with SEED_TRADES trades in SEED_SYMBOL and deletes
+    them afterwards; committed rather than rolled back because bundle
+    sections are built on other threads with their own sessions
+    """
+    politician = Politician(name=SEED_POLITICIAN, family='Independent', img='/seed.png')
+    db.session.add(politician)
+    db.session.flush()
+    db.session.add_all([
+        Trade(
+            politician_id=politician.id,
+            politician_name=SEED_POLITICIAN,
+            traded_issuer_name='Seed Corp',
+            traded_issuer_ticker=f'{SEED_SYMBOL}:US',
+            base_ticker=SEED_SYMBOL,
+            traded=date(2024, 1, 1) + timedelta(days=min(i, TIED_LATEST[0])),
+            type='buy' if i % 2 else 'sell',
+            size='1M-5M' if i in TIED_BIGGEST else '1K-15K',
+            size_low=1000000 if i in TIED_BIGGEST else 1000,
+            size_high=5000000 if i in TIED_BIGGEST else 15000,
+            size_mid=3000000 if i in TIED_BIGGEST else 8000,
+            owner=f'Seed owner {i}'
+        )
+        for i in range(SEED_TRADES)
+    ])
+    db.session.commit()
+
+    yield politician
+
+    db.session.rollback()
+    Trade.query.filter_by(politician_id=politician.id).delete()
+    db.session.delete(politician)
+    db.session.commit()
+
+
+def newest_first_key(trade):
+    """
+    sort key of the listing order (traded DESC NULLS FIRST, id DESC), for
+    use with reverse=True: undated trades rank above dated ones
+    """
+    return (trade['traded'] is None, trade['traded'] or '', trade['id'])
+
+
+def assert_newest_first(trades):
+    keys = [newest_first_key(trade) for trade in trades]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_recent_trades_keyset_pagination(client, seeded_trades):
+    """
+    test that /api/trades pages through trades newest first without overlap
+    """
+    response = client.get('/api/trades?limit=50')
+    assert response.status_code == 200
+    first_page = json.loads(response.data)
+
+    assert first_page['count'] == len(first_page['data']) == 50
+    assert first_page['next_cursor']
+
+    response = client.get(f"/api/trades?limit=50&cursor={first_page['next_cursor']}")
+    assert response.status_code == 200
+    second_page = json.loads(response.data)
+
+    assert second_page['data']
+    first_ids = {trade['id'] for trade in first_page['data']}
+    assert not first_ids & {trade['id'] for trade in second_page['data']}
+    assert_newest_first(first_page['data'] + second_page['data'])
+
+
+def test_recent_trades_default_first_page(client, seeded_trades):
+    """
+    test that /api/trades returns only the first page unless 'all' is passed
+    """
+    response = client.get('/api/trades')
+    assert response.status_code == 200
+    page = json.loads(response.data)
+
+    assert set(page) == {'count', 'data', 'next_cursor'}
+    assert page['count'] == len(page['data']) == 100
+    assert page['next_cursor']
+
+
+def test_symbol_trades_keyset_pagination(client, seeded_trades):
+    """
+    test that /api/trades/<symbol> pages by default and the pages together
+    hold every trade for the symbol once, newest first
+    """
+    trades = []
+    cursor = None
+    while True:
+        query = f'?limit=50&cursor={cursor}' if cursor else ''
+        response = client.get(f'/api/trades/{SEED_SYMBOL}{query}')
+        assert response.status_code == 200
+        page = json.loads(response.data)
+        assert page['count'] == len(page['data']) <= (50 if cursor else 100)
+        trades += page['data']
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+
+    assert len(trades) == len({trade['id'] for trade in trades}) == SEED_TRADES
+    assert_newest_first(trades)
+
+    response = client.get(f'/api/trades/{SEED_SYMBOL}?all=true')
+    assert response.status_code == 200
+    assert len(json.loads(response.data)) == SEED_TRADES
+
+
+def test_symbol_trades_stream_matches_full_listing(client, seeded_trades, monkeypatch):
+    """
+    test that the streamed JSON array and NDJSON bodies hold the same trades,
+    in the same order, as the non-streamed 'all=true' listing
+    """
+    # small chunks so the seeded trades span several writes
+    monkeypatch.setattr('app.streaming.STREAM_CHUNK_SIZE', 7)
+    expected = json.loads(client.get(f'/api/trades/{SEED_SYMBOL}?all=true').data)
+    assert len(expected) == SEED_TRADES
+
+    response = client.get(f'/api/trades/{SEED_SYMBOL}?stream=true')
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert json.loads(response.get_data(as_text=True)) == expected
+
+    response = client.get(
+        f'/api/trades/{SEED_SYMBOL}', headers={'Accept': 'application/x-ndjson'}
+    )
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == expected
+
+
+def test_recent_trades_invalid_cursor(client):
+    """
+    test that a malformed cursor is rejected
+    """
+    response = client.get('/api/trades?cursor=not-a-cursor')
+    assert response.status_code == 400
+
+
+def test_stock_bundle_sections(client, seeded_trades):
+    """
+    test that the stock bundle returns only the requested sections, each
+    with the status and body of its standalone route
+    """
+    response = client.get(f'/api/stocks/{SEED_SYMBOL}/bundle?sections=trade_summary,trades&limit=5')
+    assert response.status_code == 200
+    bundle = json.loads(response.data)
+
+    assert set(bundle) == {'symbol', 'trade_summary', 'trades'}
+    standalone = client.get(f'/api/trades/summary/{SEED_SYMBOL}')
+    assert bundle['trade_summary']['status'] == standalone.status_code
+    assert bundle['trade_summary']['data'] == json.loads(standalone.data)
+
+    standalone = client.get(f'/api/trades/{SEED_SYMBOL}?limit=5')
+    assert bundle['trades']['status'] == 200
+    assert bundle['trades']['data'] == json.loads(standalone.data)
+    assert bundle['trades']['data']['count'] == 5
+
+    response = client.get(f'/api/stocks/{SEED_SYMBOL}/bundle?sections=nope')
+    assert response.status_code == 400
+
+
+def test_stock_bundle_pages_trades_by_default(client, seeded_trades):
+    """
+    test that the bundle's trades section is one page, not every trade
+    """
+    response = client.get(f'/api/stocks/{SEED_SYMBOL}/bundle?sections=trades')
+    assert response.status_code == 200
+    trades = json.loads(response.data)['trades']
+
+    assert trades['status'] == 200
+    assert trades['data']['count'] == 100
+    assert trades['data']['next_cursor'] is not None
+
+
+def test_politician_profile_matches_standalone_routes(client, seeded_trades):
+    """
+    test that every section of the politician profile equals the response
+    of the route it replaces, including when trades tie on date or size
+    """
+    name = SEED_POLITICIAN
+    response = client.get(f'/api/politicians/{name}/profile')
+    assert response.status_code == 200
+    profile = json.loads(response.data)
+
+    standalone = {
+        'image': client.get('/api/pol/image', query_string={'name': name}),
+        'latest_trade': client.get(f'/api/politicians/{name}/latest-trade'),
+        'biggest_trade': client.get(f'/api/politicians/{name}/biggest-trade'),
+        'stats': client.get(f'/api/politicians/{name}/stats')
+    }
+    for section, standalone_response in standalone.items():
+        assert standalone_response.status_code == 200
+        assert profile[section] == json.loads(standalone_response.data), section
+
+    ids = [
+        trade_id for (trade_id,) in db.session.query(Trade.id).filter(
+            Trade.politician_id == seeded_trades.id
+        ).order_by(Trade.id)
+    ]
+    assert profile['latest_trade']['id'] == ids[TIED_LATEST[1]]
+    assert profile['biggest_trade']['id'] == ids[TIED_BIGGEST[0]]
+    assert profile['stats']['total_trades'] == SEED_TRADES
+
+
+def test_politician_profile_resolves_names_like_standalone_routes(client, seeded_trades):
+    """
+    test that the profile finds a politician exactly when the stats route does
+    """
+    name = SEED_POLITICIAN.lower()
+    assert client.get(f'/api/politicians/{name}/stats').status_code == 404
+    assert client.get(f'/api/politicians/{name}/profile').status_code == 404
@@ -140,44 +140,27 @@ function CongressView({ searchTerm }) {
     setLatestTradeLoading(true);
     setBiggestTradeLoading(true);
 
-    fetch(`${apiUrl}/api/pol/image?name=${encodeURIComponent(searchTerm)}`)
-      .then(res => res.json())
-      .then(data => {
-        const imgUrl = data.img || null;
-        setProfileData([imgUrl, data.politician_name || '', data.politician_family || '']);
-        setIsLoading(false);
-      })
-      .catch(() => {
-        setProfileData([null, '', '']);
-        setIsLoading(false);
-      });
-
-    fetch(`${apiUrl}/api/politicians/${encodeURIComponent(searchTerm)}/latest-trade`)
+    // Image, latest and biggest trade and stats come back in one document
+    fetch(`${apiUrl}/api/politicians/${encodeURIComponent(searchTerm)}/profile`)
       .then(res => res.ok ? res.json() : null)
       .then(data => {
-        setLatestTrade(data && !data.error ? data : null);
-        setLatestTradeLoading(false);
+        const image = data?.image || {};
+        setProfileData([image.img || null, image.politician_name || '', image.politician_family || '']);
+        setLatestTrade(data?.latest_trade || null);
+        setBiggestTrade(data?.biggest_trade || null);
+        setStats(data?.stats || null);
       })
       .catch(() => {
+        setProfileData([null, '', '']);
         setLatestTrade(null);
-        setLatestTradeLoading(false);
-      });
-
-    fetch(`${apiUrl}/api/politicians/${encodeURIComponent(searchTerm)}/biggest-trade`)
-      .then(res => res.ok ? res.json() : null)
-      .then(data => {
-        setBiggestTrade(data && !data.error ? data : null);
-        setBiggestTradeLoading(false);
-      })
-      .catch(() => {
         setBiggestTrade(null);
+        setStats(null);
+      })
+      .finally(() => {
+        setIsLoading(false);
+        setLatestTradeLoading(false);
         setBiggestTradeLoading(false);
       });
-
-    fetch(`${apiUrl}/api/politicians/${encodeURIComponent(searchTerm)}/stats`)
-      .then(res => res.ok ? res.json() : null)
-      .then(data => setStats(data && !data.error ? data : null))
-      .catch(() => setStats(null));
   }, [searchTerm]);
 
   if (!searchTerm) {
@@ -22,6 +22,9 @@ ModuleRegistry.registerModules([AllCommunityModule]);
 
 const apiUrl = import.meta.env.VITE_API_URL || 'http://localhost:5000';
 
+// Recent trades are fetched in keyset pages of this size
+const TRADES_PAGE_SIZE = 100;
+
 // Simple module-level cache
 let tradesCache = null;
 let politiciansCache = null;
@@ -30,8 +33,10 @@ let stocksCache = null;
 export default function HomeView({ onPoliticianClick, onStockClick }) {
   // ——————————— Trades state ———————————
   const [allTrades, setAllTrades] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState(null);
+  const loadingMore = useRef(false);
 
   // ————————— Politicians state —————————
   const [politicianData, setPoliticianData] = useState([]);
@@ -60,25 +65,34 @@ export default function HomeView({ onPoliticianClick, onStockClick }) {
   }));
 
   // ————————— Fetch Trades —————————
+  // fetches one keyset page of recent trades: { count, data, next_cursor }
+  const fetchTradesPage = async (cursor) => {
+    const params = new URLSearchParams({ limit: TRADES_PAGE_SIZE });
+    if (cursor) params.set('cursor', cursor);
+    const response = await fetch(`${apiUrl}/api/trades?${params}`);
+    if (!response.ok) {
+      throw new Error(`Error: ${response.statusText}`);
+    }
+    return response.json();
+  };
+
   useEffect(() => {
     setIsLoading(true);
     setError(null);
 
     if (tradesCache) {
-      setAllTrades(tradesCache);
+      setAllTrades(tradesCache.data);
+      setNextCursor(tradesCache.nextCursor);
       setIsLoading(false);
       return;
     }
 
     const fetchTrades = async () => {
       try {
-        const response = await fetch(`${apiUrl}/api/trades`);
-        if (!response.ok) {
-          throw new Error(`Error: ${response.statusText}`);
-        }
-        const data = await response.json();
-        tradesCache = data;
+        const { data, next_cursor } = await fetchTradesPage();
+        tradesCache = { data, nextCursor: next_cursor };
         setAllTrades(data);
+        setNextCursor(next_cursor);
       } catch (err) {
         setError(err.message);
       } finally {
@@ -88,6 +102,30 @@ export default function HomeView({ onPoliticianClick, onStockClick }) {
     fetchTrades();
   }, []);
 
+  // loads the next page of trades once the grid reaches its last page
+  const loadMoreTrades = async () => {
+    if (!nextCursor || loadingMore.current) return;
+    loadingMore.current = true;
+    try {
+      const { data, next_cursor } = await fetchTradesPage(nextCursor);
+      const trades = [...allTrades, ...data];
+      tradesCache = { data: trades, nextCursor: next_cursor };
+      setAllTrades(trades);
+      setNextCursor(next_cursor);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      loadingMore.current = false;
+    }
+  };
+
+  const handlePaginationChanged = (event) => {
+    const { api } = event;
+    if (api.paginationGetCurrentPage() >= api.paginationGetTotalPages() - 1) {
+      loadMoreTrades();
+    }
+  };
+
 
   // ————————— Fetch Politician Stats —————————
   useEffect(() => {
@@ -365,6 +403,7 @@ export default function HomeView({ onPoliticianClick, onStockClick }) {
                       columnDefs={columnDefs}
                       pagination
                       paginationPageSize={20}
+                      onPaginationChanged={handlePaginationChanged}
                       suppressCellFocus
                       theme={isDarkMode ? darkTheme : lightTheme}
                     />
@@ -104,35 +104,27 @@ function StockView({ searchSymbol }) {
       setTradesError(null);
 
       try {
-        const profilePromise = fetch(`${apiUrl}/api/profile/${searchSymbol}`);
-        const pricePromise = fetch(`${apiUrl}/api/price/${searchSymbol}`);
-        const politicianChartPromise = fetch(`${apiUrl}/api/trades/summary/${searchSymbol}`);
-        const tradesPromise = fetch(`${apiUrl}/api/trades/${searchSymbol}`);
-
-        const [profileResponse, priceResponse, politicianChartResponseResolved, tradesResponseResolved] = await Promise.all([
-            profilePromise, pricePromise, politicianChartPromise, tradesPromise
-        ]);
+        // One request for the profile, price, trade summary and trades; each section carries its own status
+        const bundleResponse = await fetch(`${apiUrl}/api/stocks/${searchSymbol}/bundle?sections=profile,price,trade_summary,trades`);
+        if (!bundleResponse.ok) throw new Error(`Stock Data Error: ${bundleResponse.statusText} (${bundleResponse.status})`);
+        const bundle = await bundleResponse.json();
+        const sectionData = (name, label) => {
+          const section = bundle[name];
+          if (section.status !== 200) throw new Error(`${label} Error: ${section.data?.error || 'Request failed'} (${section.status})`);
+          return section.data;
+        };
 
         // Process Profile and Real-time Price
-        if (!profileResponse.ok) throw new Error(`Profile Error: ${profileResponse.statusText} (${profileResponse.status})`);
-        const pData = await profileResponse.json();
-        setProfileData(pData);
-
-        if (!priceResponse.ok) throw new Error(`Real-time Price Error: ${priceResponse.statusText} (${priceResponse.status})`);
-        const priceD = await priceResponse.json();
-        setRealtimePrice(priceD);
+        setProfileData(sectionData('profile', 'Profile'));
+        setRealtimePrice(sectionData('price', 'Real-time Price'));
         setIsLoadingProfile(false); 
 
         // Process Politician Chart Data
-        if (!politicianChartResponseResolved.ok) throw new Error(`Politician Trade Summary Error: ${politicianChartResponseResolved.statusText} (${politicianChartResponseResolved.status})`);
-        const cData = await politicianChartResponseResolved.json();
-        setPoliticianTradeChartData(cData);
+        setPoliticianTradeChartData(sectionData('trade_summary', 'Politician Trade Summary'));
         setIsLoadingPoliticianChart(false);
       
-        // Process Recent Politician Trades Data
-        if (!tradesResponseResolved.ok) throw new Error(`Recent Trades Error: ${tradesResponseResolved.statusText} (${tradesResponseResolved.status})`);
-        const tData = await tradesResponseResolved.json();
-        setTrades(tData);
+        // Process Recent Politician Trades Data (the newest page of trades)
+        setTrades(sectionData('trades', 'Recent Trades').data);
         setIsLoadingTrades(false);
 
       } catch (err) {
@@ -12,7 +12,7 @@ describe('Sample Unit Test', () => {
         // mock a pending fetch 
         fetch.mockResolvedValueOnce({
             ok:true,
-            json: async () => []
+            json: async () => ({ count: 0, data: [], next_cursor: null })
         })
 
         render(<HomeView />)
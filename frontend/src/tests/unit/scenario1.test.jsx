@@ -48,7 +48,7 @@ describe('Scenario 1 testing: Recent Politician Trades Table', () => {
     mockFetch.mockImplementation(async (url) => {
       const urlString = url.toString();
       if (urlString.includes('/api/trades')) {
-        return { ok: true, json: async () => mockTradesData };
+        return { ok: true, json: async () => ({ count: mockTradesData.length, data: mockTradesData, next_cursor: null }) };
       }
       if (urlString.includes('/api/politicians/stats')) {
         return { ok: true, json: async () => mockPoliticianStats };
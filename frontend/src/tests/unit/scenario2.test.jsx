@@ -48,7 +48,7 @@ describe('Scenario 2 testing: Filtering', () => {
     mockFetch.mockImplementation(async (url) => {
       const urlString = url.toString();
       if (urlString.includes('/api/trades')) {
-        return { ok: true, json: async () => mockTradesForFilter };
+        return { ok: true, json: async () => ({ count: mockTradesForFilter.length, data: mockTradesForFilter, next_cursor: null }) };
       }
       if (urlString.includes('/api/politicians/stats')) {
         return { ok: true, json: async () => mockPoliticianStatsResponseForFilter };
@@ -44,7 +44,7 @@ describe('Scenario 3 testing: Home View Leaderboards', () => {
     mockFetch.mockImplementation(async (url) => {
       const urlString = url.toString();
       if (urlString.includes('/api/trades')) {
-        return { ok: true, json: async () => mockEmptyTradesDataForLeaderboardTest };
+        return { ok: true, json: async () => ({ count: mockEmptyTradesDataForLeaderboardTest.length, data: mockEmptyTradesDataForLeaderboardTest, next_cursor: null }) };
       }
       if (urlString.includes('/api/politicians/stats')) {
         return { ok: true, json: async () => mockPoliticianStatsResponse };
@@ -55,7 +55,7 @@ describe('Scenario 4 testing: Displaying Politician Profile', () => {
     mockFetch.mockImplementation(async (url) => {
       const urlString = url.toString();
       if (urlString.includes('/api/trades')) { 
-        return { ok: true, json: async () => mockTradesForScenario4 };
+        return { ok: true, json: async () => ({ count: mockTradesForScenario4.length, data: mockTradesForScenario4, next_cursor: null }) };
       }
       if (urlString.includes('/api/politicians/stats')) {
         return { ok: true, json: async () => ({ count: 0, data: [] }) };
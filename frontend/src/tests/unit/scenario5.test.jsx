@@ -62,6 +62,13 @@ describe('Scenario 5 testing: Stock Information View', () => {
 
     mockFetch.mockImplementation(async (url) => {
       const urlString = url.toString();
+      if (urlString.includes(`/api/stocks/${MOCK_SYMBOL}/bundle`)) return { ok: true, json: async () => ({
+        symbol: MOCK_SYMBOL,
+        profile: { status: 200, data: mockProfileData },
+        price: { status: 200, data: mockPriceData },
+        trade_summary: { status: 200, data: mockPoliticianSummaryChartData },
+        trades: { status: 200, data: { count: mockRecentPoliticianTradesData.length, data: mockRecentPoliticianTradesData, next_cursor: null } },
+      }) };
       if (urlString.includes(`/api/profile/${MOCK_SYMBOL}`)) return { ok: true, json: async () => mockProfileData };
       if (urlString.includes(`/api/price/${MOCK_SYMBOL}`)) return { ok: true, json: async () => mockPriceData };
       if (urlString.includes(`/api/trades/summary/${MOCK_SYMBOL}`)) return { ok: true, json: async () => mockPoliticianSummaryChartData };